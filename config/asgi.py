@@ -2,6 +2,9 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with the settings in config/gunicorn.conf.py:
+
+    gunicorn -c config/gunicorn.conf.py config.asgi:application
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -12,5 +15,11 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+# Route the read endpoints to the async views.
+os.environ.setdefault("ASYNC_READ_VIEWS", "true")
+# Under ASGI every request runs its ORM calls in a thread of its own, so a
+# persistent connection would be kept per short-lived thread. Open one per
+# request instead and pool with PgBouncer in front of PostgreSQL.
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
@@ -0,0 +1,118 @@
+"""
+Async-native read endpoints for the ASGI deployment.
+
+DRF views are synchronous, so under ASGI each request to one of them holds
+a thread for its whole duration. ``AsyncReadView`` serves GET on the event
+loop with Django's async ORM and hands every other method to the regular
+DRF view, so writes keep their serializers, permissions and transactions.
+
+The async views reuse their ViewSet's queryset, filters, serializers and
+pagination, and render with DRF's ``JSONRenderer``, so both paths return
+the same bytes. They are routed only when ``ASYNC_READ_VIEWS`` is on, which
+``config/asgi.py`` does by default.
+
+``ASYNC_DB_CONCURRENCY`` caps how many requests per process may use the
+database at once. Each ASGI request runs its ORM calls in a thread of its
+own with its own connection, so without a cap a burst of 1000 connections
+would mean 1000 threads and 1000 database connections; past the cap,
+requests wait on the event loop where waiting is cheap.
+"""
+
+import asyncio
+import weakref
+from contextlib import nullcontext
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from config.routers import replica_reads
+
+_slots = weakref.WeakKeyDictionary()
+
+
+class JSONResponse(HttpResponse):
+    """``data`` rendered the way DRF renders it; ``.data`` is kept."""
+
+    def __init__(self, data, status=status.HTTP_200_OK):
+        super().__init__(
+            JSONRenderer().render(data), content_type="application/json", status=status
+        )
+        self.data = data
+
+
+def db_slots():
+    """The ``ASYNC_DB_CONCURRENCY`` semaphore of the running event loop."""
+    loop = asyncio.get_running_loop()
+    slots = _slots.get(loop)
+    if slots is None:
+        slots = _slots[loop] = asyncio.Semaphore(
+            getattr(settings, "ASYNC_DB_CONCURRENCY", 32)
+        )
+    return slots
+
+
+async def apaginate(queryset, request, pagination_class):
+    """
+    Async counterpart of ``GenericAPIView.paginate_queryset``. Returns the
+    pagination (ready for ``get_paginated_response``) and the page's objects.
+    """
+    pagination = pagination_class()
+    paginator = pagination.django_paginator_class(
+        queryset, pagination.get_page_size(request)
+    )
+    paginator.count = await queryset.acount()
+    number = request.query_params.get(pagination.page_query_param) or 1
+    if number in pagination.last_page_strings:
+        number = paginator.num_pages
+    try:
+        pagination.page = paginator.page(number)
+    except InvalidPage as exc:
+        raise NotFound(
+            pagination.invalid_page_message.format(page_number=number, message=exc)
+        )
+    pagination.request = request
+    return pagination, [obj async for obj in pagination.page.object_list]
+
+
+class AsyncReadView(View):
+    """
+    Serves GET with the async ``get`` handler and passes every other method
+    to ``sync_view``, the DRF view previously routed at the same URL.
+    Subclasses set ``sync_view = staticmethod(SomeView.as_view(...))``.
+
+    ``get`` receives a DRF ``Request`` wrapping the Django request, for its
+    ``query_params`` and for serializer context. The endpoints served this
+    way are public, so no authentication runs. With ``use_replica`` the
+    reads go to the replica, as ``ReplicaReadMixin`` does for sync views.
+    """
+
+    sync_view = None
+    use_replica = True
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # Token-authenticated API, like every DRF view.
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+        try:
+            async with db_slots():
+                with replica_reads() if self.use_replica else nullcontext():
+                    return await self.get(Request(request), *args, **kwargs)
+        except ValidationError as exc:
+            return JSONResponse(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+        except NotFound as exc:
+            return JSONResponse(
+                {"detail": exc.detail}, status=status.HTTP_404_NOT_FOUND
+            )
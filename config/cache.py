@@ -0,0 +1,28 @@
+"""
+Build the ``default`` cache from ``CACHE_URL``, e.g.::
+
+    redis://cache:6379/0
+
+Seat holds, catalog versions, auth state and login rate limits all live in
+this cache, so every worker and node has to share it. Without ``CACHE_URL``
+the project falls back to a per-process LocMemCache, which is only right
+for development, tests and single-process servers.
+"""
+
+from urllib.parse import urlsplit
+
+BACKENDS = {
+    "redis": "django.core.cache.backends.redis.RedisCache",
+    "rediss": "django.core.cache.backends.redis.RedisCache",
+}
+
+
+def cache_config(url):
+    """Turn a cache URL (or ``None``) into a ``CACHES`` entry."""
+    if not url:
+        return {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+    scheme = urlsplit(url).scheme
+    backend = BACKENDS.get(scheme)
+    if backend is None:
+        raise ValueError(f"Unsupported cache scheme: {scheme!r}")
+    return {"BACKEND": backend, "LOCATION": url}
@@ -0,0 +1,93 @@
+"""
+Build ``DATABASES`` entries from environment variables.
+
+``DATABASE_URL`` selects the primary and ``DATABASE_REPLICA_URL`` an
+optional read replica, e.g.::
+
+    postgres://movie:secret@db:5432/moviebuzz
+    sqlite:///replica.sqlite3
+
+Without ``DATABASE_URL`` the project keeps using ``db.sqlite3``.
+"""
+
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit
+
+ENGINES = {
+    "postgres": "django.db.backends.postgresql",
+    "postgresql": "django.db.backends.postgresql",
+    "pgsql": "django.db.backends.postgresql",
+    "sqlite": "django.db.backends.sqlite3",
+}
+
+
+def parse_database_url(url):
+    """Turn a database URL into a ``DATABASES`` entry (without pooling keys)."""
+    parts = urlsplit(url)
+    engine = ENGINES.get(parts.scheme)
+    if engine is None:
+        raise ValueError(f"Unsupported database scheme: {parts.scheme!r}")
+
+    if engine == "django.db.backends.sqlite3":
+        # sqlite:///relative.sqlite3 and sqlite:////absolute/path.sqlite3
+        return {"ENGINE": engine, "NAME": unquote(parts.path[1:]) or ":memory:"}
+
+    return {
+        "ENGINE": engine,
+        "NAME": unquote(parts.path.lstrip("/")),
+        "USER": unquote(parts.username or ""),
+        "PASSWORD": unquote(parts.password or ""),
+        "HOST": parts.hostname or "",
+        "PORT": str(parts.port or ""),
+        # Query parameters become driver options, e.g. ?sslmode=require.
+        "OPTIONS": dict(parse_qsl(parts.query)),
+    }
+
+
+def database_url(config):
+    """
+    The inverse of ``parse_database_url``, e.g. to point a subprocess at
+    the database this process uses.
+    """
+    scheme = next(key for key, engine in ENGINES.items() if engine == config["ENGINE"])
+    if scheme == "sqlite":
+        return f"sqlite:///{config['NAME']}"
+    credentials = quote(config.get("USER") or "", safe="")
+    if config.get("PASSWORD"):
+        credentials += ":" + quote(config["PASSWORD"], safe="")
+    host = config.get("HOST") or "localhost"
+    if config.get("PORT"):
+        host += f":{config['PORT']}"
+    url = f"{scheme}://{credentials}@{host}/{quote(str(config['NAME']))}"
+    options = {
+        key: value
+        for key, value in (config.get("OPTIONS") or {}).items()
+        if isinstance(value, str)
+    }
+    return f"{url}?{urlencode(options)}" if options else url
+
+
+def database_config(url, conn_max_age=60, health_checks=True):
+    """
+    A ``DATABASES`` entry for ``url`` with persistent connections: each
+    worker keeps its connection for ``conn_max_age`` seconds (None = forever)
+    and, with ``health_checks``, pings it before reuse so a dropped
+    connection is replaced instead of failing the request.
+    """
+    config = parse_database_url(url)
+    if config["ENGINE"] == "django.db.backends.sqlite3":
+        # Reopening a SQLite file is cheap; what matters is waiting on the
+        # write lock instead of failing when bookings collide.
+        config["OPTIONS"] = {"timeout": 30}
+        return config
+    config["CONN_MAX_AGE"] = conn_max_age
+    config["CONN_HEALTH_CHECKS"] = health_checks
+    return config
+
+
+def env_conn_max_age(value):
+    """``DB_CONN_MAX_AGE``: seconds, or ``none`` for unlimited."""
+    if value is None or value == "":
+        return 60
+    if value.lower() == "none":
+        return None
+    return int(value)
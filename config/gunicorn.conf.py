@@ -0,0 +1,102 @@
+"""
+Gunicorn settings for both ways of serving the project:
+
+    gunicorn -c config/gunicorn.conf.py                    # ASGI (default)
+    APP_SERVER=wsgi gunicorn -c config/gunicorn.conf.py    # WSGI
+
+ASGI runs one uvicorn event loop per core, with the read endpoints served
+by async views. WSGI preforks ``2 * cores + 1`` workers with a few threads
+each so requests waiting on the database don't idle a whole process. Any
+value can be overridden with the usual environment variables or flags.
+
+The app is imported once in the master and forked, and every worker warms
+itself up (config.warmup) before it accepts a connection.
+"""
+
+import math
+import os
+
+
+def available_cores():
+    """
+    CPUs this process may use: its affinity mask, capped by a cgroup v2
+    CPU quota so a container limited to 2 CPUs on a 64-core host doesn't
+    start 129 workers.
+    """
+    cores = len(os.sched_getaffinity(0))
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+    except (OSError, ValueError):
+        return cores
+    if quota == "max":
+        return cores
+    return max(1, min(cores, math.ceil(int(quota) / int(period))))
+
+
+cores = available_cores()
+app_server = os.getenv("APP_SERVER", "asgi")
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+backlog = int(os.getenv("BACKLOG", "2048"))
+
+if app_server == "asgi":
+    wsgi_app = "config.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+    workers = int(os.getenv("WEB_CONCURRENCY", cores))
+else:
+    wsgi_app = "config.wsgi:application"
+    worker_class = "gthread"
+    workers = int(os.getenv("WEB_CONCURRENCY", 2 * cores + 1))
+    threads = int(os.getenv("WEB_THREADS", "4"))
+
+# Import Django and the project once in the master; workers share those
+# pages copy-on-write and start faster. The app opens no connections or
+# threads at import time, so forking afterwards is safe.
+preload_app = os.getenv("PRELOAD_APP", "true").lower() == "true"
+
+# A page fans out 6-10 API calls over the browser's few connections; keep
+# them open between calls instead of reconnecting for each.
+keepalive = int(os.getenv("KEEPALIVE", "15"))
+timeout = int(os.getenv("WEB_TIMEOUT", "30"))
+graceful_timeout = 30
+# Recycle workers now and then so a slow leak can't grow without bound;
+# the jitter keeps them from restarting all at once.
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = max_requests // 10
+
+# Trust X-Forwarded-* from the reverse proxy (nginx in docker-compose).
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+# Worker heartbeats go to a tmpfs instead of a possibly slow container disk.
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+
+accesslog = os.getenv("ACCESS_LOG")
+errorlog = "-"
+
+
+def on_starting(server):
+    if workers > 1 and not os.getenv("CACHE_URL"):
+        # Seat holds, rate limits and catalog invalidation would each be
+        # private to one worker.
+        server.log.warning(
+            "CACHE_URL is not set; %d workers will each use a private cache.",
+            workers,
+        )
+
+
+def post_worker_init(worker):
+    # The worker has loaded the app but does not accept connections yet.
+    from django.db import connections
+
+    from config.warmup import warm_up
+
+    try:
+        for path, status_code, ms in warm_up():
+            worker.log.info("Warm-up %s %s: %.1f ms", status_code, path, ms)
+    except Exception:
+        # Serve cold rather than crash-loop when e.g. the database is down.
+        worker.log.exception("Warm-up failed")
+    finally:
+        # Let the serving threads open their own connections.
+        connections.close_all()
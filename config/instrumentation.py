@@ -0,0 +1,308 @@
+"""
+Per-request database and serializer instrumentation.
+
+``QueryMetricsMiddleware`` counts the queries a sampled request runs, how
+long they took, how many repeated an earlier statement (the N+1 signature)
+and how long serializers spent producing ``.data``. The figures go back to
+the client as a ``Server-Timing`` header and into per-route histograms in
+this process, which ``MetricsView`` serves in the Prometheus text format.
+
+Settings:
+
+* ``REQUEST_METRICS_ENABLED``: when False (the default) the middleware
+  removes itself at startup and costs nothing.
+* ``REQUEST_METRICS_SAMPLE_RATE``: share of requests to instrument, 0-1.
+
+The header gives away how a view queries the database, so only staff,
+admins and clients in ``INTERNAL_IPS`` get it.
+"""
+
+import contextvars
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework.serializers import BaseSerializer
+from rest_framework.views import APIView
+
+from user.permissions import IsAdminorReadonly
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+_current = contextvars.ContextVar("request_metrics", default=None)
+
+
+class RequestRecorder:
+    """Collects the figures for one request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.statements = set()
+        self.duplicates = 0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - started
+            self.queries += 1
+            # Same statement with different parameters: what an N+1 loop
+            # looks like from the database's side.
+            if sql in self.statements:
+                self.duplicates += 1
+            else:
+                self.statements.add(sql)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.total += 1
+        self.sum += value
+
+    def samples(self):
+        """``(le, cumulative_count)`` pairs ending with ``+Inf``."""
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield format(bound, "g"), cumulative
+        yield "+Inf", self.total
+
+
+class MetricsRegistry:
+    """In-process per-route aggregates. Each worker process keeps its own."""
+
+    metrics = (
+        ("http_request_duration_seconds", "Request latency.", DURATION_BUCKETS),
+        ("db_queries_per_request", "Database queries per request.", QUERY_BUCKETS),
+        ("db_time_seconds", "Time spent in SQL per request.", DURATION_BUCKETS),
+        (
+            "serializer_time_seconds",
+            "Time spent producing serializer data per request.",
+            DURATION_BUCKETS,
+        ),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self._duplicates = {}
+
+    def record(self, route, method, duration, recorder):
+        key = (route, method)
+        values = (
+            duration,
+            recorder.queries,
+            recorder.sql_seconds,
+            recorder.serializer_seconds,
+        )
+        with self._lock:
+            histograms = self._histograms.get(key)
+            if histograms is None:
+                histograms = self._histograms[key] = [
+                    Histogram(buckets) for _, _, buckets in self.metrics
+                ]
+            for histogram, value in zip(histograms, values):
+                histogram.observe(value)
+            self._duplicates[key] = self._duplicates.get(key, 0) + recorder.duplicates
+
+    def render(self):
+        """The registry in the Prometheus text exposition format."""
+        with self._lock:
+            lines = []
+            for position, (name, help_text, _) in enumerate(self.metrics):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for (route, method), histograms in sorted(self._histograms.items()):
+                    histogram = histograms[position]
+                    labels = f'route="{_escape(route)}",method="{method}"'
+                    for le, count in histogram.samples():
+                        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.total}")
+            lines.append(
+                "# HELP db_duplicate_queries_total Queries that repeated a "
+                "statement already run in the same request."
+            )
+            lines.append("# TYPE db_duplicate_queries_total counter")
+            for (route, method), count in sorted(self._duplicates.items()):
+                labels = f'route="{_escape(route)}",method="{method}"'
+                lines.append(f"db_duplicate_queries_total{{{labels}}} {count}")
+            return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+registry = MetricsRegistry()
+
+
+def _timed_data(data_property):
+    def data(self):
+        recorder = _current.get()
+        if recorder is None:
+            return data_property.fget(self)
+        # Only the outermost serializer is timed; nested .data calls are
+        # already inside its measurement.
+        recorder.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return data_property.fget(self)
+        finally:
+            recorder.serializer_depth -= 1
+            if not recorder.serializer_depth:
+                recorder.serializer_seconds += time.perf_counter() - started
+
+    data._timed = True
+    return property(data)
+
+
+def install_serializer_timing():
+    # Serializer.data and ListSerializer.data both go through
+    # BaseSerializer.data, so wrapping it once covers every serializer.
+    if not getattr(BaseSerializer.data.fget, "_timed", False):
+        BaseSerializer.data = _timed_data(BaseSerializer.data)
+
+
+def route_of(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.view_name or match.route
+
+
+def record_query(execute, sql, params, many, context):
+    recorder = _current.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recording(connection, **kwargs):
+    # One wrapper per connection for the life of the process. It records
+    # into the current request's recorder, which the context carries into
+    # the thread an async request runs its ORM calls in.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def may_see_timing(request):
+    if request.META.get("REMOTE_ADDR") in settings.INTERNAL_IPS:
+        return True
+    # DRF copies the user it authenticated (e.g. from a JWT) onto the
+    # Django request, so this sees API users too.
+    user = getattr(request, "user", None)
+    if user is None or not user.is_authenticated:
+        return False
+    if user.Is_Admin_role:
+        return True
+    # ClaimsJWTAuthentication loads only id, role and is_active; reading a
+    # deferred is_staff would query the user on every request.
+    return "is_staff" not in user.get_deferred_fields() and user.is_staff
+
+
+class QueryMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "REQUEST_METRICS_SAMPLE_RATE", 1.0)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_serializer_timing()
+        connection_created.connect(install_query_recording)
+        for connection in connections.all(initialized_only=True):
+            install_query_recording(connection)
+
+    def sampled(self):
+        return self.sample_rate >= 1 or random.random() < self.sample_rate
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        recorder = RequestRecorder()
+        token = _current.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            duration = time.perf_counter() - started
+            _current.reset(token)
+        return self.report(
+            request, response, duration, recorder, may_see_timing(request)
+        )
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        recorder = RequestRecorder()
+        token = _current.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            duration = time.perf_counter() - started
+            _current.reset(token)
+        # request.user may still be the lazy session user.
+        visible = await sync_to_async(may_see_timing)(request)
+        return self.report(request, response, duration, recorder, visible)
+
+    def report(self, request, response, duration, recorder, visible):
+        registry.record(route_of(request), request.method, duration, recorder)
+        if not visible:
+            return response
+        response["Server-Timing"] = ", ".join(
+            (
+                f'db;dur={recorder.sql_seconds * 1000:.2f};desc="{recorder.queries} '
+                f'queries, {recorder.duplicates} duplicate"',
+                f"ser;dur={recorder.serializer_seconds * 1000:.2f}",
+                f"total;dur={duration * 1000:.2f}",
+            )
+        )
+        return response
+
+
+class MetricsView(APIView):
+    """Request metrics of this process in the Prometheus text format."""
+
+    permission_classes = [IsAdminorReadonly]
+
+    @extend_schema(exclude=True)
+    def get(self, request):
+        return HttpResponse(
+            registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
@@ -0,0 +1,82 @@
+"""
+Route read-only catalog and listing traffic to a read replica.
+
+Reads go to ``replica`` only inside ``replica_reads()``, which
+``ReplicaReadMixin`` opens around safe-method requests of the views that
+opt in. Everything else (booking, cancellation, auth, any write) stays on
+the primary. Within a replica scope a write, or an open transaction on the
+primary, pins the remaining reads to the primary so a request always sees
+its own changes.
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA = "replica"
+PRIMARY = "default"
+
+_scope = contextvars.ContextVar("replica_scope", default=None)
+
+
+@contextmanager
+def replica_reads():
+    token = _scope.set({"pinned": False})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """
+    Read from the primary even inside a replica scope. For reads whose
+    result outlives the request, such as a cache refill right after an
+    invalidation: from a lagging replica it would store pre-write data
+    under the new cache version.
+    """
+    token = _scope.set(None)
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def replica_configured():
+    return REPLICA in connections.databases
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        scope = _scope.get()
+        if scope is None or scope["pinned"] or not replica_configured():
+            return PRIMARY
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        scope = _scope.get()
+        if scope is not None:
+            scope["pinned"] = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+
+class ReplicaReadMixin:
+    """
+    For views whose GET responses may be slightly stale: serve their reads
+    from the replica. Other methods are untouched.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return super().dispatch(request, *args, **kwargs)
+        with replica_reads():
+            return super().dispatch(request, *args, **kwargs)
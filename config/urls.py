@@ -19,12 +19,15 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 
+from config.instrumentation import MetricsView
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/user/", include(("user.urls", "user"), namespace="user")),
     path("api/", include("reservations.urls", namespace="reservations")),
     path("api/",include("movies.urls",namespace="movies")),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/docs/",
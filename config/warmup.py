@@ -0,0 +1,63 @@
+"""
+Warm a freshly started worker before it takes traffic.
+
+The first requests a cold worker serves pay for importing every view and
+serializer, building the URL resolver, opening the database connection
+and filling the catalog cache. ``warm_up`` does all of that with a few
+in-process requests to the pages most visitors load first, and builds the
+refresh token blacklist filter. gunicorn runs
+it in each worker before the worker accepts connections (see
+config/gunicorn.conf.py); the warmup command runs it by hand, e.g. to
+fill a shared cache after a deploy.
+"""
+
+import time
+
+from django.conf import settings
+from django.test import Client
+from django.urls import get_resolver
+from django.utils import timezone
+
+from config.instrumentation import registry
+from user.blacklist import token_blacklist
+
+
+def warm_paths():
+    today = timezone.localdate().isoformat()
+    return [
+        "/api/movies/",
+        "/api/movies/?sort=rating",
+        f"/api/showtimes/?date={today}",
+        f"/api/user/showsbydate/?date={today}",
+        f"/api/user/schedule/?date={today}",
+    ]
+
+
+def warm_host():
+    """A host name ``ALLOWED_HOSTS`` accepts, for the in-process requests."""
+    for host in settings.ALLOWED_HOSTS:
+        if host == "*":
+            break
+        return host.lstrip(".")
+    return "localhost"
+
+
+def warm_up(paths=None):
+    """
+    Request ``paths`` (default: ``warm_paths()``) in-process. Returns
+    ``[(path, status_code, milliseconds)]``.
+    """
+    # Importing the URL conf imports every view, serializer and model.
+    get_resolver().url_patterns
+    client = Client(SERVER_NAME=warm_host())
+    results = []
+    for path in paths or warm_paths():
+        started = time.perf_counter()
+        response = client.get(path)
+        results.append(
+            (path, response.status_code, (time.perf_counter() - started) * 1000)
+        )
+    token_blacklist.sync()
+    # Keep the warm-up out of the request metrics.
+    registry.reset()
+    return results
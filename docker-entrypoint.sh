@@ -0,0 +1,8 @@
+#!/bin/sh
+set -e
+
+if [ "$MIGRATE_ON_START" = "true" ]; then
+    python manage.py migrate --noinput
+fi
+
+exec gunicorn -c config/gunicorn.conf.py "$@"
@@ -0,0 +1,259 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from config.async_api import JSONResponse
+from config.routers import primary_reads
+
+DEFAULT_CATALOG_CACHE = {
+    "BACKEND": "movies.cache.SharedCatalogCache",
+    "OPTIONS": {"alias": "default"},
+}
+
+
+class BaseCatalogCache:
+    """
+    Holds rendered catalog responses. Every entry is keyed under the current
+    catalog version, so bumping the version on any catalog write makes all
+    older entries unreachable at once.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def get_version(self):
+        raise NotImplementedError
+
+    def bump_version(self):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    # Async variants for the ASGI read views; backends that do I/O run it
+    # in a thread.
+    async def aget(self, key):
+        return await sync_to_async(self.get)(key)
+
+    async def aset(self, key, value):
+        await sync_to_async(self.set)(key, value)
+
+    async def aget_version(self):
+        return await sync_to_async(self.get_version)()
+
+
+class LocalCatalogCache(BaseCatalogCache):
+    """
+    In-process LRU bounded to ``max_entries``. The version lives in the
+    process too, so a write on one worker never invalidates another's
+    entries; use it in tests, not in deployments.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._version = 1
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self):
+        return self._version
+
+    def bump_version(self):
+        with self._lock:
+            self._version += 1
+            # Entries under the old version can never be hit again.
+            self._entries.clear()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # Nothing here blocks on I/O, so skip the thread hop.
+    async def aget(self, key):
+        return self.get(key)
+
+    async def aset(self, key, value):
+        self.set(key, value)
+
+    async def aget_version(self):
+        return self.get_version()
+
+
+class SharedCatalogCache(BaseCatalogCache):
+    """
+    Backed by a Django cache alias (e.g. Redis) shared by every node, with
+    the catalog version stored alongside the entries. Old entries are left
+    to expire after ``timeout`` seconds.
+    """
+
+    version_key = "catalog:version"
+
+    def __init__(self, alias="default", timeout=300):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value):
+        self.cache.set(key, value, self.timeout)
+
+    def get_version(self):
+        version = self.cache.get(self.version_key)
+        if version is None:
+            self.cache.add(self.version_key, 1, None)
+            version = self.cache.get(self.version_key, 1)
+        return version
+
+    def bump_version(self):
+        try:
+            self.cache.incr(self.version_key)
+        except ValueError:
+            self.cache.add(self.version_key, 2, None)
+
+    def clear(self):
+        self.bump_version()
+
+
+@lru_cache(maxsize=None)
+def _load_cache(backend, options):
+    return import_string(backend)(**dict(options))
+
+
+def get_catalog_cache():
+    config = getattr(settings, "CATALOG_CACHE", DEFAULT_CATALOG_CACHE)
+    return _load_cache(
+        config["BACKEND"], tuple(sorted(config.get("OPTIONS", {}).items()))
+    )
+
+
+def bump_catalog_version():
+    """Invalidate every cached catalog response."""
+    get_catalog_cache().bump_version()
+
+
+def invalidate_catalog():
+    """
+    Invalidate cached catalog responses after a catalog write: now, and
+    again once the write is visible, so a read that raced the transaction
+    can't leave pre-commit data cached under the new version.
+    """
+    bump_catalog_version()
+    transaction.on_commit(bump_catalog_version)
+
+
+def _matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags
+
+
+def catalog_key(version, request):
+    return f"catalog:{version}:{request.get_full_path()}"
+
+
+def catalog_entry(data):
+    """``(etag, data)`` as stored in the cache."""
+    content = JSONRenderer().render(data)
+    return '"%s"' % hashlib.md5(content, usedforsecurity=False).hexdigest(), data
+
+
+def cached_catalog_response(request, build):
+    """
+    Serve a catalog GET from the cache, filling it with ``build()`` on a
+    miss, read from the primary. Responses carry an ``ETag``; a matching ``If-None-Match`` gets a
+    bodiless 304.
+    """
+    cache = get_catalog_cache()
+    key = catalog_key(cache.get_version(), request)
+    entry = cache.get(key)
+    if entry is None:
+        # Cached under the current version; a lagging replica could hold
+        # the data from before the write that bumped it.
+        with primary_reads():
+            response = build()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        entry = catalog_entry(response.data)
+        cache.set(key, entry)
+
+    etag, data = entry
+    if _matches(request.headers.get("If-None-Match"), etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+    response["ETag"] = etag
+    return response
+
+
+async def acached_catalog_response(request, build):
+    """
+    ``cached_catalog_response`` for the async read views: ``build`` is a
+    coroutine function returning a ``config.async_api.JSONResponse``.
+    """
+    cache = get_catalog_cache()
+    key = catalog_key(await cache.aget_version(), request)
+    entry = await cache.aget(key)
+    if entry is None:
+        with primary_reads():
+            response = await build()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        entry = catalog_entry(response.data)
+        await cache.aset(key, entry)
+
+    etag, data = entry
+    if _matches(request.headers.get("If-None-Match"), etag):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = JSONResponse(data)
+    response["ETag"] = etag
+    return response
+
+
+class CatalogCacheMixin:
+    """
+    Read-through catalog cache for a ViewSet's ``list`` and ``retrieve``.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return cached_catalog_response(
+            request, lambda: super(CatalogCacheMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_catalog_response(
+            request,
+            lambda: super(CatalogCacheMixin, self).retrieve(request, *args, **kwargs),
+        )
@@ -0,0 +1,260 @@
+import csv
+import io
+import json
+import time
+
+from django.db import IntegrityError, transaction
+
+from movies.cache import invalidate_catalog
+from movies.models import Genre, Language, Movie, MovieGenre
+from movies.serilizers import MovieImportSerializer
+
+DEFAULT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+UPSERT_FIELDS = [
+    "title",
+    "description",
+    "language",
+    "duration",
+    "rate",
+    "price",
+    "image_url",
+]
+
+
+def detect_format(name):
+    return "jsonl" if name.lower().endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def read_rows(stream, format="csv"):
+    """
+    Yield ``(line_number, row)`` from a CSV (with a header line) or JSON
+    Lines text stream. A line that cannot be parsed yields its error text
+    in place of the row. Bytes that are not UTF-8 end the feed with an
+    error, since the decoder cannot resume in the middle of it.
+    """
+    if format == "csv":
+        yield from _read_csv(stream)
+    else:
+        yield from _read_jsonl(stream)
+
+
+def _read_csv(stream):
+    reader = csv.DictReader(stream)
+    while True:
+        line_number = reader.line_num + 1
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            yield line_number, f"Invalid CSV: {exc}"
+            continue
+        except UnicodeDecodeError as exc:
+            yield line_number, f"Not valid UTF-8, import stopped: {exc}"
+            return
+        yield reader.line_num, row
+
+
+def _read_jsonl(stream):
+    line_number = 0
+    lines = iter(stream)
+    while True:
+        line_number += 1
+        try:
+            line = next(lines)
+        except StopIteration:
+            return
+        except UnicodeDecodeError as exc:
+            yield line_number, f"Not valid UTF-8, import stopped: {exc}"
+            return
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_number, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, "Expected a JSON object."
+            continue
+        yield line_number, row
+
+
+def text_stream(uploaded_file):
+    """Decode an uploaded (binary) file as UTF-8 while it is read."""
+    return io.TextIOWrapper(uploaded_file, encoding="utf-8-sig", newline="")
+
+
+class NameLookup:
+    """
+    In-memory ``name -> id`` table for a small model such as Language or
+    Genre. Loaded once, and names missing from it are created in bulk.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.ids = {}
+        for pk, name in model.objects.values_list("pk", "name").order_by("pk"):
+            # Names aren't unique; map duplicates to the oldest row.
+            self.ids.setdefault(name.casefold(), pk)
+
+    def resolve(self, names):
+        """Return ``{name: id}`` for ``names``, creating the missing ones."""
+        missing = {
+            name.casefold(): name for name in names if name.casefold() not in self.ids
+        }
+        if missing:
+            self.model.objects.bulk_create(
+                [self.model(name=name) for name in missing.values()]
+            )
+            for pk, name in self.model.objects.filter(
+                name__in=missing.values()
+            ).values_list("pk", "name"):
+                self.ids[name.casefold()] = pk
+        return {name: self.ids[name.casefold()] for name in names}
+
+
+class ImportResult:
+    def __init__(self):
+        self.processed = 0
+        self.imported = 0
+        self.errors = []
+        self.error_count = 0
+        self.elapsed = 0.0
+
+    def add_error(self, line, error):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    @property
+    def rows_per_second(self):
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "processed": self.processed,
+            "imported": self.imported,
+            "failed": self.error_count,
+            "seconds": round(self.elapsed, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": self.errors,
+        }
+
+
+class CatalogImporter:
+    """
+    Upsert movies from feed rows keyed by ``external_id``, ``chunk_size`` rows
+    per transaction: one ``bulk_create(update_conflicts=True)`` for the
+    movies and one delete plus one insert for their genres. A row that fails
+    validation is reported and skipped; the rest of the feed still loads.
+    A chunk the database rejects is rolled back to its savepoint and
+    retried row by row, so only the offending rows are reported.
+    """
+
+    def __init__(self, user, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.user = user
+        self.chunk_size = chunk_size
+        self.languages = NameLookup(Language)
+        self.genres = NameLookup(Genre)
+
+    def run(self, rows):
+        result = ImportResult()
+        started = time.perf_counter()
+        chunk = {}
+        for line, row in rows:
+            result.processed += 1
+            if isinstance(row, str):
+                result.add_error(line, row)
+                continue
+            serializer = MovieImportSerializer(data=row)
+            if not serializer.is_valid():
+                result.add_error(line, serializer.errors)
+                continue
+            data = serializer.validated_data
+            # A later row for the same movie wins.
+            chunk[data["external_id"]] = (line, data)
+            if len(chunk) >= self.chunk_size:
+                self.load_chunk(list(chunk.values()), result)
+                chunk = {}
+        if chunk:
+            self.load_chunk(list(chunk.values()), result)
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    def load_chunk(self, chunk, result):
+        """Write ``[(line, data), ...]``, recording the rows that fail."""
+        try:
+            result.imported += self.write_chunk([data for _, data in chunk])
+            return
+        except IntegrityError as exc:
+            error = f"Rejected by the database: {exc}"
+        # Names created in the rolled back savepoint are gone again.
+        self.languages = NameLookup(Language)
+        self.genres = NameLookup(Genre)
+        if len(chunk) == 1:
+            result.add_error(chunk[0][0], error)
+            return
+        for row in chunk:
+            self.load_chunk([row], result)
+
+    def write_chunk(self, chunk):
+        # A savepoint when the caller is already in a transaction, so a
+        # failed chunk rolls back on its own.
+        with transaction.atomic():
+            return self._write_chunk(chunk)
+
+    def _write_chunk(self, chunk):
+        language_ids = self.languages.resolve(
+            {data["language"] for data in chunk if data.get("language")}
+        )
+        genre_ids = self.genres.resolve(
+            {name for data in chunk for name in data.get("genres", ())}
+        )
+
+        Movie.objects.bulk_create(
+            [
+                Movie(
+                    external_id=data["external_id"],
+                    title=data["title"],
+                    description=data.get("description", ""),
+                    language_id=language_ids.get(data.get("language")),
+                    duration=data["duration"],
+                    user=self.user,
+                    rate=data["rate"],
+                    price=data["price"],
+                    image_url=data.get("image_url") or None,
+                )
+                for data in chunk
+            ],
+            update_conflicts=True,
+            unique_fields=["external_id"],
+            update_fields=UPSERT_FIELDS,
+        )
+
+        # A row with a genres value replaces the movie's genres; rows
+        # without one leave them alone.
+        tagged = {data["external_id"]: data["genres"] for data in chunk if "genres" in data}
+        if tagged:
+            movie_ids = dict(
+                Movie.objects.filter(external_id__in=tagged).values_list(
+                    "external_id", "id"
+                )
+            )
+            # One DELETE: MovieGenre has no delete signal receivers.
+            MovieGenre.objects.filter(movie_id__in=movie_ids.values()).delete()
+            MovieGenre.objects.bulk_create(
+                [
+                    MovieGenre(movie_id=movie_ids[external_id], genre_id=genre_ids[name])
+                    for external_id, names in tagged.items()
+                    for name in set(names)
+                ],
+                ignore_conflicts=True,
+            )
+
+        # bulk_create and the genre delete send no signals; invalidate once
+        # for the whole chunk.
+        invalidate_catalog()
+        return len(chunk)
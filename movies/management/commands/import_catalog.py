@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.importer import (
+    DEFAULT_CHUNK_SIZE,
+    CatalogImporter,
+    detect_format,
+    read_rows,
+)
+from user.models import UserAccount
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert movies from a distributor feed (CSV with a header line, or "
+        "JSON Lines) keyed by external_id, in chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=("csv", "jsonl"))
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            "--user",
+            required=True,
+            help="Email of the account the imported movies are attributed to.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = UserAccount.objects.get(email=options["user"])
+        except UserAccount.DoesNotExist:
+            raise CommandError(f"No user with email {options['user']}")
+
+        format = options["format"] or detect_format(options["path"])
+        importer = CatalogImporter(user, chunk_size=options["chunk_size"])
+        with open(options["path"], encoding="utf-8-sig", newline="") as feed:
+            result = importer.run(read_rows(feed, format))
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        if result.error_count > len(result.errors):
+            self.stderr.write(
+                f"... and {result.error_count - len(result.errors)} more errors"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.imported} of {result.processed} rows "
+                f"({result.error_count} failed) in {result.elapsed:.1f}s, "
+                f"{result.rows_per_second:.0f} rows/s"
+            )
+        )
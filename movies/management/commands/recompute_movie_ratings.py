@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from movies.cache import invalidate_catalog
+from movies.models import Movie
+from reservations.ratings import recompute_aggregates
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the rating aggregates on Movie from Review rows, in chunks "
+        "of movies. Use it to backfill or repair drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        started = time.perf_counter()
+        last_id = 0
+        updated = 0
+
+        while True:
+            movie_ids = list(
+                Movie.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not movie_ids:
+                break
+            last_id = movie_ids[-1]
+
+            with transaction.atomic():
+                updated += recompute_aggregates(
+                    Movie.objects.filter(id__gte=movie_ids[0], id__lte=last_id)
+                )
+
+        # The queryset updates skip Movie's signals; drop the cached catalog
+        # (ratings and the rating sort) once every chunk is written.
+        invalidate_catalog()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recomputed ratings for {updated} movies in {elapsed:.1f}s"
+            )
+        )
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0002_rename_language_id_movie_language_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['title'], name='movie_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='movie',
+            index=models.Index(fields=['-rate', 'title'], name='movie_rate_title_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 15:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0004_movie_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='genres',
+            field=models.ManyToManyField(blank=True, related_name='movies', through='movies.MovieGenre', to='movies.genre'),
+        ),
+    ]
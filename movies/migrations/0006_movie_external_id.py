@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 15:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('movies', '0005_movie_genres'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movie',
+            name='external_id',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -1,6 +1,12 @@
 from django.db import models
+from django.dispatch import Signal
+
 from user.models import UserAccount
 
+# Sent by the Movie genre helpers after they write MovieGenre rows in bulk;
+# movies.signals invalidates the catalog cache on it.
+genres_changed = Signal()
+
 
 class Language(models.Model):
     name = models.CharField(max_length=100)
@@ -18,6 +24,8 @@ class Genre(models.Model):
 
 # Create your models here.
 class Movie(models.Model):
+    # Id of the movie in the distributor feed; catalog imports upsert on it.
+    external_id = models.CharField(max_length=64, unique=True, null=True, blank=True)
     title = models.CharField(max_length=200)
     description = models.TextField()
     language= models.ForeignKey(Language, on_delete=models.SET_NULL, null=True)
@@ -26,12 +34,34 @@ class Movie(models.Model):
     rate = models.DecimalField(max_digits=3, decimal_places=1)
     price = models.DecimalField(max_digits=6, decimal_places=2)
     image_url = models.URLField(max_length=500, blank=True, null=True)
+    genres = models.ManyToManyField(
+        Genre, through="MovieGenre", related_name="movies", blank=True
+    )
+    # Aggregates of reservations.Review, maintained incrementally by
+    # reservations.ratings and repairable with recompute_movie_ratings.
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_average = models.FloatField(default=0, editable=False)
+    ratings_1 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_2 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_3 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_4 = models.PositiveIntegerField(default=0, editable=False)
+    ratings_5 = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.title
 
     class Meta:
         ordering = ["-rate", "title"]
+        indexes = [
+            models.Index(fields=["title"], name="movie_title_idx"),
+            # Matches Meta.ordering so listings are read in index order
+            # instead of sorting the whole table.
+            models.Index(fields=["-rate", "title"], name="movie_rate_title_idx"),
+            models.Index(
+                fields=["-rating_average", "title"], name="movie_rating_avg_title_idx"
+            ),
+        ]
 
     @property
     def short_description(self):
@@ -43,35 +73,73 @@ class Movie(models.Model):
 
     @property
     def genre_names(self):
+        # Served from the prefetch cache when listed with
+        # prefetch_related("genres").
         return [genre.name for genre in self.genres.all()]
 
     def add_genres(self, genre_list):
         """
-        Utility method to add genres to the movie.
-        :param genre_list: List of Genre instances
+        Utility method to add genres to the movie with a single insert.
+        Genres the movie already has are skipped.
+        :param genre_list: List of Genre instances or ids
         """
-
-        for genre in genre_list:
-            MovieGenre.objects.get_or_create(movie=self, genre=genre)
+        MovieGenre.objects.bulk_create(
+            [MovieGenre(movie=self, genre_id=_genre_id(genre)) for genre in genre_list],
+            ignore_conflicts=True,
+        )
+        self._genres_changed()
 
     def remove_genres(self, genre_list):
         """
         Utility method to remove specific genres from the movie.
-         :param genre_list: List of Genre instances
+         :param genre_list: List of Genre instances or ids
+        """
+        MovieGenre.objects.filter(
+            movie=self, genre_id__in=[_genre_id(genre) for genre in genre_list]
+        ).delete()
+        self._genres_changed()
+
+    def set_genres(self, genre_list):
+        """
+        Make ``genre_list`` the movie's genres: one delete for the genres it
+        no longer has and one insert for the new ones.
+         :param genre_list: List of Genre instances or ids
         """
-        MovieGenre.objects.filter(movie=self, genre__in=genre_list).delete()
+        genre_ids = {_genre_id(genre) for genre in genre_list}
+        MovieGenre.objects.filter(movie=self).exclude(genre_id__in=genre_ids).delete()
+        MovieGenre.objects.bulk_create(
+            [MovieGenre(movie=self, genre_id=genre_id) for genre_id in genre_ids],
+            ignore_conflicts=True,
+        )
+        self._genres_changed()
 
     def clear_genres(self):
         """
         Remove all genres associated with this movie.
         """
-        self.moviegenre_set.all().delete()
+        MovieGenre.objects.filter(movie=self).delete()
+        self._genres_changed()
+
+    def _genres_changed(self):
+        # bulk_create and queryset deletes of MovieGenre send no per-row
+        # signals; one genres_changed stands in for all of them.
+        genres_changed.send(sender=Movie, movie=self)
+        if hasattr(self, "_prefetched_objects_cache"):
+            self._prefetched_objects_cache.pop("genres", None)
+
+    @property
+    def rating_histogram(self):
+        return {star: getattr(self, f"ratings_{star}") for star in range(1, 6)}
 
     @property
     def duration_minutes(self):
         return int(self.duration.total_seconds() // 60)
 
 
+def _genre_id(genre):
+    return genre.pk if isinstance(genre, Genre) else genre
+
+
 class MovieGenre(models.Model):
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE)
     genre = models.ForeignKey(Genre, on_delete=models.CASCADE)
@@ -83,3 +151,10 @@ class MovieGenre(models.Model):
 
     def __str__(self):
         return f"{self.movie.title} - {self.genre.name}"
+
+    def delete(self, *args, **kwargs):
+        # MovieGenre has no delete signal receivers, so queryset deletes of
+        # it run as a single DELETE; single rows announce themselves here.
+        result = super().delete(*args, **kwargs)
+        genres_changed.send(sender=Movie, movie=self.movie)
+        return result
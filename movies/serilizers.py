@@ -1,12 +1,40 @@
+import datetime
+
 from rest_framework import serializers
 from movies.models import Movie, MovieGenre, Language, Genre
 
 
+class SparseFieldsetMixin:
+    """
+    Lets GET clients trim a response with ``?fields=id,title``. Unknown names
+    are ignored, and nested serializers are left whole.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return
+        requested = request.query_params.get("fields")
+        if not requested:
+            return
+        wanted = {name.strip() for name in requested.split(",")}
+        for name in set(self.fields) - wanted:
+            self.fields.pop(name)
+
+
 # MovieGenre Serializer
-class MovieSerializer(serializers.ModelSerializer):
+class MovieSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    rating_histogram = serializers.DictField(
+        child=serializers.IntegerField(), read_only=True
+    )
+    # List it from a queryset with prefetch_related("genres").
+    genre_names = serializers.ListField(child=serializers.CharField(), read_only=True)
+
     class Meta:
         model = Movie
         fields = (
+            "id",
             "title",
             "description",
             "language",
@@ -15,7 +43,20 @@ class MovieSerializer(serializers.ModelSerializer):
             "rate",
             "price",
             "image_url",
+            "genre_names",
+            "review_count",
+            "rating_average",
+            "rating_histogram",
         )
+        read_only_fields = ("review_count", "rating_average")
+
+
+class MovieSummarySerializer(serializers.ModelSerializer):
+    """Movie as embedded in showtime listings, without the long description."""
+
+    class Meta:
+        model = Movie
+        fields = ("id", "title", "language", "duration", "rate", "image_url")
 
 
 # MovieGenre Serializer
@@ -39,3 +80,41 @@ class GenreSerializer(serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = "name"
+
+
+class GenreNamesField(serializers.Field):
+    """Genre names as a JSON list or a ``|``-separated string (CSV feeds)."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = data.split("|")
+        if not isinstance(data, list) or not all(isinstance(n, str) for n in data):
+            raise serializers.ValidationError("Expected a list of genre names.")
+        return [name.strip() for name in data if name.strip()]
+
+
+class FeedDurationField(serializers.DurationField):
+    """Accepts whole minutes as well as ``HH:MM:SS``."""
+
+    def to_internal_value(self, value):
+        if isinstance(value, int) or (isinstance(value, str) and value.isdigit()):
+            return datetime.timedelta(minutes=int(value))
+        return super().to_internal_value(value)
+
+
+class MovieImportSerializer(serializers.Serializer):
+    """Validates one row of a catalog feed (see movies.importer)."""
+
+    external_id = serializers.CharField(max_length=64)
+    title = serializers.CharField(max_length=200)
+    description = serializers.CharField(required=False, allow_blank=True)
+    language = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    genres = GenreNamesField(required=False)
+    duration = FeedDurationField()
+    rate = serializers.DecimalField(
+        max_digits=3, decimal_places=1, min_value=0, max_value=10
+    )
+    price = serializers.DecimalField(max_digits=6, decimal_places=2, min_value=0)
+    image_url = serializers.URLField(
+        max_length=500, required=False, allow_blank=True, allow_null=True
+    )
@@ -0,0 +1,32 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from movies.cache import invalidate_catalog
+from movies.models import Genre, Language, Movie, MovieGenre, genres_changed
+
+
+@receiver(post_save, sender=Movie)
+@receiver(post_delete, sender=Movie)
+@receiver(post_save, sender=MovieGenre)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+def invalidate_catalog_cache(sender, **kwargs):
+    invalidate_catalog()
+
+
+# No post_delete receiver for MovieGenre: with one, Django selects the rows
+# of every queryset delete to signal each of them. Deletes of MovieGenre
+# send genres_changed instead, once per call.
+@receiver(genres_changed, sender=Movie)
+def invalidate_catalog_on_bulk_genre_write(sender, **kwargs):
+    invalidate_catalog()
+
+
+@receiver(m2m_changed, sender=Movie.genres.through)
+def invalidate_catalog_on_genre_change(sender, action, **kwargs):
+    # movie.genres.add()/remove()/set()/clear() write MovieGenre rows in
+    # bulk, without save/delete signals.
+    if action.startswith("post_"):
+        invalidate_catalog()
@@ -0,0 +1,423 @@
+"""
+Seeded, production-shaped data for load testing (see generate_dummy_data).
+
+Every batch draws from its own RNG derived from the seed and the batch's
+position, so a run is reproducible whether its batches are written by one
+process or spread over several. Movie popularity follows a power law and
+showtimes cluster around prime time, so caches, indexes and hot rows see
+the same skew as in production.
+"""
+
+import datetime
+import itertools
+import random
+import time
+from multiprocessing import get_context
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.db import connections, transaction
+from django.utils import timezone
+
+from movies.cache import invalidate_catalog
+from movies.models import Genre, Language, Movie, MovieGenre
+from reservations.layout import default_layout, seat_plan
+from reservations.models import Auditorium, BookingHistory, Review, Seat, Showtime
+from reservations.schedule import refresh_schedules, schedule_enabled
+from reservations.seatmap import SeatMap
+from user.models import UserAccount
+
+EMAIL_DOMAIN = "load.test"
+EXTERNAL_ID_PREFIX = "synthetic-"
+DEFAULT_PASSWORD = "Password@123"
+
+LANGUAGES = [
+    "English", "Hindi", "Spanish", "French", "Japanese", "Korean", "Tamil",
+    "Telugu", "German", "Italian", "Mandarin", "Portuguese",
+]
+GENRES = [
+    "Action", "Drama", "Comedy", "Thriller", "Romance", "Horror", "Sci-Fi",
+    "Animation", "Documentary", "Fantasy", "Crime", "Adventure", "Family",
+]
+WORDS = [
+    "night", "city", "last", "dark", "river", "king", "road", "storm", "silent",
+    "golden", "return", "shadow", "fire", "heart", "winter", "secret", "lost",
+    "empire", "dream", "edge", "star", "blood", "ocean", "garden", "echo",
+    "iron", "glass", "wild", "hidden", "broken", "summer", "island", "ghost",
+]
+FIRST_NAMES = [
+    "Asha", "Ben", "Chen", "Dana", "Elif", "Femi", "Gita", "Hugo", "Ines",
+    "Jon", "Kira", "Luis", "Mei", "Nia", "Omar", "Priya", "Quinn", "Ravi",
+    "Sara", "Tom", "Uma", "Vik", "Wen", "Yara", "Zoe",
+]
+LAST_NAMES = [
+    "Khan", "Smith", "Garcia", "Tanaka", "Okafor", "Rossi", "Patel", "Kim",
+    "Muller", "Silva", "Novak", "Haddad", "Ivanova", "Nguyen", "Cohen",
+]
+CITIES = [
+    "Mumbai", "Delhi", "Bengaluru", "Pune", "Chennai", "Hyderabad", "Kolkata",
+    "Jaipur", "Kochi", "Ahmedabad",
+]
+AUDITORIUM_SIZES = [(60, 4), (90, 5), (120, 4), (180, 2), (250, 1)]
+
+# Relative demand by local start hour: quiet mornings, a peak at 19-20h.
+SHOW_HOURS = {
+    10: 1, 11: 1, 12: 2, 13: 3, 14: 3, 15: 3, 16: 4, 17: 6,
+    18: 9, 19: 12, 20: 12, 21: 10, 22: 6, 23: 3,
+}
+PEAK_DEMAND = max(SHOW_HOURS.values())
+
+# Filled in by the parent before workers fork, so they inherit the id
+# tables instead of having them pickled into every task.
+_shared = {}
+
+
+def parse_count(value):
+    """Parse ``1000``, ``50k``, ``2M`` or ``1e6`` into an int."""
+    value = value.strip().lower()
+    multiplier = 1
+    if value and value[-1] in "km":
+        multiplier = 1000 if value[-1] == "k" else 1_000_000
+        value = value[:-1]
+    count = int(float(value) * multiplier)
+    if count < 0:
+        raise ValueError(f"count must not be negative: {value}")
+    return count
+
+
+def rng_for(seed, *parts):
+    return random.Random(":".join(str(part) for part in (seed, *parts)))
+
+
+def power_law_weights(count, exponent=1.1):
+    """Cumulative Zipf weights: rank 0 is the most popular."""
+    return list(
+        itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(count))
+    )
+
+
+def active_index(rng, count, skew=3.0):
+    """An index in ``range(count)`` biased towards the front: a few heavy users."""
+    return min(count - 1, int(count * rng.random() ** skew))
+
+
+def batches(total, size):
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def run_batches(func, tasks, workers):
+    if workers <= 1 or len(tasks) <= 1:
+        return [func(task) for task in tasks]
+    # Children must open their own connections rather than share ours.
+    connections.close_all()
+    with get_context("fork").Pool(workers) as pool:
+        return pool.map(func, tasks)
+
+
+def movie_rate(seed, rank):
+    return round(rng_for(seed, "rate", rank).uniform(4.0, 9.5), 1)
+
+
+class Generator:
+    """
+    Writes users, movies, auditoriums, showtimes (with their seats and
+    bookings) and reviews, each in ``batch_size`` bulk inserts.
+    """
+
+    def __init__(
+        self,
+        users=1000,
+        movies=200,
+        auditoriums=10,
+        days=7,
+        reviews=2000,
+        seed=42,
+        batch_size=5000,
+        workers=1,
+        start_date=None,
+        log=print,
+    ):
+        self.users = users
+        self.movies = movies
+        self.auditoriums = auditoriums
+        self.days = days
+        self.reviews = reviews
+        self.seed = seed
+        self.batch_size = batch_size
+        self.workers = workers
+        self.start_date = start_date or timezone.localdate()
+        self.log = log
+
+    def run(self):
+        if not (self.users and self.movies):
+            raise ValueError("Need at least one user and one movie.")
+        for stage in (
+            self.create_users,
+            self.create_catalog,
+            self.create_auditoriums,
+            self.create_showtimes,
+            self.create_reviews,
+            self.finish,
+        ):
+            started = time.perf_counter()
+            summary = stage()
+            elapsed = time.perf_counter() - started
+            self.log(f"{stage.__name__}: {summary} ({elapsed:.1f}s)")
+
+    def create_users(self):
+        _shared["password"] = make_password(DEFAULT_PASSWORD)
+        tasks = [
+            (self.seed, start, stop)
+            for start, stop in batches(self.users, self.batch_size)
+        ]
+        created = sum(run_batches(_create_users, tasks, self.workers))
+        users = UserAccount.objects.filter(email__endswith=f"@{EMAIL_DOMAIN}")
+        _shared["user_ids"] = list(users.order_by("id").values_list("id", flat=True))
+        _shared["admin_ids"] = list(
+            users.filter(role="admin").values_list("id", flat=True)
+        ) or _shared["user_ids"][:1]
+        return f"{created} users"
+
+    def create_catalog(self):
+        rng = rng_for(self.seed, "catalog")
+        language_ids = [
+            Language.objects.get_or_create(name=name)[0].id for name in LANGUAGES
+        ]
+        genre_ids = [Genre.objects.get_or_create(name=name)[0].id for name in GENRES]
+        admin_ids = _shared["admin_ids"]
+        _shared["rates"] = [movie_rate(self.seed, rank) for rank in range(self.movies)]
+        language_weights = power_law_weights(len(language_ids), 1.5)
+        genre_weights = power_law_weights(len(genre_ids), 0.8)
+
+        for start, stop in batches(self.movies, self.batch_size):
+            movies = []
+            for rank in range(start, stop):
+                title = " ".join(rng.sample(WORDS, rng.randint(1, 3))).title()
+                movies.append(
+                    Movie(
+                        external_id=f"{EXTERNAL_ID_PREFIX}{rank}",
+                        title=f"{title} {rank}",
+                        description=" ".join(
+                            rng.choices(WORDS, k=rng.randint(20, 60))
+                        ),
+                        language_id=rng.choices(
+                            language_ids, cum_weights=language_weights
+                        )[0],
+                        duration=datetime.timedelta(minutes=rng.randint(85, 185)),
+                        user_id=rng.choice(admin_ids),
+                        rate=_shared["rates"][rank],
+                        price=rng.choice([150, 200, 250, 300, 350, 450]),
+                    )
+                )
+            Movie.objects.bulk_create(movies, ignore_conflicts=True)
+
+        movie_ids = dict(
+            Movie.objects.filter(
+                external_id__startswith=EXTERNAL_ID_PREFIX
+            ).values_list("external_id", "id")
+        )
+        # Index = popularity rank.
+        _shared["movie_ids"] = [
+            movie_ids[f"{EXTERNAL_ID_PREFIX}{rank}"] for rank in range(self.movies)
+        ]
+        tags = [
+            MovieGenre(movie_id=movie_id, genre_id=genre_id)
+            for movie_id in _shared["movie_ids"]
+            for genre_id in {
+                rng.choices(genre_ids, cum_weights=genre_weights)[0]
+                for _ in range(rng.randint(1, 3))
+            }
+        ]
+        MovieGenre.objects.bulk_create(
+            tags, batch_size=self.batch_size, ignore_conflicts=True
+        )
+        return f"{self.movies} movies, {len(tags)} genre tags"
+
+    def create_auditoriums(self):
+        rng = rng_for(self.seed, "auditoriums")
+        sizes, weights = zip(*AUDITORIUM_SIZES)
+        auditoriums = []
+        for number in range(self.auditoriums):
+            total_seats = rng.choices(sizes, weights=weights)[0]
+            layout = default_layout(total_seats)
+            for row in layout[-2:]:
+                row["category"] = "premium"
+            auditoriums.append(
+                Auditorium(
+                    name=f"Screen {number + 1}",
+                    total_seats=total_seats,
+                    total_shows=len(SHOW_HOURS),
+                    place=rng.choice(CITIES),
+                    admin_id=rng.choice(_shared["admin_ids"]),
+                    seat_layout=layout,
+                )
+            )
+        created = Auditorium.objects.bulk_create(
+            auditoriums, batch_size=self.batch_size
+        )
+        _shared["auditoriums"] = [(a.id, a.seat_layout) for a in created]
+        return f"{len(created)} auditoriums"
+
+    def create_showtimes(self):
+        _shared["movie_weights"] = power_law_weights(self.movies)
+        # One task per auditorium: its showtimes for every day, their seats
+        # and bookings.
+        tasks = [
+            (self.seed, number, self.start_date, self.days, self.batch_size)
+            for number in range(len(_shared["auditoriums"]))
+        ]
+        totals = run_batches(_create_showtimes, tasks, self.workers)
+        showtimes, seats, bookings = (
+            sum(column) for column in zip(*totals or [(0, 0, 0)])
+        )
+        return f"{showtimes} showtimes, {seats} seats, {bookings} bookings"
+
+    def create_reviews(self):
+        tasks = [
+            (self.seed, start, stop)
+            for start, stop in batches(self.reviews, self.batch_size)
+        ]
+        created = sum(run_batches(_create_reviews, tasks, self.workers))
+        # bulk_create skips the signals that keep the rating aggregates.
+        call_command("recompute_movie_ratings", stdout=_NullWriter())
+        return f"{created} reviews"
+
+    def finish(self):
+        invalidate_catalog()
+        dates = [
+            self.start_date + datetime.timedelta(days=day) for day in range(self.days)
+        ]
+        if schedule_enabled():
+            refresh_schedules(dates)
+        return f"refreshed {len(dates)} schedule days"
+
+
+class _NullWriter:
+    def write(self, *args, **kwargs):
+        pass
+
+
+def _create_users(task):
+    seed, start, stop = task
+    rng = rng_for(seed, "users", start)
+    users = [
+        UserAccount(
+            email=f"user{number}@{EMAIL_DOMAIN}",
+            name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            password=_shared["password"],
+            role="admin" if rng.random() < 0.001 else "user",
+        )
+        for number in range(start, stop)
+    ]
+    UserAccount.objects.bulk_create(users, ignore_conflicts=True)
+    return len(users)
+
+
+def _occupancy(rng, rank, hour, days_ahead, days):
+    demand = SHOW_HOURS[hour] / PEAK_DEMAND
+    popularity = 1 / (1 + rank / 25) ** 0.5
+    # Shows further out have sold fewer tickets so far.
+    sold_so_far = 1 - days_ahead / (days + 1)
+    share = 0.9 * demand * popularity * sold_so_far * rng.uniform(0.6, 1.3)
+    return min(0.98, share)
+
+
+def _create_showtimes(task):
+    seed, number, start_date, days, batch_size = task
+    rng = rng_for(seed, "showtimes", number)
+    user_ids = _shared["user_ids"]
+    movie_ids = _shared["movie_ids"]
+    movie_weights = _shared["movie_weights"]
+    auditorium_id, layout = _shared["auditoriums"][number]
+    plan = seat_plan(layout)
+    hours, hour_weights = zip(*SHOW_HOURS.items())
+    now = timezone.now()
+
+    showtimes, booked_seats = [], []
+    for day in range(days):
+        date = start_date + datetime.timedelta(days=day)
+        show_hours = {
+            rng.choices(hours, weights=hour_weights)[0]
+            for _ in range(rng.randint(3, 6))
+        }
+        for hour in sorted(show_hours):
+            start_time = timezone.make_aware(
+                datetime.datetime.combine(
+                    date, datetime.time(hour, rng.choice((0, 15, 30, 45)))
+                )
+            )
+            rank = rng.choices(range(len(movie_ids)), cum_weights=movie_weights)[0]
+            share = _occupancy(rng, rank, hour, day, days)
+            booked = set(rng.sample(range(len(plan)), int(len(plan) * share)))
+            seat_map = SeatMap([label for label, _ in plan])
+            for index in booked:
+                seat_map.book(index)
+            if rng.random() < 0.01:
+                status = "cancelled"
+            else:
+                status = "completed" if start_time < now else "scheduled"
+            showtimes.append(
+                Showtime(
+                    movie_id=movie_ids[rank],
+                    auditorium_id=auditorium_id,
+                    start_time=start_time,
+                    status=status,
+                    seat_map=seat_map.to_bytes(),
+                )
+            )
+            booked_seats.append(booked)
+
+    with transaction.atomic():
+        showtimes = Showtime.objects.bulk_create(showtimes, batch_size=batch_size)
+        seats = Seat.objects.bulk_create(
+            (
+                Seat(
+                    showtime_id=showtime.id,
+                    seat_number=label,
+                    category=category,
+                    is_booked=index in booked,
+                )
+                for showtime, booked in zip(showtimes, booked_seats)
+                for index, (label, category) in enumerate(plan)
+            ),
+            batch_size=batch_size,
+        )
+        movie_of = {showtime.id: showtime.movie_id for showtime in showtimes}
+        bookings = BookingHistory.objects.bulk_create(
+            (
+                BookingHistory(
+                    user_id=user_ids[active_index(rng, len(user_ids))],
+                    movie_id=movie_of[seat.showtime_id],
+                    showtime_id=seat.showtime_id,
+                    seat_id=seat.id,
+                    tickets=1,
+                )
+                for seat in seats
+                if seat.is_booked
+            ),
+            batch_size=batch_size,
+        )
+    return len(showtimes), len(seats), len(bookings)
+
+
+def _create_reviews(task):
+    seed, start, stop = task
+    rng = rng_for(seed, "reviews", start)
+    user_ids = _shared["user_ids"]
+    movie_ids = _shared["movie_ids"]
+    rates = _shared["rates"]
+    ranks = rng.choices(
+        range(len(movie_ids)), cum_weights=_shared["movie_weights"], k=stop - start
+    )
+    reviews = [
+        Review(
+            user_id=user_ids[active_index(rng, len(user_ids))],
+            movie_id=movie_ids[rank],
+            # Scores follow the movie's rate (out of 10) with some spread.
+            rating=min(5, max(1, round(rng.gauss(float(rates[rank]) / 2, 1)))),
+            comment=" ".join(rng.choices(WORDS, k=rng.randint(0, 25))),
+        )
+        for rank in ranks
+    ]
+    Review.objects.bulk_create(reviews)
+    return len(reviews)
@@ -1,12 +1,25 @@
 # movies/tests.py
 
+import os
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError
 from django.urls import reverse
 from rest_framework.test import APIClient
 from django.test import TestCase
 from datetime import timedelta, time, datetime
 from django.utils import timezone  # Import timezone
-from movies.models import Movie, Language
-from reservations.models import Auditorium, Showtime, Seat
+from movies.cache import LocalCatalogCache, SharedCatalogCache, get_catalog_cache
+from movies.importer import CatalogImporter, read_rows, text_stream
+from movies.synthetic import Generator, parse_count
+from movies.models import Movie, Language, Genre, MovieGenre
+from reservations.models import Auditorium, BookingHistory, Review, Showtime, Seat
+from reservations.seatmap import SeatMap
 from user.models import UserAccount  # adjust if your user model import is different
 
 from django.contrib.auth import get_user_model
@@ -147,7 +160,101 @@ class MovieViewSetTest(TestCase):
     def test_admin_user_can_access_movies_list(self):
         response = self.client.get("/api/movies/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_movies_list_filters_and_sparse_fields(self):
+        other_language = Language.objects.create(name="French")
+        Movie.objects.create(
+            title="Amelie",
+            description="Paris.",
+            duration=timedelta(hours=2),
+            language=other_language,
+            user=self.admin_user,
+            rate=8.3,
+            price=9.00,
+        )
+        response = self.client.get(
+            "/api/movies/", {"language": other_language.id, "fields": "id,title"}
+        )
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0], {
+            "id": Movie.objects.get(title="Amelie").id,
+            "title": "Amelie",
+        })
+
+        response = self.client.get("/api/movies/", {"min_rate": "8.5"})
+        self.assertEqual(
+            [m["title"] for m in response.data["results"]], ["Interstellar"]
+        )
+
+        response = self.client.get("/api/movies/", {"min_rate": "high"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_genre_bulk_operations(self):
+        action, drama, scifi = (
+            Genre.objects.create(name=name) for name in ("Action", "Drama", "Sci-Fi")
+        )
+        with self.assertNumQueries(1):
+            self.movie.add_genres([action, drama])
+        self.movie.add_genres([drama.id, scifi])
+        self.assertEqual(
+            sorted(self.movie.genre_names), ["Action", "Drama", "Sci-Fi"]
+        )
+
+        # One DELETE and one INSERT, with no per-row signals in between.
+        with self.assertNumQueries(2):
+            self.movie.set_genres([scifi])
+        self.assertEqual(self.movie.genre_names, ["Sci-Fi"])
+        with self.assertNumQueries(1):
+            self.movie.remove_genres([scifi])
+        self.assertFalse(MovieGenre.objects.exists())
+
+    def test_genre_deletes_invalidate_the_catalog_once(self):
+        genres = [Genre.objects.create(name=f"Genre {i}") for i in range(3)]
+        self.movie.add_genres(genres)
+        with mock.patch("movies.signals.invalidate_catalog") as invalidate:
+            self.movie.clear_genres()
+        invalidate.assert_called_once_with()
+
+        self.movie.add_genres(genres)
+        with mock.patch("movies.signals.invalidate_catalog") as invalidate:
+            MovieGenre.objects.filter(movie=self.movie).first().delete()
+        invalidate.assert_called_once_with()
+
+    def test_movie_list_includes_genre_names_with_one_prefetch(self):
+        genres = [Genre.objects.create(name=f"Genre {i}") for i in range(3)]
+        for i in range(5):
+            movie = Movie.objects.create(
+                title=f"Movie {i}",
+                description="",
+                duration=timedelta(hours=2),
+                language=self.language,
+                user=self.admin_user,
+                rate=7.0,
+                price=10.00,
+            )
+            movie.add_genres(genres[: i % 3 + 1])
+        self.movie.add_genres(genres)
+
+        # User lookup, count, page of movies, genres of the page.
+        with self.assertNumQueries(4):
+            response = self.client.get("/api/movies/")
+        names = {m["title"]: m["genre_names"] for m in response.data["results"]}
+        self.assertEqual(sorted(names["Interstellar"]), ["Genre 0", "Genre 1", "Genre 2"])
+        self.assertEqual(names["Movie 0"], ["Genre 0"])
+
+    def test_genre_change_invalidates_catalog(self):
+        genre = Genre.objects.create(name="Drama")
+        self.client.get(f"/api/movies/{self.movie.id}/")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.movie.add_genres([genre])
+        response = self.client.get(f"/api/movies/{self.movie.id}/")
+        self.assertEqual(response.data["genre_names"], ["Drama"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.movie.genres.clear()
+        response = self.client.get(f"/api/movies/{self.movie.id}/")
+        self.assertEqual(response.data["genre_names"], [])
 
     def test_admin_user_can_create_movie(self):
         new_movie_data = {
@@ -184,6 +291,278 @@ class MovieViewSetTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
 
+class CatalogImportTest(TestCase):
+    CSV_FEED = (
+        "external_id,title,description,language,genres,duration,rate,price\n"
+        "d-1,Alien,In space,English,Horror|Sci-Fi,117,8.5,10.00\n"
+        "d-2,Amelie,Paris,French,Romance,02:02:00,8.3,9.00\n"
+        "d-3,Broken,,English,,soon,8.0,9.00\n"
+        "d-4,Heat,LA,english,Crime,170,99,9.00\n"
+    )
+
+    def setUp(self):
+        self.admin = UserAccount.objects.create_superuser(
+            email="admin@example.com", name="Admin", password="adminpass"
+        )
+        self.english = Language.objects.create(name="English")
+
+    def write_feed(self, content, suffix):
+        feed = tempfile.NamedTemporaryFile("w", suffix=suffix, delete=False)
+        self.addCleanup(os.unlink, feed.name)
+        with feed:
+            feed.write(content)
+        return feed.name
+
+    def test_command_upserts_and_reports_bad_rows(self):
+        path = self.write_feed(self.CSV_FEED, ".csv")
+        out, err = StringIO(), StringIO()
+        call_command(
+            "import_catalog", path, user=self.admin.email, chunk_size=1,
+            stdout=out, stderr=err,
+        )
+        self.assertIn("Imported 2 of 4 rows (2 failed)", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
+        self.assertIn("line 4:", err.getvalue())
+        self.assertIn("line 5:", err.getvalue())
+
+        alien = Movie.objects.get(external_id="d-1")
+        self.assertEqual(alien.language, self.english)
+        self.assertEqual(alien.duration, timedelta(minutes=117))
+        self.assertEqual(sorted(alien.genre_names), ["Horror", "Sci-Fi"])
+        self.assertEqual(Language.objects.filter(name="French").count(), 1)
+
+        # Re-importing updates in place instead of duplicating.
+        path = self.write_feed(
+            '{"external_id": "d-1", "title": "Alien (Director\'s Cut)", '
+            '"duration": 116, "rate": "8.6", "price": "11.00", "genres": ["Horror"]}\n'
+            "not json\n",
+            ".jsonl",
+        )
+        call_command(
+            "import_catalog", path, user=self.admin.email, stdout=out, stderr=err
+        )
+        alien.refresh_from_db()
+        self.assertEqual(Movie.objects.count(), 2)
+        self.assertEqual(alien.title, "Alien (Director's Cut)")
+        self.assertEqual(alien.genre_names, ["Horror"])
+
+    def test_malformed_rows_and_duplicate_ids_are_reported_not_fatal(self):
+        header = self.CSV_FEED.splitlines(keepends=True)[0]
+        feed = header + (
+            "d-1,Alien,In space,English,Horror,117,8.5,10.00\n"
+            f"d-2,{'x' * 200_000},,English,,100,7.0,9.00\n"
+            "d-1,Alien (Remastered),In space,English,Horror,117,8.6,10.00\n"
+            "d-3,Heat,LA,English,Crime,170,8.3,9.00\n"
+        )
+        result = CatalogImporter(self.admin, chunk_size=2).run(
+            read_rows(StringIO(feed))
+        )
+        self.assertEqual((result.processed, result.imported), (4, 2))
+        self.assertEqual(len(result.errors), 1)
+        self.assertEqual(result.errors[0]["line"], 3)
+        self.assertIn("Invalid CSV", result.errors[0]["error"])
+        self.assertEqual(
+            Movie.objects.get(external_id="d-1").title, "Alien (Remastered)"
+        )
+        self.assertTrue(Movie.objects.filter(external_id="d-3").exists())
+
+        # Undecodable bytes stop the feed with an error instead of a crash.
+        upload = BytesIO(header.encode() + b"d-4,Caf\xe9,,English,,90,7.0,9.00\n")
+        result = CatalogImporter(self.admin).run(read_rows(text_stream(upload)))
+        self.assertEqual(result.imported, 0)
+        self.assertIn("UTF-8", result.errors[0]["error"])
+
+    def test_rows_the_database_rejects_are_reported(self):
+        bulk_create = Movie.objects.bulk_create
+
+        def reject_d2(movies, **kwargs):
+            if any(movie.external_id == "d-2" for movie in movies):
+                raise IntegrityError("duplicate key value")
+            return bulk_create(movies, **kwargs)
+
+        rows = read_rows(StringIO(self.CSV_FEED))
+        with mock.patch.object(Movie.objects, "bulk_create", side_effect=reject_d2):
+            result = CatalogImporter(self.admin, chunk_size=10).run(rows)
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(
+            [error["line"] for error in result.errors], [4, 5, 3]
+        )
+        self.assertIn("Rejected by the database", result.errors[-1]["error"])
+        self.assertEqual(
+            list(Movie.objects.values_list("external_id", flat=True)), ["d-1"]
+        )
+        # French was created in the rolled back chunk; the retry made it again.
+        self.assertEqual(Language.objects.filter(name="French").count(), 0)
+        self.assertEqual(
+            sorted(Movie.objects.get().genre_names), ["Horror", "Sci-Fi"]
+        )
+
+    def test_reimport_invalidates_the_catalog_once_per_chunk(self):
+        feed = self.write_feed(self.CSV_FEED, ".csv")
+        call_command(
+            "import_catalog", feed, user=self.admin.email, stdout=StringIO(),
+            stderr=StringIO(),
+        )
+        with mock.patch("movies.signals.invalidate_catalog") as per_row, mock.patch(
+            "movies.importer.invalidate_catalog"
+        ) as per_chunk:
+            result = CatalogImporter(self.admin, chunk_size=10).run(
+                read_rows(StringIO(self.CSV_FEED))
+            )
+        self.assertEqual(result.imported, 2)
+        per_chunk.assert_called_once_with()
+        per_row.assert_not_called()
+
+    def test_admin_api_import(self):
+        client = APIClient()
+        upload = SimpleUploadedFile("feed.csv", self.CSV_FEED.encode())
+        response = client.post("/api/movies/import/", {"file": upload})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        customer = UserAccount.objects.create_user(
+            email="customer@example.com", name="Customer", password="password"
+        )
+        client.force_authenticate(customer)
+        upload = SimpleUploadedFile("feed.csv", self.CSV_FEED.encode())
+        response = client.post("/api/movies/import/", {"file": upload})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        client.force_authenticate(self.admin)
+        upload = SimpleUploadedFile("feed.csv", self.CSV_FEED.encode())
+        response = client.post(
+            "/api/movies/import/", {"file": upload, "chunk_size": 2}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["imported"], 2)
+        self.assertEqual(response.data["failed"], 2)
+        self.assertEqual(
+            [error["line"] for error in response.data["errors"]], [4, 5]
+        )
+        self.assertIn("duration", response.data["errors"][0]["error"])
+        self.assertEqual(
+            client.get("/api/movies/").data["count"], 2
+        )
+
+
+class SyntheticDataTest(TestCase):
+    def generate(self, **options):
+        options = {
+            "users": 30,
+            "movies": 12,
+            "auditoriums": 2,
+            "days": 2,
+            "reviews": 50,
+            "batch_size": 7,
+            "log": lambda message: None,
+            **options,
+        }
+        Generator(**options).run()
+
+    def test_parse_count(self):
+        self.assertEqual(parse_count("1e6"), 1_000_000)
+        self.assertEqual(parse_count("50k"), 50_000)
+        self.assertEqual(parse_count("250"), 250)
+
+    def test_generates_consistent_data(self):
+        self.generate()
+        self.assertEqual(UserAccount.objects.count(), 30)
+        self.assertEqual(Movie.objects.count(), 12)
+        self.assertEqual(Review.objects.count(), 50)
+
+        showtimes = Showtime.objects.select_related("auditorium")
+        self.assertTrue(showtimes.exists())
+        for showtime in showtimes:
+            seats = Seat.objects.filter(showtime=showtime)
+            self.assertEqual(seats.count(), showtime.auditorium.total_seats)
+            booked = set(
+                seats.filter(is_booked=True).values_list("seat_number", flat=True)
+            )
+            seat_map = SeatMap.for_layout(showtime.auditorium.layout, showtime.seat_map)
+            self.assertEqual(
+                set(seat_map.labels) - set(seat_map.available_labels()), booked
+            )
+            self.assertEqual(
+                BookingHistory.objects.filter(showtime=showtime).count(), len(booked)
+            )
+
+        movie = Movie.objects.order_by("-review_count").first()
+        self.assertEqual(
+            movie.review_count, Review.objects.filter(movie=movie).count()
+        )
+
+    def test_same_seed_same_catalog(self):
+        self.generate(seed=3)
+        first = list(Movie.objects.order_by("external_id").values_list("title", "rate"))
+        Movie.objects.all().delete()
+        self.generate(seed=3)
+        again = list(Movie.objects.order_by("external_id").values_list("title", "rate"))
+        self.assertEqual(first, again)
+
+
+class CatalogCacheTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = UserAccount.objects.create_user(
+            email="cache@example.com", name="Cache", password="cachepass"
+        )
+        self.movie = Movie.objects.create(
+            title="Cached",
+            description="Served from memory.",
+            duration=timedelta(hours=2),
+            user=self.user,
+            rate=7.0,
+            price=10.00,
+        )
+
+    def test_repeat_reads_hit_cache_and_honour_etag(self):
+        first = self.client.get("/api/movies/")
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        etag = first["ETag"]
+
+        with self.assertNumQueries(0):
+            again = self.client.get("/api/movies/")
+        self.assertEqual(again.data, first.data)
+
+        not_modified = self.client.get("/api/movies/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(not_modified["ETag"], etag)
+
+    def test_catalog_writes_invalidate_cache(self):
+        etag = self.client.get(f"/api/movies/{self.movie.id}/")["ETag"]
+        self.movie.title = "Recut"
+        self.movie.save()
+
+        response = self.client.get(
+            f"/api/movies/{self.movie.id}/", HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["title"], "Recut")
+
+        self.client.get("/api/movies/")
+        Genre.objects.create(name="Drama")
+        # Count, page of movies and their genres: a miss, not a stale hit.
+        with self.assertNumQueries(3):
+            self.client.get("/api/movies/")
+
+    def test_catalog_version_is_shared_between_workers(self):
+        self.assertIsInstance(get_catalog_cache(), SharedCatalogCache)
+        self.client.get("/api/movies/")
+        # Another worker's cache object, over the same cache alias.
+        SharedCatalogCache(alias="default").bump_version()
+        with self.assertNumQueries(3):
+            self.client.get("/api/movies/")
+
+    def test_local_cache_is_size_bounded(self):
+        cache = LocalCatalogCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+
 class ShowtimeViewSetTest(TestCase):
 
     def setUp(self):
@@ -232,7 +611,28 @@ class ShowtimeViewSetTest(TestCase):
     def test_admin_can_list_showtimes(self):
         response = self.client.get("/api/showtimes/")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertNotIn("description", response.data["results"][0]["movie"])
+
+    def test_showtimes_list_filters_by_date_and_paginates(self):
+        for days in (1, 1, 2):
+            Showtime.objects.create(
+                movie=self.movie,
+                auditorium=self.auditorium,
+                start_time=self.start_time + timedelta(days=days),
+            )
+        tomorrow = (self.start_time + timedelta(days=1)).date().isoformat()
+
+        # Authentication, count and page.
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                "/api/showtimes/",
+                {"date": tomorrow, "page_size": 1, "fields": "id,start_time"},
+            )
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(set(response.data["results"][0]), {"id", "start_time"})
+        self.assertIsNotNone(response.data["next"])
 
     def test_admin_can_create_showtime(self):
         new_start_time = timezone.make_aware(
@@ -273,3 +673,46 @@ class ShowtimeViewSetTest(TestCase):
     def test_admin_can_delete_showtime(self):
         response = self.client.delete(f"/api/showtimes/{self.showtime.id}/")
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+    def test_creating_showtime_materializes_seats_from_layout(self):
+        hall = Auditorium.objects.create(
+            name="Layout Hall",
+            total_seats=0,
+            total_shows=4,
+            seat_layout=[
+                {"row": "A", "seats": 4, "category": "recliner"},
+                {"row": "B", "seats": 6},
+            ],
+        )
+        self.assertEqual(hall.total_seats, 10)
+
+        data = {
+            "movie": self.movie.id,
+            "auditorium": hall.id,
+            "start_time": (self.start_time + timedelta(days=1)).isoformat(),
+            "status": "scheduled",
+        }
+        response = self.client.post("/api/showtimes/", data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        showtime = Showtime.objects.get(auditorium=hall)
+        seats = Seat.objects.filter(showtime=showtime)
+        self.assertEqual(seats.count(), 10)
+        self.assertEqual(seats.filter(category="recliner").count(), 4)
+        self.assertTrue(seats.filter(seat_number="B6").exists())
+        self.assertIsNotNone(showtime.seat_map)
+
+        # Its seating is now fixed; other fields can still change.
+        hall.seat_layout = [{"row": "A", "seats": 10}]
+        with self.assertRaises(ValidationError):
+            hall.save()
+        hall.refresh_from_db()
+        hall.name = "Renamed Hall"
+        hall.save()
+
+    def test_malformed_layout_is_a_validation_error(self):
+        for layout in ([{"row": "A"}], [{"seats": 3}], "A1-A10"):
+            hall = Auditorium(name="Bad", total_seats=0, total_shows=1)
+            hall.seat_layout = layout
+            with self.assertRaises(ValidationError):
+                hall.save()
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from reservations.views import MovieViewSet
@@ -7,6 +8,16 @@ app_name = "movies"
 router = DefaultRouter()
 router.register(r'movies', MovieViewSet)
 
-urlpatterns = [
+urlpatterns = []
+if settings.ASYNC_READ_VIEWS:
+    # GET runs on the event loop; other methods still reach MovieViewSet.
+    from reservations.async_views import AsyncMovieDetail, AsyncMovieList
+
+    urlpatterns += [
+        path("movies/", AsyncMovieList.as_view(), name="movie-list"),
+        path("movies/<int:pk>/", AsyncMovieDetail.as_view(), name="movie-detail"),
+    ]
+
+urlpatterns += [
     path('', include(router.urls)),
 ]
@@ -1,6 +1,13 @@
 from django.contrib import admin
-from reservations.models import Showtime,Auditorium
+from reservations.models import Showtime,Auditorium,Review
 
 # Register your models here.
 admin.site.register(Showtime),
 admin.site.register(Auditorium)
+
+
+@admin.register(Review)
+class ReviewAdmin(admin.ModelAdmin):
+    list_display = ("movie", "user", "rating", "reviewed_at")
+    list_select_related = ("movie", "user")
+    raw_id_fields = ("movie", "user")
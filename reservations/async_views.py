@@ -0,0 +1,118 @@
+"""
+Async read views for the ASGI deployment (see config.async_api). Each one
+takes over GET for the URL of the sync view named in ``sync_view``.
+"""
+
+from asgiref.sync import sync_to_async
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+
+from config.async_api import AsyncReadView, JSONResponse, apaginate
+from movies.cache import acached_catalog_response
+from movies.models import Movie
+from reservations.models import Seat, Showtime
+from reservations.serializers import AvailabilityQuerySerializer
+from reservations.views import (
+    AVAILABILITY_FIELDS,
+    MovieViewSet,
+    ShowtimeAvailability,
+    ShowtimeViewSet,
+    availability_lookups,
+    seat_availability,
+)
+
+
+def viewset_for(viewset_class, action, request, **kwargs):
+    """
+    A ViewSet instance set up as the router would for ``action``, to reuse
+    its ``get_queryset`` and ``get_serializer``.
+    """
+    return viewset_class(
+        action=action, request=request, format_kwarg=None, args=(), kwargs=kwargs
+    )
+
+
+async def list_response(view):
+    pagination, objects = await apaginate(
+        view.get_queryset(), view.request, view.pagination_class
+    )
+    serializer = view.get_serializer(objects, many=True)
+    return JSONResponse(pagination.get_paginated_response(serializer.data).data)
+
+
+class AsyncMovieList(AsyncReadView):
+    sync_view = staticmethod(MovieViewSet.as_view({"get": "list", "post": "create"}))
+
+    async def get(self, request):
+        view = viewset_for(MovieViewSet, "list", request)
+        return await acached_catalog_response(request, lambda: list_response(view))
+
+
+class AsyncMovieDetail(AsyncReadView):
+    sync_view = staticmethod(
+        MovieViewSet.as_view(
+            {
+                "get": "retrieve",
+                "put": "update",
+                "patch": "partial_update",
+                "delete": "destroy",
+            }
+        )
+    )
+
+    async def get(self, request, pk):
+        view = viewset_for(MovieViewSet, "retrieve", request, pk=pk)
+
+        async def build():
+            try:
+                movie = await view.get_queryset().aget(pk=pk)
+            except Movie.DoesNotExist:
+                raise NotFound(
+                    f"No {Movie._meta.object_name} matches the given query."
+                )
+            return JSONResponse(view.get_serializer(movie).data)
+
+        return await acached_catalog_response(request, build)
+
+
+class AsyncShowtimeList(AsyncReadView):
+    sync_view = staticmethod(
+        ShowtimeViewSet.as_view({"get": "list", "post": "create"})
+    )
+
+    async def get(self, request):
+        return await list_response(viewset_for(ShowtimeViewSet, "list", request))
+
+
+class AsyncShowtimeAvailability(AsyncReadView):
+    sync_view = staticmethod(ShowtimeAvailability.as_view())
+    # Customers pick seats from this; read it from the primary like the
+    # sync view does.
+    use_replica = False
+
+    async def get(self, request):
+        query = AvailabilityQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return JSONResponse(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        show_lookup, seat_lookup = availability_lookups(query.validated_data)
+
+        seats = [
+            seat
+            async for seat in Seat.objects.filter(**seat_lookup)
+            .order_by("id")
+            .values(*AVAILABILITY_FIELDS)
+        ]
+        if not seats:
+            showtime_id = (
+                await Showtime.objects.filter(**show_lookup)
+                .values_list("id", flat=True)
+                .afirst()
+            )
+            if showtime_id is None:
+                return JSONResponse(
+                    {"error": "Show not found."}, status=status.HTTP_404_NOT_FOUND
+                )
+            return JSONResponse({"showtime": showtime_id, "seats": []})
+
+        # The hold store may live in a network cache.
+        return JSONResponse(await sync_to_async(seat_availability)(seats))
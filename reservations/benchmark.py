@@ -0,0 +1,439 @@
+"""
+Replay a weighted mix of browsing and booking requests and summarize
+latency, throughput and queries per request for each endpoint: in-process
+through the Django test client (benchmark_endpoints), or over HTTP against
+a running server with many concurrent connections (benchmark_servers).
+"""
+
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import re
+import statistics
+import time
+from contextlib import contextmanager
+from urllib.parse import urlencode, urlsplit
+
+import django
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from movies.cache import bump_catalog_version
+from movies.models import Movie
+from movies.synthetic import Generator, parse_count
+from reservations.models import Seat, Showtime
+from reservations.pagination import StandardPagination
+from user.models import UserAccount
+from user.tokens import ClaimsRefreshToken
+
+# name: relative share of the traffic
+DEFAULT_MIX = {
+    "movies": 40,
+    "showtimes": 25,
+    "available_seats": 25,
+    "book": 10,
+}
+# What one page of the front end asks for: the catalog, the day's shows and
+# seat status, with some bookings in between.
+SERVER_MIX = {
+    "movies": 30,
+    "showtimes": 20,
+    "availability": 20,
+    "shows_by_date": 20,
+    "book": 10,
+}
+ENDPOINTS = (
+    "movies",
+    "showtimes",
+    "shows_by_date",
+    "available_seats",
+    "availability",
+    "book",
+)
+DATASET = ("users", "movies", "auditoriums", "days", "reviews")
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples):
+    """
+    ``samples`` is a list of ``(milliseconds, queries, status_code)``.
+    """
+    timings = sorted(ms for ms, _, _ in samples)
+    queries = [count for _, count, _ in samples]
+    statuses = {}
+    for _, _, code in samples:
+        statuses[str(code)] = statuses.get(str(code), 0) + 1
+    busy = sum(timings) / 1000
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, _, code in samples if code >= 500),
+        "status_codes": statuses,
+        "p50_ms": round(percentile(timings, 0.50), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "p99_ms": round(percentile(timings, 0.99), 3),
+        "mean_ms": round(statistics.fmean(timings), 3) if timings else 0.0,
+        "max_ms": round(timings[-1], 3) if timings else 0.0,
+        "throughput_rps": round(len(samples) / busy, 1) if busy else 0.0,
+        "queries_per_request": round(statistics.fmean(queries), 2) if queries else 0.0,
+        "max_queries": max(queries, default=0),
+    }
+
+
+class Workload:
+    """
+    Builds requests for each endpoint of the mix from the seeded data, using
+    its own RNG so the same seed replays the same sequence.
+    """
+
+    def __init__(self, seed, probe_showtimes=200, users=100):
+        self.rng = random.Random(seed)
+        now = timezone.now()
+        showtimes = list(
+            Showtime.objects.filter(status="scheduled", start_time__gt=now)
+            .select_related("movie", "auditorium")
+            .order_by("id")[:probe_showtimes]
+        )
+        if not showtimes:
+            raise ValueError("No upcoming showtimes to benchmark against.")
+        self.probes = showtimes
+        self.free_seats = {showtime.id: [] for showtime in showtimes}
+        self.taken_seats = {showtime.id: [] for showtime in showtimes}
+        for seat_id, showtime_id in Seat.objects.filter(
+            showtime__in=showtimes, is_booked=False
+        ).values_list("id", "showtime_id"):
+            self.free_seats[showtime_id].append(seat_id)
+        for seats in self.free_seats.values():
+            self.rng.shuffle(seats)
+        # Most browsing stays within the first few pages.
+        pages = math.ceil(Movie.objects.count() / StandardPagination.page_size)
+        self.movie_pages = max(1, min(5, pages))
+        # Claims tokens, as login issues, so requests take the
+        # ClaimsJWTAuthentication path rather than the user lookup.
+        self.tokens = [
+            f"Bearer {ClaimsRefreshToken.for_user(user).access_token}"
+            for user in UserAccount.objects.filter(role="user").order_by("id")[:users]
+        ]
+        if not self.tokens:
+            raise ValueError("No customer accounts to book with.")
+
+    def movies(self):
+        params = {"page": self.rng.randint(1, self.movie_pages)}
+        if self.rng.random() < 0.3:
+            params["sort"] = "rating"
+        return "get", "/api/movies/", params, {}
+
+    def showtimes(self):
+        showtime = self.rng.choice(self.probes)
+        params = {"date": timezone.localdate(showtime.start_time).isoformat()}
+        return "get", "/api/showtimes/", params, {}
+
+    def shows_by_date(self):
+        showtime = self.rng.choice(self.probes)
+        params = {"date": timezone.localdate(showtime.start_time).isoformat()}
+        return "get", "/api/user/showsbydate/", params, {}
+
+    def availability(self):
+        showtime = self.rng.choice(self.probes)
+        return "get", "/api/seats/availability/", {"showtime_id": showtime.id}, {}
+
+    def available_seats(self):
+        showtime = self.rng.choice(self.probes)
+        params = {
+            "movie_name": showtime.movie.title,
+            "auditorium_name": showtime.auditorium.name,
+            "show_time": timezone.localtime(showtime.start_time).strftime("%H:%M:%S"),
+        }
+        headers = {"HTTP_AUTHORIZATION": self.token()}
+        return "get", "/api/getavailableseat/", params, headers
+
+    def book(self):
+        showtime = self.rng.choice(self.probes)
+        free = self.free_seats[showtime.id]
+        taken = self.taken_seats[showtime.id]
+        if free:
+            seat_id = free.pop()
+            taken.append(seat_id)
+        else:
+            # Sold out: keep asking for a taken seat, the 409 path is part
+            # of real traffic too.
+            seat_id = self.rng.choice(taken) if taken else 0
+        payload = {"seat_id": seat_id, "showtime_id": showtime.id}
+        headers = {"HTTP_AUTHORIZATION": self.token()}
+        return "post", "/api/reservations/book/", payload, headers
+
+    def token(self):
+        return self.rng.choice(self.tokens)
+
+
+def run_mix(workload, mix, requests, warmup=0, seed=0, client=None):
+    """
+    Issue ``warmup`` unrecorded requests, then ``requests`` recorded ones,
+    choosing endpoints by ``mix`` weights. Returns ``{endpoint: samples}``.
+    """
+    client = client or Client(SERVER_NAME="localhost")
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = {name: [] for name in names}
+
+    for number in range(warmup + requests):
+        name = rng.choices(names, weights=weights)[0]
+        method, path, data, headers = getattr(workload, name)()
+        send = getattr(client, method)
+        if method == "post":
+            kwargs = {"content_type": "application/json", **headers}
+        else:
+            kwargs = headers
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = send(path, data, **kwargs)
+            elapsed = (time.perf_counter() - started) * 1000
+        if number >= warmup:
+            samples[name].append((elapsed, len(queries), response.status_code))
+    return samples
+
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries')
+
+
+def header_name(meta_key):
+    """``HTTP_AUTHORIZATION`` -> ``Authorization``"""
+    return meta_key.removeprefix("HTTP_").replace("_", "-").title()
+
+
+def encode_request(host, method, path, data, headers):
+    """One of ``Workload``'s requests as HTTP/1.1 bytes."""
+    body = b""
+    if method == "get":
+        target = f"{path}?{urlencode(data)}" if data else path
+    else:
+        target, body = path, json.dumps(data).encode()
+    lines = [f"{method.upper()} {target} HTTP/1.1", f"Host: {host}"]
+    lines += [f"{header_name(key)}: {value}" for key, value in headers.items()]
+    if body:
+        lines += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+
+async def read_response(reader):
+    """Read one HTTP/1.1 response; returns ``(status, headers)``."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("Connection closed by the server.")
+    status = int(status_line.split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    return status, headers
+
+
+class KeepAliveConnection:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, payload):
+        for attempt in (1, 2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(
+                    self.host, self.port
+                )
+            try:
+                self.writer.write(payload)
+                await self.writer.drain()
+                status, headers = await read_response(self.reader)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The server dropped the idle connection (a recycled worker,
+                # an expired keep-alive): reconnect and retry once.
+                self.close()
+                if attempt == 2:
+                    raise
+                continue
+            if headers.get("connection") == "close":
+                self.close()
+            return status, headers
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+async def replay(pool, plan, samples=None):
+    """
+    Send ``plan``'s ``(endpoint, payload)`` requests through every
+    connection of ``pool`` at once, each taking the next request as soon as
+    its previous one is answered.
+    """
+    pending = iter(plan)
+
+    async def work(keepalive):
+        for name, payload in pending:
+            started = time.perf_counter()
+            try:
+                status, headers = await keepalive.request(payload)
+            except (OSError, asyncio.IncompleteReadError):
+                # Counted as a server error: the request got no answer.
+                status, headers = 599, {}
+            elapsed = (time.perf_counter() - started) * 1000
+            if samples is not None:
+                timing = headers.get("server-timing", "")
+                queries = SERVER_TIMING_QUERIES.search(timing)
+                samples[name].append(
+                    (elapsed, int(queries[1]) if queries else 0, status)
+                )
+
+    await asyncio.gather(*(work(keepalive) for keepalive in pool))
+
+
+async def run_http_mix(
+    base_url, workload, mix, requests, warmup=0, seed=0, connections=100
+):
+    """
+    ``run_mix`` against a server at ``base_url``, over ``connections``
+    concurrent keep-alive connections. Query counts are read from the
+    ``Server-Timing`` header. Returns ``({endpoint: samples}, wall_seconds)``
+    of the recorded requests.
+    """
+    url = urlsplit(base_url)
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    # Build every request up front so the replay only does I/O.
+    plan = []
+    for _ in range(warmup + requests):
+        name = rng.choices(names, weights=weights)[0]
+        plan.append((name, encode_request(url.netloc, *getattr(workload, name)())))
+
+    port = url.port or 80
+    pool = [KeepAliveConnection(url.hostname, port) for _ in range(connections)]
+    samples = {name: [] for name in names}
+    try:
+        await replay(pool, plan[:warmup])
+        started = time.perf_counter()
+        await replay(pool, plan[warmup:], samples)
+        wall_seconds = time.perf_counter() - started
+    finally:
+        for keepalive in pool:
+            keepalive.close()
+    return samples, wall_seconds
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--users", type=parse_count, default=2000)
+    parser.add_argument("--movies", type=parse_count, default=500)
+    parser.add_argument("--auditoriums", type=parse_count, default=20)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--reviews", type=parse_count, default=5000)
+    parser.add_argument(
+        "--keepdb",
+        action="store_true",
+        help="Keep the seeded database and reuse it on the next run.",
+    )
+
+
+@contextmanager
+def benchmark_database(options, log):
+    """
+    Create the test database, seed it with the synthetic data generator
+    (unless ``keepdb`` finds it seeded already) and drop it afterwards.
+    Yields the dataset sizes.
+    """
+    dataset = {key: options[key] for key in DATASET}
+    creation = connection.creation
+    old_name = connection.settings_dict["NAME"]
+    creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False, keepdb=options["keepdb"]
+    )
+    try:
+        if not (options["keepdb"] and Showtime.objects.exists()):
+            Generator(seed=options["seed"], log=log, **dataset).run()
+        # Drop catalog entries cached from the regular database.
+        bump_catalog_version()
+        yield dataset
+    finally:
+        creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+
+
+def build_report(samples, wall_seconds, meta):
+    every = [sample for endpoint in samples.values() for sample in endpoint]
+    overall = summarize(every)
+    overall["wall_seconds"] = round(wall_seconds, 3)
+    overall["wall_throughput_rps"] = (
+        round(len(every) / wall_seconds, 1) if wall_seconds else 0.0
+    )
+    return {
+        "meta": {
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            **meta,
+        },
+        "overall": overall,
+        "endpoints": {name: summarize(endpoint) for name, endpoint in samples.items()},
+    }
+
+
+def compare_reports(previous, current, metrics=("p50_ms", "p95_ms", "p99_ms")):
+    """
+    Yield ``(endpoint, metric, before, after, change_percent)`` for endpoints
+    present in both reports.
+    """
+    for name, after in current["endpoints"].items():
+        before = previous.get("endpoints", {}).get(name)
+        if before is None:
+            continue
+        for metric in (*metrics, "queries_per_request"):
+            old, new = before.get(metric, 0), after.get(metric, 0)
+            change = (new - old) / old * 100 if old else 0.0
+            yield name, metric, old, new, change
+
+
+def parse_mix(value):
+    """``movies=40,book=10`` -> ``{"movies": 40, "book": 10}``"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in ENDPOINTS:
+            raise ValueError(f"unknown endpoint {name!r}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def write_report(report, output):
+    output = output or os.path.join(
+        "benchmark-results", timezone.now().strftime("%Y%m%dT%H%M%SZ.json")
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as results:
+        json.dump(report, results, indent=2)
+    return output
+
+
+def load_report(path):
+    with open(path) as report:
+        return json.load(report)
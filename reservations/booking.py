@@ -0,0 +1,226 @@
+from django.db import OperationalError, transaction
+from django.utils import timezone
+
+from reservations.holds import held_by_others, hold_seats, release_holds
+from reservations.models import BookingHistory, Seat, Showtime
+from reservations.seatmap import update_seat_map
+
+
+class BookingError(Exception):
+    """
+    Base error for the reservation engine. Views turn it into a response
+    using ``status_code`` and ``message``.
+    """
+
+    status_code = 400
+    message = "Unable to complete the booking."
+
+    def __init__(self, message=None):
+        if message is not None:
+            self.message = message
+        super().__init__(self.message)
+
+
+class SeatNotFound(BookingError):
+    status_code = 404
+    message = "Seat or Showtime not found."
+
+
+class SeatAlreadyBooked(BookingError):
+    status_code = 409
+    message = "Seat is already booked."
+
+
+class SeatHeld(BookingError):
+    status_code = 409
+    message = "Seat is currently held by another customer."
+
+
+class ShowtimeStarted(BookingError):
+    status_code = 400
+    message = "Cannot book a seat for a past or ongoing showtime."
+
+
+class ShowtimeBusy(BookingError):
+    status_code = 409
+    message = "The showtime is busy with other bookings; please try again."
+
+
+def claim_seat(seat_id):
+    """
+    Flip ``Seat.is_booked`` from False to True in a single conditional UPDATE.
+    Returns True only for the caller that actually won the seat.
+    """
+    return Seat.objects.filter(id=seat_id, is_booked=False).update(is_booked=True) == 1
+
+
+def release_seat(seat_id):
+    """
+    Put a seat back on sale.
+    """
+    Seat.objects.filter(id=seat_id, is_booked=True).update(is_booked=False)
+
+
+def mark_seat_map(showtime, seat_numbers, booked):
+    """
+    ``update_seat_map`` for the booking paths: timing out on the showtime
+    lock (or losing a deadlock) becomes a retryable 409 instead of a 500.
+    """
+    try:
+        update_seat_map(showtime, seat_numbers, booked)
+    except OperationalError:
+        raise ShowtimeBusy()
+
+
+def cancel_reservation(reservation):
+    """
+    Delete a booking and put its seat back on sale. ``reservation`` should be
+    fetched with ``select_related("showtime__auditorium", "seat")``.
+    """
+    with transaction.atomic():
+        if reservation.seat_id:
+            release_seat(reservation.seat_id)
+            mark_seat_map(
+                reservation.showtime, [reservation.seat.seat_number], booked=False
+            )
+        reservation.delete()
+
+
+def reserve_seat(user, seat_id, showtime_id, tickets=1):
+    """
+    Atomically book a single seat for ``user``.
+
+    The seat is claimed with a conditional UPDATE on ``is_booked``, so when
+    several requests race for the same seat the database decides the single
+    winner and everyone else gets ``SeatAlreadyBooked`` without another query.
+    """
+    try:
+        seat = Seat.objects.select_related("showtime__auditorium").get(
+            id=seat_id, showtime_id=showtime_id
+        )
+    except Seat.DoesNotExist:
+        raise SeatNotFound()
+
+    if seat.showtime.start_time <= timezone.now():
+        raise ShowtimeStarted()
+
+    if held_by_others(seat.showtime_id, [seat.seat_number], user.id):
+        raise SeatHeld()
+
+    with transaction.atomic():
+        if not claim_seat(seat.id):
+            raise SeatAlreadyBooked()
+
+        seat.is_booked = True
+        booking = BookingHistory.objects.create(
+            user=user,
+            movie_id=seat.showtime.movie_id,
+            seat=seat,
+            showtime=seat.showtime,
+            tickets=tickets,
+        )
+        mark_seat_map(seat.showtime, [seat.seat_number], booked=True)
+        # The user's hold (if any) has been converted into a booking.
+        transaction.on_commit(
+            lambda: release_holds(seat.showtime_id, [seat.seat_number], user.id)
+        )
+    return booking
+
+
+def reserve_seats(user, showtime_id, seat_numbers):
+    """
+    Book a group of seats for one showtime with all-or-nothing semantics.
+
+    The seats are read in one query, claimed with one conditional UPDATE and
+    recorded with one ``bulk_create``, so the cost does not grow with the size
+    of the group. If any seat is missing or taken nothing is booked.
+    """
+    seat_numbers = list(dict.fromkeys(seat_numbers))
+
+    try:
+        showtime = Showtime.objects.select_related("auditorium").get(id=showtime_id)
+    except Showtime.DoesNotExist:
+        raise SeatNotFound("Showtime not found.")
+
+    if showtime.start_time <= timezone.now():
+        raise ShowtimeStarted()
+
+    seats = list(
+        Seat.objects.filter(showtime=showtime, seat_number__in=seat_numbers)
+    )
+    found = {seat.seat_number for seat in seats}
+    missing = [number for number in seat_numbers if number not in found]
+    if missing:
+        raise SeatNotFound(f"Seats not found: {', '.join(missing)}.")
+
+    taken = [seat.seat_number for seat in seats if seat.is_booked]
+    if taken:
+        raise SeatAlreadyBooked(f"Seats already booked: {', '.join(taken)}.")
+
+    held = held_by_others(showtime.id, seat_numbers, user.id)
+    if held:
+        raise SeatHeld(f"Seats held by another customer: {', '.join(sorted(held))}.")
+
+    with transaction.atomic():
+        claimed = Seat.objects.filter(
+            id__in=[seat.id for seat in seats], is_booked=False
+        ).update(is_booked=True)
+        if claimed != len(seats):
+            # Someone else got in between the read and the claim; raising
+            # here rolls back the seats we did manage to flip.
+            raise SeatAlreadyBooked()
+
+        bookings = []
+        for seat in seats:
+            seat.is_booked = True
+            bookings.append(
+                BookingHistory(
+                    user=user,
+                    movie_id=showtime.movie_id,
+                    showtime=showtime,
+                    seat=seat,
+                    tickets=1,
+                )
+            )
+        bookings = BookingHistory.objects.bulk_create(bookings)
+        mark_seat_map(showtime, [seat.seat_number for seat in seats], booked=True)
+        transaction.on_commit(
+            lambda: release_holds(showtime.id, seat_numbers, user.id)
+        )
+    return bookings
+
+
+def place_hold(user, showtime_id, seat_numbers):
+    """
+    Hold a group of free seats for ``user`` for ``SEAT_HOLD_TTL`` seconds.
+
+    Holds live only in the hold store, so placing or expiring one never
+    writes to the ``Seat`` table.
+    """
+    seat_numbers = list(dict.fromkeys(seat_numbers))
+
+    try:
+        showtime = Showtime.objects.get(id=showtime_id)
+    except Showtime.DoesNotExist:
+        raise SeatNotFound("Showtime not found.")
+
+    if showtime.start_time <= timezone.now():
+        raise ShowtimeStarted()
+
+    seats = dict(
+        Seat.objects.filter(
+            showtime=showtime, seat_number__in=seat_numbers
+        ).values_list("seat_number", "is_booked")
+    )
+    missing = [number for number in seat_numbers if number not in seats]
+    if missing:
+        raise SeatNotFound(f"Seats not found: {', '.join(missing)}.")
+
+    taken = [number for number in seat_numbers if seats[number]]
+    if taken:
+        raise SeatAlreadyBooked(f"Seats already booked: {', '.join(taken)}.")
+
+    held = hold_seats(showtime.id, seat_numbers, user.id)
+    if held:
+        raise SeatHeld(f"Seats held by another customer: {', '.join(held)}.")
+    return seat_numbers
@@ -0,0 +1,65 @@
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+
+EXPORT_FIELDS = (
+    ("id", "id"),
+    ("booked_at", "booked_at"),
+    ("user_id", "user_id"),
+    ("user_email", "user__email"),
+    ("movie_id", "movie_id"),
+    ("movie_title", "movie__title"),
+    ("showtime_id", "showtime_id"),
+    ("start_time", "showtime__start_time"),
+    ("seat_number", "seat__seat_number"),
+    ("tickets", "tickets"),
+)
+
+
+class Echo:
+    """File-like object whose write() just hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset):
+    """
+    Yield export rows as lists, streaming from the database in chunks so
+    memory use stays flat however many bookings there are.
+    """
+    lookups = [lookup for _, lookup in EXPORT_FIELDS]
+    for row in queryset.values_list(*lookups).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in row
+        ]
+
+
+def stream_csv(queryset, filename):
+    writer = csv.writer(Echo())
+    header = [name for name, _ in EXPORT_FIELDS]
+
+    def lines():
+        yield writer.writerow(header)
+        for row in export_rows(queryset):
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(lines(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def stream_ndjson(queryset, filename):
+    names = [name for name, _ in EXPORT_FIELDS]
+
+    def lines():
+        for row in export_rows(queryset):
+            yield json.dumps(dict(zip(names, row))) + "\n"
+
+    response = StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+    response["Content-Disposition"] = f'attachment; filename="{filename}.ndjson"'
+    return response
@@ -0,0 +1,64 @@
+import datetime
+
+from django.utils import timezone
+
+from movies.models import MovieGenre
+from reservations.serializers import MovieFilterSerializer, ShowtimeFilterSerializer
+
+
+def day_bounds(date):
+    """
+    Half-open ``[start, end)`` datetimes covering ``date`` in the current
+    time zone. Filtering ``start_time`` on these can use a plain index,
+    unlike ``start_time__date`` which casts every row.
+    """
+    start = timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+    return start, start + datetime.timedelta(days=1)
+
+
+def parse_filters(serializer_class, params):
+    serializer = serializer_class(data=params)
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+def filter_movies(queryset, params):
+    """
+    Narrow a Movie queryset by ``language``, ``genre``, ``min_rate`` and
+    ``max_rate`` query parameters. ``sort=rating`` orders by the review
+    average instead of the default ``-rate``.
+    """
+    filters = parse_filters(MovieFilterSerializer, params)
+    if "language" in filters:
+        queryset = queryset.filter(language_id=filters["language"])
+    if "genre" in filters:
+        queryset = queryset.filter(
+            id__in=MovieGenre.objects.filter(genre_id=filters["genre"]).values(
+                "movie_id"
+            )
+        )
+    if "min_rate" in filters:
+        queryset = queryset.filter(rate__gte=filters["min_rate"])
+    if "max_rate" in filters:
+        queryset = queryset.filter(rate__lte=filters["max_rate"])
+    if filters.get("sort") == "rating":
+        queryset = queryset.order_by("-rating_average", "title")
+    return queryset
+
+
+def filter_showtimes(queryset, params):
+    """
+    Narrow a Showtime queryset by ``movie``, ``auditorium``, ``status`` and
+    ``date`` (YYYY-MM-DD) query parameters.
+    """
+    filters = parse_filters(ShowtimeFilterSerializer, params)
+    if "movie" in filters:
+        queryset = queryset.filter(movie_id=filters["movie"])
+    if "auditorium" in filters:
+        queryset = queryset.filter(auditorium_id=filters["auditorium"])
+    if "status" in filters:
+        queryset = queryset.filter(status=filters["status"])
+    if "date" in filters:
+        start, end = day_bounds(filters["date"])
+        queryset = queryset.filter(start_time__gte=start, start_time__lt=end)
+    return queryset
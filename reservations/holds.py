@@ -0,0 +1,210 @@
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+
+DEFAULT_HOLD_STORE = "reservations.holds.CacheHoldStore"
+DEFAULT_HOLD_TTL = 300
+
+
+def hold_key(showtime_id, seat_number):
+    return f"seathold:{showtime_id}:{seat_number}"
+
+
+class BaseHoldStore:
+    """
+    Keeps short-lived seat holds keyed by ``hold_key``. A hold belongs to one
+    owner (a user id) and disappears on its own once its TTL runs out.
+    """
+
+    def acquire(self, key, owner, ttl):
+        """Take or refresh the hold. Returns False if someone else owns it."""
+        raise NotImplementedError
+
+    def release(self, key, owner):
+        """Drop the hold if ``owner`` still owns it."""
+        raise NotImplementedError
+
+    def owners(self, keys):
+        """Return ``{key: owner}`` for the keys that are currently held."""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class InMemoryHoldStore(BaseHoldStore):
+    """
+    Process-local store, handy for tests and single-process setups. Expired
+    holds are ignored on read and swept out lazily every ``sweep_interval``
+    seconds so the dict does not grow without bound.
+    """
+
+    sweep_interval = 30
+
+    def __init__(self):
+        self._holds = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0
+
+    def _live_owner(self, key, now):
+        entry = self._holds.get(key)
+        if entry is None:
+            return None
+        owner, expires_at = entry
+        if expires_at <= now:
+            del self._holds[key]
+            return None
+        return owner
+
+    def _maybe_sweep(self, now):
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.sweep_interval
+        self.purge_expired(now)
+
+    def purge_expired(self, now=None):
+        now = time.monotonic() if now is None else now
+        expired = [key for key, (_, exp) in self._holds.items() if exp <= now]
+        for key in expired:
+            del self._holds[key]
+        return len(expired)
+
+    def acquire(self, key, owner, ttl):
+        with self._lock:
+            now = time.monotonic()
+            self._maybe_sweep(now)
+            current = self._live_owner(key, now)
+            if current is not None and current != owner:
+                return False
+            self._holds[key] = (owner, now + ttl)
+            return True
+
+    def release(self, key, owner):
+        with self._lock:
+            if self._live_owner(key, time.monotonic()) == owner:
+                del self._holds[key]
+
+    def owners(self, keys):
+        with self._lock:
+            now = time.monotonic()
+            result = {}
+            for key in keys:
+                owner = self._live_owner(key, now)
+                if owner is not None:
+                    result[key] = owner
+            return result
+
+    def clear(self):
+        with self._lock:
+            self._holds.clear()
+
+
+class CacheHoldStore(BaseHoldStore):
+    """
+    Store backed by a Django cache alias (``SEAT_HOLD_CACHE``). Pointing the
+    alias at Redis or Memcached shares holds between workers; expiry is left
+    to the cache's own TTL handling, so no sweeper is needed.
+
+    Holds are written under the cache version stored at ``GENERATION_KEY``;
+    ``clear`` moves to a new generation instead of clearing the whole alias,
+    which other features share.
+    """
+
+    GENERATION_KEY = "seathold:generation"
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or getattr(settings, "SEAT_HOLD_CACHE", "default")]
+
+    def _generation(self):
+        generation = self.cache.get(self.GENERATION_KEY)
+        if generation is None:
+            self.cache.add(self.GENERATION_KEY, 1, None)
+            generation = self.cache.get(self.GENERATION_KEY, 1)
+        return generation
+
+    def acquire(self, key, owner, ttl):
+        version = self._generation()
+        for _ in range(2):
+            # ``add`` only writes when the key is absent, which is atomic on
+            # the shared backends and decides races between workers.
+            if self.cache.add(key, owner, ttl, version=version):
+                return True
+            current = self.cache.get(key, version=version)
+            if current == owner:
+                self.cache.touch(key, ttl, version=version)
+                return True
+            if current is not None:
+                return False
+            # The other hold expired between ``add`` and ``get``; try again.
+        return False
+
+    def release(self, key, owner):
+        version = self._generation()
+        if self.cache.get(key, version=version) == owner:
+            self.cache.delete(key, version=version)
+
+    def owners(self, keys):
+        return self.cache.get_many(list(keys), version=self._generation())
+
+    def clear(self):
+        try:
+            self.cache.incr(self.GENERATION_KEY)
+        except ValueError:
+            self.cache.add(self.GENERATION_KEY, 2, None)
+
+
+@lru_cache(maxsize=None)
+def _load_store(path):
+    return import_string(path)()
+
+
+def get_hold_store():
+    return _load_store(getattr(settings, "SEAT_HOLD_STORE", DEFAULT_HOLD_STORE))
+
+
+def get_hold_ttl():
+    return getattr(settings, "SEAT_HOLD_TTL", DEFAULT_HOLD_TTL)
+
+
+def hold_seats(showtime_id, seat_numbers, owner):
+    """
+    Hold every seat for ``owner`` or none of them. Returns the seat numbers
+    that could not be held (empty on success).
+    """
+    store = get_hold_store()
+    ttl = get_hold_ttl()
+    acquired = []
+    for number in seat_numbers:
+        key = hold_key(showtime_id, number)
+        if not store.acquire(key, owner, ttl):
+            for taken in acquired:
+                store.release(taken, owner)
+            # ``number`` failed even if its holder has let go since.
+            failed = held_by_others(showtime_id, seat_numbers, owner) | {number}
+            return sorted(failed)
+        acquired.append(key)
+    return []
+
+
+def release_holds(showtime_id, seat_numbers, owner):
+    store = get_hold_store()
+    for number in seat_numbers:
+        store.release(hold_key(showtime_id, number), owner)
+
+
+def held_by_others(showtime_id, seat_numbers, owner=None):
+    """
+    Return the subset of ``seat_numbers`` held by anyone other than ``owner``
+    with a single store lookup.
+    """
+    keys = {hold_key(showtime_id, number): number for number in seat_numbers}
+    return {
+        keys[key]
+        for key, holder in get_hold_store().owners(keys).items()
+        if holder != owner
+    }
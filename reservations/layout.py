@@ -0,0 +1,66 @@
+from string import ascii_uppercase
+
+from django.core.exceptions import ValidationError
+
+SEATS_PER_ROW = 10
+
+SEAT_CATEGORIES = [
+    ("standard", "Standard"),
+    ("premium", "Premium"),
+    ("recliner", "Recliner"),
+]
+
+
+def row_label(row):
+    """0 -> A, 25 -> Z, 26 -> AA, ..."""
+    label = ""
+    row += 1
+    while row:
+        row, rem = divmod(row - 1, 26)
+        label = ascii_uppercase[rem] + label
+    return label
+
+
+def default_layout(total_seats):
+    """
+    Layout used for auditoriums without an explicit one: ``SEATS_PER_ROW``
+    standard seats to a row, the last row holding whatever is left.
+    """
+    rows = []
+    for row, start in enumerate(range(0, total_seats, SEATS_PER_ROW)):
+        rows.append(
+            {
+                "row": row_label(row),
+                "seats": min(SEATS_PER_ROW, total_seats - start),
+                "category": "standard",
+            }
+        )
+    return rows
+
+
+def seat_plan(layout):
+    """
+    Expand a layout into ``(seat_number, category)`` pairs, front row first.
+    """
+    return [
+        (f"{row['row']}{number}", row.get("category", "standard"))
+        for row in layout
+        for number in range(1, row["seats"] + 1)
+    ]
+
+
+def validate_layout(layout):
+    if not isinstance(layout, list):
+        raise ValidationError("Seat layout must be a list of rows.")
+    categories = {key for key, _ in SEAT_CATEGORIES}
+    seen = set()
+    for row in layout:
+        if not isinstance(row, dict) or not row.get("row"):
+            raise ValidationError("Each row needs a 'row' label.")
+        if row["row"] in seen:
+            raise ValidationError(f"Row {row['row']} appears more than once.")
+        seen.add(row["row"])
+        if not isinstance(row.get("seats"), int) or row["seats"] < 1:
+            raise ValidationError(f"Row {row['row']} needs a positive seat count.")
+        if row.get("category", "standard") not in categories:
+            raise ValidationError(f"Row {row['row']} has an unknown category.")
@@ -0,0 +1,127 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.utils import timezone
+
+from movies.models import Movie
+from reservations.models import Auditorium, Seat, Showtime
+from reservations.seatmap import materialize_seats
+from user.models import UserAccount
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure seats/availability/ latency as the Showtime table grows. "
+        "Runs inside a transaction that is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10_000, 100_000],
+            help="Showtime table sizes to measure at, e.g. 10000 1000000 10000000.",
+        )
+        parser.add_argument("--lookups", type=int, default=200)
+        parser.add_argument("--probes", type=int, default=50)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.client = Client(SERVER_NAME="localhost")
+        with transaction.atomic():
+            self.setup(options["probes"])
+            for size in sorted(options["sizes"]):
+                self.grow(size, options["batch_size"])
+                self.measure(size, options["lookups"])
+            transaction.set_rollback(True)
+
+    def setup(self, probes):
+        user = UserAccount.objects.create_user(
+            email="availability-bench@example.com", name="Bench", password=None
+        )
+        self.movies = Movie.objects.bulk_create(
+            Movie(
+                title=f"Bench movie {i}",
+                description="",
+                duration=timedelta(minutes=120),
+                user=user,
+                rate=0,
+                price=0,
+            )
+            for i in range(100)
+        )
+        self.auditoriums = Auditorium.objects.bulk_create(
+            Auditorium(
+                name=f"Bench hall {i}", total_seats=200, total_shows=8, place="Bench"
+            )
+            for i in range(50)
+        )
+        self.start = timezone.now().replace(minute=0, second=0, microsecond=0)
+        self.slot = 0
+        self.count = 0
+        # A fixed set of probe shows with real seats; the rest of the table
+        # is filler that the index has to skip over.
+        self.probes = self.create_showtimes(probes)
+        for showtime in self.probes:
+            materialize_seats(showtime)
+
+    def create_showtimes(self, count):
+        showtimes = []
+        for _ in range(count):
+            auditorium = self.auditoriums[self.slot % len(self.auditoriums)]
+            start_time = self.start + timedelta(
+                hours=3 * (self.slot // len(self.auditoriums))
+            )
+            showtimes.append(
+                Showtime(
+                    movie=self.rng.choice(self.movies),
+                    auditorium=auditorium,
+                    start_time=start_time,
+                )
+            )
+            self.slot += 1
+        self.count += count
+        return Showtime.objects.bulk_create(showtimes)
+
+    def grow(self, size, batch_size):
+        while self.count < size:
+            self.create_showtimes(min(batch_size, size - self.count))
+
+    def measure(self, size, lookups):
+        self.stdout.write(f"showtimes={size} seats={Seat.objects.count()}")
+        self.report(
+            "by id",
+            lookups,
+            lambda showtime: {"showtime_id": showtime.pk},
+        )
+        self.report(
+            "by movie+auditorium+start",
+            lookups,
+            lambda showtime: {
+                "movie_id": showtime.movie_id,
+                "auditorium_id": showtime.auditorium_id,
+                "start_time": showtime.start_time.isoformat(),
+            },
+        )
+
+    def report(self, label, lookups, params):
+        timings = []
+        for _ in range(lookups):
+            showtime = self.rng.choice(self.probes)
+            started = time.perf_counter()
+            response = self.client.get("/api/seats/availability/", params(showtime))
+            timings.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200, response.content
+        timings.sort()
+        self.stdout.write(
+            f"  {label:<26} p50 {statistics.median(timings):7.2f} ms  "
+            f"p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms"
+        )
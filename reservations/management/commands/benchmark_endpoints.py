@@ -0,0 +1,97 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from movies.synthetic import parse_count
+from reservations.benchmark import (
+    DEFAULT_MIX,
+    Workload,
+    add_dataset_arguments,
+    benchmark_database,
+    build_report,
+    compare_reports,
+    load_report,
+    parse_mix,
+    run_mix,
+    write_report,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with the synthetic data generator, "
+        "replay a browse/book request mix in-process and write p50/p95/p99 "
+        "latency, throughput and queries per request as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=parse_count, default=2000)
+        parser.add_argument("--warmup", type=int, default=100)
+        parser.add_argument(
+            "--mix",
+            type=parse_mix,
+            default=DEFAULT_MIX,
+            help="Endpoint weights, e.g. movies=40,showtimes=25,"
+            "available_seats=25,book=10",
+        )
+        add_dataset_arguments(parser)
+        parser.add_argument(
+            "--output",
+            help="Where to write the JSON results "
+            "(default: benchmark-results/<timestamp>.json).",
+        )
+        parser.add_argument(
+            "--compare", help="A previous results file to diff this run against."
+        )
+
+    def handle(self, *args, **options):
+        previous = load_report(options["compare"]) if options["compare"] else None
+        with benchmark_database(options, self.stdout.write) as dataset:
+            report = self.benchmark(options, dataset)
+        output = write_report(report, options["output"])
+
+        self.print_report(report)
+        if previous is not None:
+            self.print_comparison(previous, report)
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def benchmark(self, options, dataset):
+        try:
+            workload = Workload(options["seed"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        started = time.perf_counter()
+        samples = run_mix(
+            workload,
+            options["mix"],
+            options["requests"],
+            warmup=options["warmup"],
+            seed=options["seed"],
+        )
+        meta = {
+            "seed": options["seed"],
+            "dataset": dataset,
+            "mix": options["mix"],
+            "warmup": options["warmup"],
+        }
+        return build_report(samples, time.perf_counter() - started, meta)
+
+    def print_report(self, report):
+        self.stdout.write(
+            f"{'endpoint':<16}{'reqs':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'req/s':>9}{'queries':>9}"
+        )
+        rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+        for name, stats in rows:
+            self.stdout.write(
+                f"{name:<16}{stats['requests']:>7}{stats['p50_ms']:>9.2f}"
+                f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+                f"{stats['throughput_rps']:>9.1f}{stats['queries_per_request']:>9.2f}"
+            )
+
+    def print_comparison(self, previous, report):
+        self.stdout.write("Compared with the previous run:")
+        for name, metric, old, new, change in compare_reports(previous, report):
+            self.stdout.write(
+                f"  {name:<16}{metric:<20}{old:>9.2f} -> {new:>9.2f} ({change:+.1f}%)"
+            )
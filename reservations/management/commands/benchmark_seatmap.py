@@ -0,0 +1,119 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from movies.models import Movie
+from reservations.booking import claim_seat
+from reservations.models import Auditorium, Seat, Showtime
+from reservations.seatmap import SeatMap, load_seat_map, update_seat_map
+from user.models import UserAccount
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare row-per-seat and bitmap seat maps for availability reads and "
+        "bookings. Runs inside a transaction that is rolled back at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seats", type=int, default=300)
+        parser.add_argument("--shows", type=int, default=40)
+        parser.add_argument(
+            "--book-every",
+            type=int,
+            default=3,
+            help="Book every Nth seat of each show during the booking round.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            showtimes = self.setup(options["seats"], options["shows"])
+            self.run(showtimes, options["seats"], options["book_every"])
+            transaction.set_rollback(True)
+
+    def setup(self, total_seats, shows):
+        user = UserAccount.objects.create_user(
+            email="seatmap-bench@example.com", name="Bench", password=None
+        )
+        movie = Movie.objects.create(
+            title="Seat map benchmark",
+            description="",
+            duration=timedelta(minutes=120),
+            user=user,
+            rate=0,
+            price=0,
+        )
+        auditorium = Auditorium.objects.create(
+            name="Bench", total_seats=total_seats, total_shows=shows, place="Bench"
+        )
+        start = timezone.now() + timedelta(days=1)
+        showtimes = Showtime.objects.bulk_create(
+            Showtime(
+                movie=movie,
+                auditorium=auditorium,
+                start_time=start + timedelta(hours=i),
+                seat_map=SeatMap.for_seats(total_seats).to_bytes(),
+            )
+            for i in range(shows)
+        )
+        layout = SeatMap.for_seats(total_seats)
+        Seat.objects.bulk_create(
+            Seat(showtime=showtime, seat_number=layout.label_of(index))
+            for showtime in showtimes
+            for index in range(total_seats)
+        )
+        return [showtime.pk for showtime in showtimes]
+
+    def run(self, showtime_ids, total_seats, book_every):
+        layout = SeatMap.for_seats(total_seats)
+        labels = [layout.label_of(i) for i in range(0, total_seats, book_every)]
+
+        def rows_read():
+            for pk in showtime_ids:
+                [
+                    number
+                    for number, booked in Seat.objects.filter(
+                        showtime_id=pk
+                    ).values_list("seat_number", "is_booked")
+                    if not booked
+                ]
+
+        def bitmap_read():
+            for pk in showtime_ids:
+                showtime = Showtime.objects.select_related("auditorium").get(pk=pk)
+                load_seat_map(showtime).available_labels()
+
+        seat_ids = list(
+            Seat.objects.filter(
+                showtime_id__in=showtime_ids, seat_number__in=labels
+            ).values_list("id", flat=True)
+        )
+
+        def rows_book():
+            for seat_id in seat_ids:
+                claim_seat(seat_id)
+
+        def bitmap_book():
+            for pk in showtime_ids:
+                showtime = Showtime.objects.select_related("auditorium").get(pk=pk)
+                for label in labels:
+                    update_seat_map(showtime, [label], booked=True)
+
+        reads = len(showtime_ids)
+        books = len(seat_ids)
+        self.report("read", "rows", reads, rows_read)
+        self.report("read", "bitmap", reads, bitmap_read)
+        self.report("book", "rows", books, rows_book)
+        self.report("book", "bitmap", books, bitmap_book)
+
+    def report(self, operation, variant, count, fn):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{operation:<5} {variant:<7} {count:>7} ops "
+            f"{elapsed * 1000:>9.1f} ms {count / elapsed:>10.0f} ops/s"
+        )
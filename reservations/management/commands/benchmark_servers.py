@@ -0,0 +1,201 @@
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from config.database import database_url
+from movies.synthetic import parse_count
+from reservations.benchmark import (
+    SERVER_MIX,
+    Workload,
+    add_dataset_arguments,
+    benchmark_database,
+    build_report,
+    compare_reports,
+    parse_mix,
+    run_http_mix,
+    write_report,
+)
+
+GUNICORN_CONFIG = os.path.join(settings.BASE_DIR, "config", "gunicorn.conf.py")
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database, serve it with gunicorn as sync WSGI "
+        "and as async ASGI in turn, load each over many concurrent keep-alive "
+        "connections and compare latency and throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--servers",
+            default="wsgi,asgi",
+            help="Which of wsgi and asgi to run, in order.",
+        )
+        parser.add_argument("--connections", type=int, default=1000)
+        parser.add_argument("--requests", type=parse_count, default=20000)
+        parser.add_argument("--warmup", type=int, default=2000)
+        parser.add_argument(
+            "--mix",
+            type=parse_mix,
+            default=SERVER_MIX,
+            help="Endpoint weights, e.g. movies=30,showtimes=20,"
+            "availability=20,shows_by_date=20,book=10",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Worker processes per server (default: the gunicorn config's).",
+        )
+        add_dataset_arguments(parser)
+        parser.add_argument(
+            "--output",
+            help="Where to write the JSON results "
+            "(default: benchmark-results/<timestamp>.json).",
+        )
+
+    def handle(self, *args, **options):
+        servers = [name.strip() for name in options["servers"].split(",")]
+        if not set(servers) <= {"wsgi", "asgi"}:
+            raise CommandError("--servers takes wsgi and/or asgi.")
+
+        reports = {}
+        with benchmark_database(options, self.stdout.write) as dataset:
+            for name in servers:
+                self.stdout.write(
+                    f"Loading {name} with {options['connections']} connections..."
+                )
+                # Built per server so each one books seats still free.
+                try:
+                    workload = Workload(options["seed"])
+                except ValueError as exc:
+                    raise CommandError(str(exc))
+                reports[name] = self.benchmark(name, workload, options, dataset)
+
+        output = write_report({"servers": reports}, options["output"])
+        for name, report in reports.items():
+            self.print_report(name, report)
+        if len(reports) == 2:
+            self.print_comparison(*reports.values())
+        self.stdout.write(self.style.SUCCESS(f"Results written to {output}"))
+
+    def benchmark(self, name, workload, options, dataset):
+        port = free_port()
+        env = {
+            **os.environ,
+            "APP_SERVER": name,
+            "BIND": f"127.0.0.1:{port}",
+            "DATABASE_URL": database_url(connection.settings_dict),
+            "ASYNC_READ_VIEWS": "true" if name == "asgi" else "false",
+            # Queries per request come from the Server-Timing header, which
+            # the server only sends with metrics on and to internal clients.
+            "REQUEST_METRICS_ENABLED": "true",
+            "REQUEST_METRICS_SAMPLE_RATE": "1.0",
+            "INTERNAL_IPS": "127.0.0.1,::1",
+        }
+        if options["workers"]:
+            env["WEB_CONCURRENCY"] = str(options["workers"])
+        base_url = f"http://127.0.0.1:{port}"
+
+        with tempfile.TemporaryFile() as log:
+            server = subprocess.Popen(
+                [sys.executable, "-m", "gunicorn", "-c", GUNICORN_CONFIG],
+                cwd=settings.BASE_DIR,
+                env=env,
+                stdout=log,
+                stderr=log,
+            )
+            try:
+                self.wait_until_ready(server, base_url, log)
+                samples, wall_seconds = asyncio.run(
+                    run_http_mix(
+                        base_url,
+                        workload,
+                        options["mix"],
+                        options["requests"],
+                        warmup=options["warmup"],
+                        seed=options["seed"],
+                        connections=options["connections"],
+                    )
+                )
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=60)
+
+        meta = {
+            "server": name,
+            "connections": options["connections"],
+            "workers": options["workers"],
+            "cpu_count": os.cpu_count(),
+            "seed": options["seed"],
+            "dataset": dataset,
+            "mix": options["mix"],
+            "warmup": options["warmup"],
+        }
+        return build_report(samples, wall_seconds, meta)
+
+    def wait_until_ready(self, server, base_url, log, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                log.seek(0)
+                raise CommandError(
+                    "The server exited during startup:\n"
+                    + log.read().decode(errors="replace")
+                )
+            try:
+                with urllib.request.urlopen(f"{base_url}/api/movies/", timeout=5):
+                    return
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.2)
+        raise CommandError(f"The server did not answer within {timeout}s.")
+
+    def print_report(self, name, report):
+        overall = report["overall"]
+        self.stdout.write(
+            f"{name}: {overall['wall_throughput_rps']:.1f} req/s over "
+            f"{overall['wall_seconds']:.1f}s, {overall['errors']} errors"
+        )
+        self.stdout.write(
+            f"  {'endpoint':<16}{'reqs':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+            f"{'queries':>9}"
+        )
+        rows = list(report["endpoints"].items()) + [("overall", overall)]
+        for endpoint, stats in rows:
+            self.stdout.write(
+                f"  {endpoint:<16}{stats['requests']:>7}{stats['p50_ms']:>9.2f}"
+                f"{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+                f"{stats['queries_per_request']:>9.2f}"
+            )
+
+    def print_comparison(self, first, second):
+        before, after = first["meta"]["server"], second["meta"]["server"]
+        old = first["overall"]["wall_throughput_rps"]
+        new = second["overall"]["wall_throughput_rps"]
+        change = (new - old) / old * 100 if old else 0.0
+        self.stdout.write(
+            f"{after} compared with {before}: throughput {old:.1f} -> {new:.1f} "
+            f"req/s ({change:+.1f}%)"
+        )
+        for endpoint, metric, old, new, change in compare_reports(first, second):
+            self.stdout.write(
+                f"  {endpoint:<16}{metric:<20}{old:>9.2f} -> {new:>9.2f} "
+                f"({change:+.1f}%)"
+            )
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from config.warmup import warm_up
+
+
+class Command(BaseCommand):
+    help = (
+        "Request the most visited pages in-process to import the app, open "
+        "the database connection and fill the catalog cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths", nargs="*", help="Paths to request (default: the hot pages)."
+        )
+
+    def handle(self, *args, **options):
+        failed = False
+        for path, status_code, ms in warm_up(options["paths"] or None):
+            self.stdout.write(f"{status_code} {path} {ms:.1f} ms")
+            failed = failed or status_code >= 500
+        if failed:
+            raise CommandError("Some pages failed to warm up.")
+        self.stdout.write(self.style.SUCCESS("Warm."))
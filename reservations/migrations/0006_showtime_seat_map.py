@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0005_bookinghistory_seat'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='showtime',
+            name='seat_map',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
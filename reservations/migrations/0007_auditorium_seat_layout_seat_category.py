@@ -0,0 +1,24 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:50
+
+from django.db import migrations, models
+import reservations.layout
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0006_showtime_seat_map'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditorium',
+            name='seat_layout',
+            field=models.JSONField(blank=True, default=list, validators=[reservations.layout.validate_layout]),
+        ),
+        migrations.AddField(
+            model_name='seat',
+            name='category',
+            field=models.CharField(choices=[('standard', 'Standard'), ('premium', 'Premium'), ('recliner', 'Recliner')], default='standard', max_length=20),
+        ),
+    ]
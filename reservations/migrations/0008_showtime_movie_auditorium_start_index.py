@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0007_auditorium_seat_layout_seat_category'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='showtime',
+            index=models.Index(fields=['movie', 'auditorium', 'start_time'], name='showtime_movie_aud_start_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0008_showtime_movie_auditorium_start_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookinghistory',
+            index=models.Index(fields=['user', '-booked_at'], name='booking_user_booked_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='showtime',
+            index=models.Index(fields=['start_time'], name='showtime_start_time_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0009_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookinghistory',
+            index=models.Index(fields=['-booked_at', '-id'], name='booking_booked_at_id_idx'),
+        ),
+    ]
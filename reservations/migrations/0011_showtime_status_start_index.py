@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 14:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0010_bookinghistory_booked_at_id_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='showtime',
+            index=models.Index(fields=['status', 'start_time'], name='showtime_status_start_idx'),
+        ),
+    ]
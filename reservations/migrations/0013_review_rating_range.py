@@ -0,0 +1,19 @@
+# Generated by Django 4.2.20 on 2026-10-18 15:04
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0012_dailyschedule'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='review',
+            name='rating',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)]),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-18 15:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0013_review_rating_range'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['movie', '-reviewed_at', '-id'], name='review_movie_reviewed_at_idx'),
+        ),
+    ]
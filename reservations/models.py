@@ -1,10 +1,19 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
 
 from movies.models import Movie
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
+from reservations.layout import (
+    SEAT_CATEGORIES,
+    default_layout,
+    seat_plan,
+    validate_layout,
+)
+
 User = get_user_model()
 
 User = get_user_model()
@@ -24,10 +33,59 @@ class Auditorium(models.Model):
         blank=True,
         related_name="auditoriums",
     )
+    # Rows front to back, e.g. [{"row": "A", "seats": 12, "category": "premium"}].
+    # Left empty, seats are laid out ten to a row from total_seats.
+    seat_layout = models.JSONField(
+        default=list, blank=True, validators=[validate_layout]
+    )
 
     def __str__(self):
         return f"{self.name} - {self.place}"
 
+    def clean(self):
+        super().clean()
+        self.check_layout()
+
+    def save(self, *args, **kwargs):
+        self.check_layout()
+        if self.seat_layout:
+            self.total_seats = sum(row["seats"] for row in self.seat_layout)
+        super().save(*args, **kwargs)
+
+    def check_layout(self):
+        """
+        Validate ``seat_layout`` and refuse to change the seating of an
+        auditorium that already has showtimes: their seat maps and ``Seat``
+        rows are indexed by the layout they were scheduled with.
+        """
+        validate_layout(self.seat_layout)
+        if self.pk is None:
+            return
+        previous = (
+            Auditorium.objects.filter(pk=self.pk)
+            .values_list("seat_layout", "total_seats")
+            .first()
+        )
+        if previous is None:
+            return
+        seat_layout, total_seats = previous
+        before = seat_layout or default_layout(total_seats)
+        if before != self.layout and self.showtime_set.exists():
+            raise ValidationError(
+                {
+                    "seat_layout": "The seating of an auditorium with showtimes "
+                    "cannot be changed."
+                }
+            )
+
+    @property
+    def layout(self):
+        return self.seat_layout or default_layout(self.total_seats)
+
+    def seat_plan(self):
+        """``(seat_number, category)`` for every seat in the auditorium."""
+        return seat_plan(self.layout)
+
 
 
 class Showtime(models.Model):
@@ -43,6 +101,21 @@ class Showtime(models.Model):
         max_length=20, choices=STATUS_CHOICES, default="scheduled"
     )
     start_time = models.DateTimeField()
+    # Packed bitset of booked seats, see reservations.seatmap.SeatMap.
+    # Built lazily from the Seat rows and kept in sync by the booking engine.
+    seat_map = models.BinaryField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["movie", "auditorium", "start_time"],
+                name="showtime_movie_aud_start_idx",
+            ),
+            models.Index(fields=["start_time"], name="showtime_start_time_idx"),
+            models.Index(
+                fields=["status", "start_time"], name="showtime_status_start_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.movie.title} at {self.start_time.strftime('%Y-%m-%d %H:%M')} in {self.auditorium.name}"
@@ -68,6 +141,9 @@ class Seat(models.Model):
     showtime = models.ForeignKey(Showtime, on_delete=models.CASCADE)
     seat_number = models.CharField(max_length=10)
     is_booked = models.BooleanField(default=False)
+    category = models.CharField(
+        max_length=20, choices=SEAT_CATEGORIES, default="standard"
+    )
 
     class Meta:
         unique_together = ("showtime", "seat_number")
@@ -91,15 +167,31 @@ class Seat(models.Model):
 class Review(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     movie = models.ForeignKey(Movie, on_delete=models.CASCADE)
-    rating = models.PositiveIntegerField()
+    rating = models.PositiveIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(5)]
+    )
     comment = models.TextField(blank=True)
     reviewed_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"Review by {self.user.username} for {self.movie.title} - {self.rating}★"
+        return f"Review by {self.user.email} for {self.movie.title} - {self.rating}★"
 
     class Meta:
         ordering = ["-reviewed_at"]
+        indexes = [
+            # Serves a movie's review feed newest first; id breaks ties for
+            # keyset pagination.
+            models.Index(
+                fields=["movie", "-reviewed_at", "-id"],
+                name="review_movie_reviewed_at_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # The movie's rating aggregates are updated by signal handlers; keep
+        # them in the same transaction as the review itself.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
 
 
@@ -122,3 +214,27 @@ class BookingHistory(models.Model):
 
     class Meta:
         ordering = ["-booked_at"]
+        indexes = [
+            # "My bookings": one user's rows, newest first. Lookups by seat
+            # use the index Django already creates for the seat foreign key.
+            models.Index(
+                fields=["user", "-booked_at"], name="booking_user_booked_at_idx"
+            ),
+            # Keyset pagination of the admin listing.
+            models.Index(fields=["-booked_at", "-id"], name="booking_booked_at_id_idx"),
+        ]
+
+
+class DailySchedule(models.Model):
+    """
+    Materialized "what's on" for one local date: movie -> auditoriums ->
+    showtimes. Rebuilt for the affected dates whenever a Showtime changes,
+    see reservations.schedule.
+    """
+
+    date = models.DateField(unique=True)
+    payload = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Schedule for {self.date}"
@@ -0,0 +1,36 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class BookingCursorPagination(CursorPagination):
+    """
+    Keyset pagination over booking history, newest first. Pages are fetched
+    with a ``WHERE booked_at < cursor`` seek on the (booked_at, id) index, so
+    deep pages cost the same as the first one.
+    """
+
+    ordering = ("-booked_at", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class StandardPagination(PageNumberPagination):
+    """
+    Default pagination for list endpoints (see REST_FRAMEWORK settings).
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class ReviewCursorPagination(CursorPagination):
+    """
+    Keyset pagination over one movie's reviews, newest first, seeking on the
+    (movie, reviewed_at, id) index.
+    """
+
+    ordering = ("-reviewed_at", "-id")
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
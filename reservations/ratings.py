@@ -0,0 +1,86 @@
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, Greatest
+
+from movies.cache import bump_catalog_version
+from movies.models import Movie
+from reservations.models import Review
+
+STARS = range(1, 6)
+
+
+def average_expression():
+    return Case(
+        When(review_count=0, then=Value(0.0)),
+        default=Cast("rating_sum", FloatField()) / F("review_count"),
+        output_field=FloatField(),
+    )
+
+
+def apply_rating(movie_id, rating, sign):
+    """
+    Add (``sign=1``) or remove (``sign=-1``) one review's ``rating`` from the
+    movie's aggregate columns. Counters are updated with F() expressions so
+    concurrent reviews don't overwrite each other, and clamp at zero so drift
+    can never push them negative.
+    """
+    counters = {
+        "review_count": Greatest(F("review_count") + sign, Value(0)),
+        "rating_sum": Greatest(F("rating_sum") + sign * rating, Value(0)),
+    }
+    if rating in STARS:
+        column = f"ratings_{rating}"
+        counters[column] = Greatest(F(column) + sign, Value(0))
+
+    movies = Movie.objects.filter(pk=movie_id)
+    movies.update(**counters)
+    # A second statement so the average sees the new sum and count.
+    movies.update(rating_average=average_expression())
+    transaction.on_commit(bump_catalog_version)
+
+
+def recompute_aggregates(movies):
+    """
+    Rebuild the aggregate columns of every movie in the ``movies`` queryset
+    from its Review rows. Counting happens in the database, through
+    correlated subqueries on the review's movie index, so the cost doesn't
+    depend on Python round trips per movie.
+    """
+
+    def reviews(**filters):
+        return Review.objects.filter(movie_id=OuterRef("pk"), **filters).order_by()
+
+    def count(**filters):
+        return Coalesce(
+            Subquery(
+                reviews(**filters)
+                .values("movie_id")
+                .annotate(n=Count("id"))
+                .values("n")
+            ),
+            0,
+        )
+
+    total = Coalesce(
+        Subquery(
+            reviews().values("movie_id").annotate(s=Sum("rating")).values("s")
+        ),
+        0,
+    )
+    updated = movies.update(
+        review_count=count(),
+        rating_sum=total,
+        **{f"ratings_{star}": count(rating=star) for star in STARS},
+    )
+    movies.update(rating_average=average_expression())
+    return updated
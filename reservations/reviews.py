@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from config.routers import primary_reads
+
+DEFAULT_REVIEW_FEED_TTL = 60
+
+
+def _cache():
+    return caches[getattr(settings, "REVIEW_FEED_CACHE", "default")]
+
+
+def _version_key(movie_id):
+    return f"reviews:version:{movie_id}"
+
+
+def feed_version(movie_id):
+    cache = _cache()
+    version = cache.get(_version_key(movie_id))
+    if version is None:
+        cache.add(_version_key(movie_id), 1, None)
+        version = cache.get(_version_key(movie_id), 1)
+    return version
+
+
+def invalidate_review_feed(movie_id):
+    """
+    Make every cached first page of ``movie_id``'s feed unreachable by
+    bumping the movie's feed version once the current transaction commits.
+    """
+
+    def bump():
+        cache = _cache()
+        try:
+            cache.incr(_version_key(movie_id))
+        except ValueError:
+            cache.add(_version_key(movie_id), 2, None)
+
+    transaction.on_commit(bump)
+
+
+def cached_first_page(request, movie_id, build):
+    """
+    Serve the first page of a movie's review feed from the cache, filling it
+    with ``build()`` on a miss. Later pages (with a ``cursor``) are never
+    cached; they are cheap index seeks and rarely requested twice.
+    """
+    if "cursor" in request.query_params:
+        return build()
+
+    cache = _cache()
+    key = f"reviews:{movie_id}:{feed_version(movie_id)}:{request.get_full_path()}"
+    data = cache.get(key)
+    if data is None:
+        # Read from the primary: a lagging replica would cache the page
+        # from before the review that bumped the version.
+        with primary_reads():
+            response = build()
+        if response.status_code != status.HTTP_200_OK:
+            return response
+        data = response.data
+        cache.set(
+            key, data, getattr(settings, "REVIEW_FEED_TTL", DEFAULT_REVIEW_FEED_TTL)
+        )
+    return Response(data)
@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.utils import timezone
+
+from reservations.filters import day_bounds
+from reservations.models import DailySchedule, Showtime
+
+
+def schedule_enabled():
+    return getattr(settings, "SCHEDULE_MATERIALIZED", True)
+
+
+def local_date(start_time):
+    return timezone.localdate(start_time)
+
+
+def build_schedule(date):
+    """
+    Group the showtimes of ``date`` as movie -> auditoriums -> showtimes,
+    using a single range query on ``start_time``.
+    """
+    start, end = day_bounds(date)
+    rows = (
+        Showtime.objects.filter(start_time__gte=start, start_time__lt=end)
+        .order_by("movie_id", "auditorium_id", "start_time")
+        .values_list("id", "movie_id", "auditorium_id", "start_time", "status")
+    )
+    movies = {}
+    for showtime_id, movie_id, auditorium_id, start_time, status in rows:
+        auditoriums = movies.setdefault(movie_id, {})
+        auditoriums.setdefault(auditorium_id, []).append(
+            {"id": showtime_id, "start_time": start_time.isoformat(), "status": status}
+        )
+    return {
+        "date": date.isoformat(),
+        "movies": [
+            {
+                "movie": movie_id,
+                "auditoriums": [
+                    {"auditorium": auditorium_id, "showtimes": showtimes}
+                    for auditorium_id, showtimes in auditoriums.items()
+                ],
+            }
+            for movie_id, auditoriums in movies.items()
+        ],
+    }
+
+
+def refresh_schedules(dates):
+    """Rebuild and store the schedule for each of ``dates``."""
+    for date in set(dates):
+        DailySchedule.objects.update_or_create(
+            date=date, defaults={"payload": build_schedule(date)}
+        )
+
+
+def get_schedule(date):
+    """
+    Return the schedule for ``date``, from the materialized row when
+    ``SCHEDULE_MATERIALIZED`` is on (building it on first use).
+    """
+    if not schedule_enabled():
+        return build_schedule(date)
+    schedule = DailySchedule.objects.filter(date=date).values_list(
+        "payload", flat=True
+    ).first()
+    if schedule is None:
+        schedule = build_schedule(date)
+        DailySchedule.objects.get_or_create(date=date, defaults={"payload": schedule})
+    return schedule
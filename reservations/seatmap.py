@@ -0,0 +1,151 @@
+from django.db import transaction
+
+from reservations.layout import default_layout, seat_plan
+from reservations.models import Seat, Showtime
+
+class SeatMap:
+    """
+    Packed bitset of booked seats for one showtime. Bit ``i`` is set when the
+    ``i``-th seat of the auditorium layout (front row first) is booked.
+    """
+
+    def __init__(self, labels, data=None):
+        self.labels = labels
+        self.total_seats = len(labels)
+        self._index = {label: index for index, label in enumerate(labels)}
+        size = (self.total_seats + 7) // 8
+        self.bits = bytearray(data) if data is not None else bytearray(size)
+        if len(self.bits) < size:
+            self.bits.extend(bytes(size - len(self.bits)))
+
+    @classmethod
+    def for_layout(cls, layout, data=None):
+        return cls([label for label, _ in seat_plan(layout)], data)
+
+    @classmethod
+    def for_seats(cls, total_seats, data=None):
+        """Map over the default ten-to-a-row layout."""
+        return cls.for_layout(default_layout(total_seats), data)
+
+    def label_of(self, index):
+        return self.labels[index]
+
+    def index_of(self, label):
+        """
+        Layout index for a seat label, or None if it is not part of the layout.
+        """
+        return self._index.get(label)
+
+    def is_booked(self, index):
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def book(self, index):
+        """Set the bit; returns False if the seat was already booked."""
+        if self.is_booked(index):
+            return False
+        self.bits[index >> 3] |= 1 << (index & 7)
+        return True
+
+    def release(self, index):
+        self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def booked_count(self):
+        return sum(bin(byte).count("1") for byte in self.bits)
+
+    def available_labels(self):
+        return [
+            label
+            for index, label in enumerate(self.labels)
+            if not self.is_booked(index)
+        ]
+
+    def to_bytes(self):
+        return bytes(self.bits)
+
+    def mark(self, seats):
+        """
+        Set the bits for ``(seat_number, is_booked)`` pairs, e.g. the ``Seat``
+        rows of a showtime. Labels outside the layout are ignored.
+        """
+        for seat_number, is_booked in seats:
+            index = self.index_of(seat_number)
+            if is_booked and index is not None:
+                self.book(index)
+        return self
+
+
+def load_seat_map(showtime):
+    """
+    Return the ``SeatMap`` for ``showtime`` (fetched with its auditorium),
+    building and storing it from the showtime's ``Seat`` rows the first time
+    it is asked for.
+    """
+    layout = showtime.auditorium.layout
+    if showtime.seat_map is not None:
+        return SeatMap.for_layout(layout, showtime.seat_map)
+
+    seat_map = SeatMap.for_layout(layout).mark(
+        Seat.objects.filter(showtime=showtime).values_list("seat_number", "is_booked")
+    )
+    data = seat_map.to_bytes()
+    if Showtime.objects.filter(pk=showtime.pk, seat_map__isnull=True).update(
+        seat_map=data
+    ):
+        showtime.seat_map = data
+        return seat_map
+    # Another request built it first; use theirs.
+    showtime.seat_map = (
+        Showtime.objects.values_list("seat_map", flat=True).get(pk=showtime.pk)
+    )
+    return SeatMap.for_layout(layout, showtime.seat_map)
+
+
+def update_seat_map(showtime, seat_numbers, booked):
+    """
+    Mirror a booking or cancellation into ``showtime.seat_map``.
+
+    The showtime row is locked while its map is rewritten, so concurrent
+    bookings of the same showtime queue up behind each other instead of
+    overwriting one another's bits. Callers claim their ``Seat`` rows first
+    and lock the showtime last, which keeps the lock order the same for
+    every booking. Showtimes without a map are left alone; it will be built
+    from the ``Seat`` rows on first read.
+    """
+    if showtime.seat_map is None:
+        return
+    layout = showtime.auditorium.layout
+
+    # Callers are already in a transaction; only open one when they aren't.
+    with transaction.atomic(savepoint=False):
+        current = (
+            Showtime.objects.select_for_update()
+            .values_list("seat_map", flat=True)
+            .get(pk=showtime.pk)
+        )
+        if current is None:
+            showtime.seat_map = None
+            return
+        seat_map = SeatMap.for_layout(layout, current)
+        for seat_number in seat_numbers:
+            index = seat_map.index_of(seat_number)
+            if index is None:
+                continue
+            if booked:
+                seat_map.book(index)
+            else:
+                seat_map.release(index)
+        data = seat_map.to_bytes()
+        if data != bytes(current):
+            Showtime.objects.filter(pk=showtime.pk).update(seat_map=data)
+        showtime.seat_map = data
+
+
+def materialize_seats(showtime):
+    """
+    Create every ``Seat`` of a freshly scheduled showtime from its
+    auditorium's layout with a single ``bulk_create``.
+    """
+    return Seat.objects.bulk_create(
+        Seat(showtime=showtime, seat_number=seat_number, category=category)
+        for seat_number, category in showtime.auditorium.seat_plan()
+    )
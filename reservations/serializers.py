@@ -1,23 +1,39 @@
 from rest_framework import serializers
+from django.contrib.auth import get_user_model
 from movies.models import Movie
 from reservations.models import Auditorium, Seat, Showtime, Review, BookingHistory
-from movies.serilizers import MovieSerializer
+from movies.serilizers import (
+    MovieSerializer,
+    MovieSummarySerializer,
+    SparseFieldsetMixin,
+)
+
+User = get_user_model()
 
 
 # Seat Serializer
 class SeatSerializer(serializers.ModelSerializer):
+    is_held = serializers.SerializerMethodField()
+
     class Meta:
         model = Seat
-        fields = ("seat_number", "is_booked", "showtime")
+        fields = ("seat_number", "is_booked", "is_held", "showtime")
+
+    def get_is_held(self, obj):
+        return obj.seat_number in self.context.get("held_seats", ())
 
 
 # Showtime Serializer
-class ShowtimeDetailerializer(serializers.ModelSerializer):
+class ShowtimeDetailerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     movie = MovieSerializer()
 
     class Meta:
         model = Showtime
-        fields = ("movie", "auditorium", "status", "start_time")
+        fields = ("id", "movie", "auditorium", "status", "start_time")
+
+
+class ShowtimeListSerializer(ShowtimeDetailerializer):
+    movie = MovieSummarySerializer()
 
 
 class ShowtimeSerializer(serializers.ModelSerializer):
@@ -27,7 +43,7 @@ class ShowtimeSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Showtime
-        fields = ("movie", "auditorium", "status", "start_time")
+        fields = ("id", "movie", "auditorium", "status", "start_time")
 
 
 # Auditorium Serializer
@@ -54,18 +70,114 @@ class AuditoriumSerializer(serializers.ModelSerializer):
 class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
-        fields = ("user", "movie", "rating", "comment", "reviewed_at")
+        fields = ("id", "user", "movie", "rating", "comment", "reviewed_at")
+        read_only_fields = ("user",)
+
+
+class ReviewReviewerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ("id", "name")
+
+
+class ReviewFeedSerializer(serializers.ModelSerializer):
+    """A review as listed in a movie's feed; fetch with select_related("user")."""
+
+    user = ReviewReviewerSerializer(read_only=True)
+
+    class Meta:
+        model = Review
+        fields = ("id", "user", "rating", "comment", "reviewed_at")
+
+
+# Slim nested serializers for booking listings. Pair them with
+# BOOKING_LIST_RELATED so every row is served from a single query.
+class BookingUserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ("id", "name", "email")
+
+
+class BookingMovieSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Movie
+        fields = ("id", "title")
+
+
+class BookingShowtimeSerializer(serializers.ModelSerializer):
+    auditorium = serializers.CharField(source="auditorium.name")
+
+    class Meta:
+        model = Showtime
+        fields = ("id", "start_time", "status", "auditorium")
+
+
+class BookingSeatSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Seat
+        fields = ("id", "seat_number")
+
+
+BOOKING_LIST_RELATED = ("movie", "showtime__auditorium", "seat")
 
 
 # BookingHistory Serializer
 class BookingHistorySerializer(serializers.ModelSerializer):
+    movie = BookingMovieSerializer(read_only=True)
+    showtime = BookingShowtimeSerializer(read_only=True)
+    seat = BookingSeatSerializer(read_only=True, allow_null=True)
+
     class Meta:
         model = BookingHistory
-        fields = "__all__"
-        depth = 1
+        fields = ("id", "movie", "showtime", "seat", "tickets", "booked_at")
+
+
+class AdminBookingHistorySerializer(BookingHistorySerializer):
+    user = BookingUserSerializer(read_only=True)
+
+    class Meta(BookingHistorySerializer.Meta):
+        fields = ("id", "user") + BookingHistorySerializer.Meta.fields[1:]
 
 
 class SeatQuerySerializer(serializers.Serializer):
     movie_name = serializers.CharField()
     auditorium_name = serializers.CharField()
     show_time = serializers.CharField()
+
+
+class BatchReservationSerializer(serializers.Serializer):
+    showtime_id = serializers.IntegerField()
+    seat_numbers = serializers.ListField(
+        child=serializers.CharField(max_length=10), allow_empty=False, max_length=50
+    )
+
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    showtime_id = serializers.IntegerField(required=False)
+    movie_id = serializers.IntegerField(required=False)
+    auditorium_id = serializers.IntegerField(required=False)
+    start_time = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if "showtime_id" in attrs:
+            return {"showtime_id": attrs["showtime_id"]}
+        if not all(k in attrs for k in ("movie_id", "auditorium_id", "start_time")):
+            raise serializers.ValidationError(
+                "Provide showtime_id, or movie_id, auditorium_id and start_time."
+            )
+        return attrs
+
+
+class MovieFilterSerializer(serializers.Serializer):
+    language = serializers.IntegerField(required=False)
+    genre = serializers.IntegerField(required=False)
+    min_rate = serializers.DecimalField(max_digits=3, decimal_places=1, required=False)
+    max_rate = serializers.DecimalField(max_digits=3, decimal_places=1, required=False)
+    sort = serializers.ChoiceField(choices=("rate", "rating"), required=False)
+
+
+class ShowtimeFilterSerializer(serializers.Serializer):
+    movie = serializers.IntegerField(required=False)
+    auditorium = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Showtime.STATUS_CHOICES, required=False)
+    date = serializers.DateField(required=False)
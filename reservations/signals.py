@@ -0,0 +1,66 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from reservations.models import Review, Showtime
+from reservations.ratings import apply_rating
+from reservations.reviews import invalidate_review_feed
+from reservations.schedule import local_date, refresh_schedules, schedule_enabled
+
+
+@receiver(pre_save, sender=Showtime)
+def remember_schedule_date(sender, instance, **kwargs):
+    # Moving a show to another day has to refresh the day it left too.
+    instance._previous_start_time = None
+    if instance.pk and schedule_enabled():
+        instance._previous_start_time = (
+            Showtime.objects.filter(pk=instance.pk)
+            .values_list("start_time", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Showtime)
+@receiver(post_delete, sender=Showtime)
+def refresh_schedule(sender, instance, **kwargs):
+    if not schedule_enabled():
+        return
+    dates = [local_date(instance.start_time)]
+    previous = getattr(instance, "_previous_start_time", None)
+    if previous is not None:
+        dates.append(local_date(previous))
+    refresh_schedules(dates)
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, **kwargs):
+    instance._previous_rating = None
+    if instance.pk:
+        instance._previous_rating = (
+            Review.objects.filter(pk=instance.pk)
+            .values_list("movie_id", "rating")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def add_rating(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_rating", None)
+    if not created and previous == (instance.movie_id, instance.rating):
+        return
+    if previous is not None:
+        apply_rating(previous[0], previous[1], -1)
+        if previous[0] != instance.movie_id:
+            invalidate_review_feed(previous[0])
+    apply_rating(instance.movie_id, instance.rating, 1)
+
+
+@receiver(post_delete, sender=Review)
+def remove_rating(sender, instance, **kwargs):
+    apply_rating(instance.movie_id, instance.rating, -1)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def refresh_review_feed(sender, instance, **kwargs):
+    # Comment-only edits skip the rating handler but still change the feed.
+    invalidate_review_feed(instance.movie_id)
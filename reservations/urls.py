@@ -1,11 +1,18 @@
+from django.conf import settings
 from django.urls import path,include
 from reservations.views import (
     ViewUserReservations,
     ViewAllReservations,
+    ExportAllReservations,
     ReserveSeat,
+    ReserveSeats,
     UserReservationDetails,
     CancelFutureMovieReservation,
     GetavilableSeats,
+    HoldSeats,
+    MovieReviewFeed,
+    ReviewViewSet,
+    ShowtimeAvailability,
     ShowtimeViewSet
    
 )
@@ -18,6 +25,18 @@ app_name = "reservations"
 
 router = DefaultRouter()
 router.register(r'showtimes', ShowtimeViewSet)
+router.register(r'reviews', ReviewViewSet)
+
+availability_view = ShowtimeAvailability.as_view()
+read_patterns = []
+if settings.ASYNC_READ_VIEWS:
+    # GET runs on the event loop; other methods still reach the DRF views.
+    from reservations.async_views import AsyncShowtimeAvailability, AsyncShowtimeList
+
+    availability_view = AsyncShowtimeAvailability.as_view()
+    read_patterns = [
+        path("showtimes/", AsyncShowtimeList.as_view(), name="showtime-list"),
+    ]
 
 urlpatterns = [
     path(
@@ -25,6 +44,11 @@ urlpatterns = [
         ViewAllReservations.as_view(),
         name="view_all_reservations",
     ),
+    path(
+        "reservations/admin/export/",
+        ExportAllReservations.as_view(),
+        name="export_reservations",
+    ),
     path(
         "reservations/user/",
         ViewUserReservations.as_view(),
@@ -41,6 +65,21 @@ urlpatterns = [
         name="reservation_details",
     ),
     path("reservations/book/", ReserveSeat.as_view(), name="reserve_seat"),
+    path(
+        "reservations/book/batch/", ReserveSeats.as_view(), name="reserve_seats"
+    ),
+    path("reservations/hold/", HoldSeats.as_view(), name="hold_seats"),
     path("getavailableseat/",GetavilableSeats.as_view(),name="avilableseats"),
+    path(
+        "seats/availability/",
+        availability_view,
+        name="showtime_availability",
+    ),
+    path(
+        "movies/<int:movie_id>/reviews/",
+        MovieReviewFeed.as_view(),
+        name="movie_reviews",
+    ),
+    *read_patterns,
     path('', include(router.urls)),
 ]
@@ -1,39 +1,124 @@
 from django.shortcuts import render
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status, generics, viewsets
+from rest_framework import mixins, status, generics, viewsets
+from rest_framework.decorators import action
 from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 
+from django.db import router, transaction
 from django.utils import timezone
-from reservations.models import BookingHistory, Seat, Showtime, Auditorium
+from reservations.models import BookingHistory, Review, Seat, Showtime, Auditorium
 from movies.models import Movie
+from config.routers import ReplicaReadMixin
+from movies.cache import CatalogCacheMixin
+from movies.importer import (
+    DEFAULT_CHUNK_SIZE,
+    CatalogImporter,
+    detect_format,
+    read_rows,
+    text_stream,
+)
 from movies.serilizers import MovieSerializer
 from reservations.serializers import (
+    BOOKING_LIST_RELATED,
+    AdminBookingHistorySerializer,
+    AvailabilityQuerySerializer,
+    BatchReservationSerializer,
     BookingHistorySerializer,
     SeatSerializer,
     ShowtimeSerializer,
     ShowtimeDetailerializer,
+    ShowtimeListSerializer,
+    MovieFilterSerializer,
+    ReviewFeedSerializer,
+    ReviewSerializer,
+    ShowtimeFilterSerializer,
+)
+from reservations.booking import (
+    BookingError,
+    cancel_reservation,
+    place_hold,
+    reserve_seat,
+    reserve_seats,
 )
+from reservations.filters import filter_movies, filter_showtimes
+from reservations.export import stream_csv, stream_ndjson
+from reservations.pagination import BookingCursorPagination, ReviewCursorPagination
+from reservations.reviews import cached_first_page
+from reservations.seatmap import SeatMap, load_seat_map, materialize_seats
+from reservations.holds import get_hold_ttl, held_by_others, release_holds
 from user.permissions import IsAdminOrReadOnly
+import base64
 import datetime
-from user.permissions import IsAdminOrReadOnly, IsUser
+from user.permissions import (
+    IsAdminOrReadOnly,
+    IsAdminorReadonly,
+    IsAuthorOrReadOnly,
+    IsUser,
+)
 
 
-class ViewAllReservations(APIView):
-    permission_classes = [IsAdminOrReadOnly]
+SPARSE_FIELDS_PARAMETER = OpenApiParameter(
+    "fields",
+    description="Comma-separated list of fields to return, e.g. id,title",
+    type=str,
+)
+
+
+class ViewAllReservations(ReplicaReadMixin, generics.ListAPIView):
+    permission_classes = [IsAdminorReadonly]
+    serializer_class = AdminBookingHistorySerializer
+    pagination_class = BookingCursorPagination
+
+    def get_queryset(self):
+        return BookingHistory.objects.select_related("user", *BOOKING_LIST_RELATED)
 
+
+class ExportAllReservations(ReplicaReadMixin, APIView):
+    """
+    Stream the whole booking history as NDJSON (default) or CSV.
+    """
+
+    permission_classes = [IsAdminorReadonly]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "output",
+                description="Export format: ndjson or csv",
+                type=str,
+                enum=["ndjson", "csv"],
+            ),
+        ],
+        responses={200: None},
+    )
     def get(self, request):
-        reservation = BookingHistory.objects.all()
-        serializer = BookingHistorySerializer(reservation, many=True)
-        return Response(serializer.data)
+        output = request.query_params.get("output", "ndjson")
+        if output not in ("ndjson", "csv"):
+            return Response(
+                {"error": "output must be ndjson or csv."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # The rows are read while the response streams, after dispatch has
+        # returned, so resolve the database while the replica scope is open.
+        queryset = BookingHistory.objects.using(
+            router.db_for_read(BookingHistory)
+        ).order_by("id")
+        if output == "csv":
+            return stream_csv(queryset, "reservations")
+        return stream_ndjson(queryset, "reservations")
 
 
 class ViewUserReservations(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        reservation = BookingHistory.objects.filter(user=request.user)
+        reservation = BookingHistory.objects.filter(
+            user=request.user
+        ).select_related(*BOOKING_LIST_RELATED)
         serializer = BookingHistorySerializer(reservation, many=True)
         return Response(serializer.data)
 
@@ -45,7 +130,9 @@ class CancelFutureMovieReservation(APIView):
         booking_id = request.data.get("booking_id")
 
         try:
-            reservation = BookingHistory.objects.get(id=booking_id, user=request.user)
+            reservation = BookingHistory.objects.select_related(
+                "showtime__auditorium", "seat"
+            ).get(id=booking_id, user=request.user)
         except BookingHistory.DoesNotExist:
             return Response(
                 {"error": "Reservation not found."}, status=status.HTTP_404_NOT_FOUND
@@ -57,7 +144,7 @@ class CancelFutureMovieReservation(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        reservation.delete()
+        cancel_reservation(reservation)
         return Response(
             {"message": "Reservation cancelled successfully."},
             status=status.HTTP_200_OK,
@@ -133,39 +220,97 @@ class ReserveSeat(APIView):
             )
 
         try:
-            seat = Seat.objects.select_related("showtime").get(
-                id=seat_id, showtime_id=showtime_id
-            )
-        except Seat.DoesNotExist:
-            return Response(
-                {"error": "Seat or Showtime not found."},
-                status=status.HTTP_404_NOT_FOUND,
-            )
+            booking = reserve_seat(request.user, seat_id, showtime_id, tickets)
+        except BookingError as exc:
+            return Response({"error": exc.message}, status=exc.status_code)
+
+        return Response(
+            {"message": "Seat reserved successfully.", "booking_id": booking.id},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class ReserveSeats(APIView):
+    """
+    Book several seats of one showtime in a single all-or-nothing request.
+    """
 
-        if BookingHistory.objects.filter(seat=seat).exists():
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(request=BatchReservationSerializer)
+    def post(self, request):
+        if request.user.role == "admin":
             return Response(
-                {"error": "Seat is already booked."},
-                status=status.HTTP_409_CONFLICT,
+                {"error": "Admin users are not allowed to book tickets."},
+                status=status.HTTP_403_FORBIDDEN,
             )
 
-        if seat.showtime.start_time <= timezone.now():
-            return Response(
-                {"error": "Cannot book a seat for a past or ongoing showtime."},
-                status=status.HTTP_400_BAD_REQUEST,
+        serializer = BatchReservationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            bookings = reserve_seats(
+                request.user,
+                serializer.validated_data["showtime_id"],
+                serializer.validated_data["seat_numbers"],
             )
+        except BookingError as exc:
+            return Response({"error": exc.message}, status=exc.status_code)
 
-        booking = BookingHistory.objects.create(
-            user=request.user,
-            seat=seat,
-            showtime=seat.showtime,
-            tickets=tickets,
+        return Response(
+            {
+                "message": "Seats reserved successfully.",
+                "booking_ids": [booking.id for booking in bookings],
+            },
+            status=status.HTTP_201_CREATED,
         )
 
+
+class HoldSeats(APIView):
+    """
+    Hold seats for a few minutes while the user checks out, or release them.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(request=BatchReservationSerializer)
+    def post(self, request):
+        serializer = BatchReservationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            seat_numbers = place_hold(
+                request.user,
+                serializer.validated_data["showtime_id"],
+                serializer.validated_data["seat_numbers"],
+            )
+        except BookingError as exc:
+            return Response({"error": exc.message}, status=exc.status_code)
+
         return Response(
-            {"message": "Seat reserved successfully.", "booking_id": booking.id},
+            {
+                "message": "Seats held successfully.",
+                "seat_numbers": seat_numbers,
+                "expires_in": get_hold_ttl(),
+            },
             status=status.HTTP_201_CREATED,
         )
 
+    @extend_schema(request=BatchReservationSerializer, responses={204: None})
+    def delete(self, request):
+        serializer = BatchReservationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        release_holds(
+            serializer.validated_data["showtime_id"],
+            serializer.validated_data["seat_numbers"],
+            request.user.id,
+        )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 
 class GetavilableSeats(generics.GenericAPIView):
 
@@ -201,41 +346,293 @@ class GetavilableSeats(generics.GenericAPIView):
         auditorium_name = request.GET.get("auditorium_name")
         show = request.GET.get("show_time")
 
-        moviedata = Movie.objects.get(title=movie_name)
-        auditoriumdata = Auditorium.objects.get(name=auditorium_name)
-
         if not all([movie_name, auditorium_name, show]):
-            return Response({"Error:parameters required"})
-
-        else:
-            try:
-
-                show_time = datetime.datetime.strptime(show, "%H:%M:%S").time()
-
-                show = Showtime.objects.filter(
-                    movie=moviedata,
-                    auditorium=auditoriumdata,
-                    start_time__time=show_time,
-                ).first()
-            except Showtime.DoesNotExist:
-                return Response({"Error:show not found"}, status=404)
-        seats = Seat.objects.filter(showtime=show)
-        serializer = SeatSerializer(seats, many=True)
+            return Response(
+                {"error": "movie_name, auditorium_name and show_time are required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            show_time = datetime.datetime.strptime(show, "%H:%M:%S").time()
+        except ValueError:
+            return Response(
+                {"error": "show_time must be in HH:MM:SS format."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        show = Showtime.objects.filter(
+            movie__title=movie_name,
+            auditorium__name=auditorium_name,
+            start_time__time=show_time,
+        ).first()
+        if show is None:
+            return Response(
+                {"error": "Show not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        seats = list(Seat.objects.filter(showtime=show))
+        held = held_by_others(show.id, [seat.seat_number for seat in seats])
+        serializer = SeatSerializer(seats, many=True, context={"held_seats": held})
         return Response(serializer.data)
 
 
-class MovieViewSet(viewsets.ModelViewSet):
+AVAILABILITY_FIELDS = ("showtime_id", "seat_number", "category", "is_booked")
+
+
+def availability_lookups(params):
+    """
+    Showtime and seat lookups for validated ``AvailabilityQuerySerializer``
+    data.
+    """
+    if "showtime_id" in params:
+        show_lookup = {"id": params["showtime_id"]}
+    else:
+        show_lookup = {
+            "movie_id": params["movie_id"],
+            "auditorium_id": params["auditorium_id"],
+            "start_time": params["start_time"],
+        }
+    seat_lookup = {f"showtime__{key}": value for key, value in show_lookup.items()}
+    return show_lookup, seat_lookup
+
+
+def seat_availability(seats):
+    """
+    The availability payload for a non-empty list of ``AVAILABILITY_FIELDS``
+    rows of one showtime, with holds marked.
+    """
+    showtime_id = seats[0]["showtime_id"]
+    held = held_by_others(showtime_id, [seat["seat_number"] for seat in seats])
+    for seat in seats:
+        del seat["showtime_id"]
+        seat["is_held"] = seat["seat_number"] in held
+    return {"showtime": showtime_id, "seats": seats}
+
+
+class ShowtimeAvailability(generics.GenericAPIView):
+    """
+    Seat status for one showtime, looked up by ``showtime_id`` or by
+    ``movie_id`` + ``auditorium_id`` + ``start_time``. Both forms resolve to
+    a single indexed seat query.
+    """
+
+    serializer_class = AvailabilityQuerySerializer
+
+    @extend_schema(parameters=[AvailabilityQuerySerializer])
+    def get(self, request):
+        query = AvailabilityQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        show_lookup, seat_lookup = availability_lookups(query.validated_data)
+
+        seats = list(
+            Seat.objects.filter(**seat_lookup)
+            .order_by("id")
+            .values(*AVAILABILITY_FIELDS)
+        )
+        if not seats:
+            # Only an empty answer needs a second look, to tell a show with
+            # no seats apart from one that does not exist.
+            showtime_id = (
+                Showtime.objects.filter(**show_lookup)
+                .values_list("id", flat=True)
+                .first()
+            )
+            if showtime_id is None:
+                return Response(
+                    {"error": "Show not found."}, status=status.HTTP_404_NOT_FOUND
+                )
+            return Response({"showtime": showtime_id, "seats": []})
+
+        return Response(seat_availability(seats))
+
+
+class MovieViewSet(ReplicaReadMixin, CatalogCacheMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminOrReadOnly]
     queryset = Movie.objects.all()
     serializer_class = MovieSerializer
 
+    @extend_schema(parameters=[MovieFilterSerializer, SPARSE_FIELDS_PARAMETER])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {
+                    "file": {"type": "string", "format": "binary"},
+                    "format": {"type": "string", "enum": ["csv", "jsonl"]},
+                    "chunk_size": {"type": "integer"},
+                },
+            }
+        },
+        responses={200: None},
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+        permission_classes=[IsAdminorReadonly],
+    )
+    def import_feed(self, request):
+        """
+        Upsert movies from an uploaded CSV or JSON Lines feed. Rows that fail
+        validation are reported back; the others are imported.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"error": "Upload the feed as 'file'."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        format = request.data.get("format") or detect_format(upload.name)
+        if format not in ("csv", "jsonl"):
+            return Response(
+                {"error": "format must be csv or jsonl."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            chunk_size = int(request.data.get("chunk_size", DEFAULT_CHUNK_SIZE))
+        except ValueError:
+            chunk_size = 0
+        if chunk_size < 1:
+            return Response(
+                {"error": "chunk_size must be a positive integer."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-class ShowtimeViewSet(viewsets.ModelViewSet):
+        importer = CatalogImporter(request.user, chunk_size=chunk_size)
+        result = importer.run(read_rows(text_stream(upload), format))
+        return Response(result.as_dict())
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ("list", "retrieve"):
+            return queryset
+        fields = self.request.query_params.get("fields")
+        fields = [name.strip() for name in fields.split(",")] if fields else None
+        if fields is None or "genre_names" in fields:
+            # One extra query for all genres of the page instead of one per movie.
+            queryset = queryset.prefetch_related("genres")
+        if self.action != "list":
+            return queryset
+        queryset = filter_movies(queryset, self.request.query_params)
+        if fields and "description" not in fields:
+            # The description is by far the widest column; skip reading it
+            # when the client did not ask for it.
+            queryset = queryset.defer("description")
+        return queryset
+
+
+class ShowtimeViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminOrReadOnly]
     queryset = Showtime.objects.all()
 
     def get_serializer_class(self):
         # Check the action (GET for list or retrieve, otherwise use the other serializer)
-        if self.action in ["list", "retrieve"]:  # For GET requests (list or detail)
+        if self.action == "list":
+            return ShowtimeListSerializer
+        if self.action == "retrieve":
             return ShowtimeDetailerializer
         return ShowtimeSerializer
+
+    @extend_schema(parameters=[ShowtimeFilterSerializer, SPARSE_FIELDS_PARAMETER])
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "list":
+            queryset = filter_showtimes(
+                queryset.select_related("movie")
+                .defer("seat_map", "movie__description")
+                .order_by("start_time", "id"),
+                self.request.query_params,
+            )
+        elif self.action == "retrieve":
+            queryset = queryset.select_related("movie")
+        return queryset
+
+    def perform_create(self, serializer):
+        # Scheduling a show lays out all of its seats in one bulk insert and
+        # starts it with an empty seat map.
+        auditorium = serializer.validated_data["auditorium"]
+        with transaction.atomic():
+            showtime = serializer.save(
+                seat_map=SeatMap.for_layout(auditorium.layout).to_bytes()
+            )
+            materialize_seats(showtime)
+
+    @extend_schema(responses={200: None})
+    @action(detail=True, methods=["get"], url_path="seatmap")
+    def seatmap(self, request, pk=None):
+        """
+        Seat availability for a showtime read from its packed seat map.
+        """
+        try:
+            showtime = Showtime.objects.select_related("auditorium").get(pk=pk)
+        except Showtime.DoesNotExist:
+            return Response(
+                {"error": "Showtime not found."}, status=status.HTTP_404_NOT_FOUND
+            )
+
+        seat_map = load_seat_map(showtime)
+        return Response(
+            {
+                "showtime": showtime.id,
+                "total_seats": seat_map.total_seats,
+                "layout": showtime.auditorium.layout,
+                "booked_count": seat_map.booked_count(),
+                "available": seat_map.available_labels(),
+                "bitmap": base64.b64encode(seat_map.to_bytes()).decode(),
+            }
+        )
+
+
+class ReviewViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.UpdateModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Write side of reviews. Reviews are read per movie through
+    MovieReviewFeed; only the author (or an admin) can change one.
+    """
+
+    permission_classes = [IsAuthorOrReadOnly]
+    queryset = Review.objects.all()
+    serializer_class = ReviewSerializer
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class MovieReviewFeed(ReplicaReadMixin, generics.ListAPIView):
+    """
+    A movie's reviews, newest first, with keyset pagination. The first page
+    is cached until the movie's reviews change.
+    """
+
+    serializer_class = ReviewFeedSerializer
+    pagination_class = ReviewCursorPagination
+
+    def get_queryset(self):
+        return Review.objects.filter(movie_id=self.kwargs["movie_id"]).select_related(
+            "user"
+        )
+
+    def list(self, request, *args, **kwargs):
+        movie_id = self.kwargs["movie_id"]
+
+        def build():
+            if not Movie.objects.filter(pk=movie_id).exists():
+                return Response(
+                    {"error": "Movie not found."}, status=status.HTTP_404_NOT_FOUND
+                )
+            return super(MovieReviewFeed, self).list(request, *args, **kwargs)
+
+        return cached_first_page(request, movie_id, build)
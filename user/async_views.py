@@ -0,0 +1,27 @@
+"""
+Async read views for the ASGI deployment (see config.async_api).
+"""
+
+from config.async_api import AsyncReadView, JSONResponse
+from reservations.filters import day_bounds
+from reservations.models import Showtime
+from reservations.serializers import ShowtimeSerializer
+from user.views import ListMoviesonPerticularDate, parse_date_param
+
+
+class AsyncShowsByDate(AsyncReadView):
+    sync_view = staticmethod(ListMoviesonPerticularDate.as_view())
+
+    async def get(self, request):
+        date_obj, error = parse_date_param(request)
+        if error:
+            return JSONResponse(error.data, status=error.status_code)
+
+        start, end = day_bounds(date_obj)
+        shows = [
+            show
+            async for show in Showtime.objects.filter(
+                start_time__gte=start, start_time__lt=end
+            ).order_by("start_time", "id")
+        ]
+        return JSONResponse(ShowtimeSerializer(shows, many=True).data)
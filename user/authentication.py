@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+DEFAULT_AUTH_STATE_TTL = 30
+
+
+def _cache():
+    return caches[getattr(settings, "AUTH_STATE_CACHE", "default")]
+
+
+def _state_key(user_id):
+    return f"auth:state:{user_id}"
+
+
+def forget_account_state(user_id):
+    _cache().delete(_state_key(user_id))
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that trusts the ``role`` and ``is_active`` claims of a
+    ClaimsRefreshToken instead of loading the user on every request.
+
+    ``request.user`` is a UserAccount with only ``id``, ``role`` and
+    ``is_active`` loaded; other fields are fetched on first access, and it
+    can be assigned to foreign keys as usual. Accounts that are disabled,
+    deleted or given another role stop authenticating within
+    ``AUTH_STATE_TTL`` seconds: their current state is cached per user for
+    that long, and dropped as soon as the account is saved. Tokens issued
+    without the claims fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if "role" not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        state = self.account_state(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        is_active, role = state
+        if not (is_active and validated_token.get("is_active", True)):
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if role != validated_token["role"]:
+            raise AuthenticationFailed(
+                _("The user's role has changed."), code="role_changed"
+            )
+
+        id_field = self.user_model._meta.get_field(api_settings.USER_ID_FIELD)
+        return self.user_model.from_db(
+            router.db_for_read(self.user_model),
+            [id_field.attname, "role", "is_active"],
+            [id_field.to_python(user_id), role, True],
+        )
+
+    def account_state(self, user_id):
+        """
+        ``(is_active, role)`` of the account, or ``None`` if it no longer
+        exists; cached for ``AUTH_STATE_TTL`` seconds.
+        """
+        cache = _cache()
+        key = _state_key(user_id)
+        state = cache.get(key)
+        if state is None:
+            row = (
+                self.user_model.objects.filter(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+                .values_list("is_active", "role")
+                .first()
+            )
+            # Cache deleted accounts too, as an empty tuple.
+            state = tuple(row) if row else ()
+            cache.set(
+                key,
+                state,
+                getattr(settings, "AUTH_STATE_TTL", DEFAULT_AUTH_STATE_TTL),
+            )
+        return state or None
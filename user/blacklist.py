@@ -0,0 +1,198 @@
+"""
+In-process bloom filter in front of simplejwt's token blacklist.
+
+Checking a refresh token against ``BlacklistedToken`` costs a join over two
+tables that only ever grow. Almost every token presented was never
+blacklisted, so each process keeps a bloom filter of the blacklisted JTIs
+and only asks the database when the filter says "maybe"; a "no" from a
+bloom filter is always right.
+
+The filter is built from the database on first use (config.warmup does
+that before a worker takes traffic) and kept current by loading new rows
+with a primary key range scan. Ids are handed out at insert time but rows
+become visible at commit, so a row can show up below ids already seen; the
+scan therefore starts from the last id seen ``TOKEN_BLACKLIST_OVERLAP``
+seconds before the previous scan, not from the newest one. A blacklisting
+transaction that takes longer than that to commit could still be missed.
+
+With ``TOKEN_BLACKLIST_CACHE`` pointing at a cache every process shares,
+each committed blacklisting also replaces a version token there, and
+processes skip the scan while the version is the one they last caught up
+to.
+"""
+
+import hashlib
+import math
+import threading
+import uuid
+from collections import deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+DEFAULT_BLOOM = {"capacity": 1_000_000, "error_rate": 0.001}
+DEFAULT_OVERLAP = 60  # seconds
+VERSION_KEY = "auth:blacklist:version"
+
+
+class BloomFilter:
+    """A fixed-size bloom filter of strings."""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        # Double hashing: k positions from two 64-bit halves of one digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+def _cache():
+    alias = getattr(settings, "TOKEN_BLACKLIST_CACHE", None)
+    return caches[alias] if alias else None
+
+
+def _new_version():
+    return uuid.uuid4().hex
+
+
+def bump_blacklist_version():
+    cache = _cache()
+    if cache is not None:
+        cache.set(VERSION_KEY, _new_version(), None)
+
+
+class TokenBlacklist:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._filter = None
+        self._last_id = 0
+        self._version = None
+        # (time, last id seen) after each scan, oldest first.
+        self._checkpoints = deque()
+
+    def might_contain(self, jti):
+        """
+        ``False`` if ``jti`` is certainly not blacklisted; ``True`` if the
+        database has to be asked.
+        """
+        self.sync()
+        return jti in self._filter
+
+    def add(self, jti):
+        """Record a token this process just blacklisted."""
+        self.sync()
+        with self._lock:
+            self._filter.add(jti)
+        # Other processes must not catch up to the new version before the
+        # row is visible to them.
+        transaction.on_commit(bump_blacklist_version)
+
+    def sync(self):
+        cache = _cache()
+        # Read before catching up, so a token blacklisted meanwhile moves the
+        # version past the one recorded below.
+        version = cache.get(VERSION_KEY) if cache is not None else None
+        if version is not None and version == self._version:
+            return
+        with self._lock:
+            if self._filter is None:
+                self._rebuild()
+            else:
+                self._catch_up()
+            if cache is not None and version is None:
+                # Nothing blacklisted since the cache started (or it evicted
+                # the key); start a version. If nobody set one meanwhile,
+                # this process has caught up to it already.
+                started = _new_version()
+                if cache.add(VERSION_KEY, started, None):
+                    version = started
+            self._version = version
+
+    def rebuild(self):
+        with self._lock:
+            self._rebuild()
+
+    def _rebuild(self):
+        options = {**DEFAULT_BLOOM, **getattr(settings, "TOKEN_BLACKLIST_BLOOM", {})}
+        now = timezone.now()
+        last_id = BlacklistedToken.objects.aggregate(last=Max("id"))["last"] or 0
+        # Expired tokens fail verification anyway; leave them out.
+        live = BlacklistedToken.objects.filter(
+            id__lte=last_id, token__expires_at__gt=now
+        )
+        self._filter = BloomFilter(
+            max(options["capacity"], 2 * live.count()), options["error_rate"]
+        )
+        self._load(live)
+        self._last_id = last_id
+        # Rows blacklisted within the overlap may still be uncommitted; the
+        # first scans start below them.
+        started = now - _overlap()
+        floor = BlacklistedToken.objects.filter(blacklisted_at__lt=started).aggregate(
+            last=Max("id")
+        )["last"]
+        self._checkpoints = deque([(started, floor or 0), (now, last_id)])
+
+    def _catch_up(self):
+        now = timezone.now()
+        rows = BlacklistedToken.objects.filter(id__gt=self._scan_floor())
+        self._last_id = max(self._last_id, self._load(rows) or 0)
+        self._checkpoints.append((now, self._last_id))
+        if self._filter.count > self._filter.capacity:
+            # Past its capacity the false positive rate climbs; resize.
+            self._rebuild()
+
+    def _scan_floor(self):
+        """
+        The last id seen ``TOKEN_BLACKLIST_OVERLAP`` seconds before the
+        previous scan. Every row that committed since that scan was inserted
+        after it, so its id is above this one.
+        """
+        cutoff = self._checkpoints[-1][0] - _overlap()
+        while len(self._checkpoints) > 1 and self._checkpoints[1][0] <= cutoff:
+            self._checkpoints.popleft()
+        return self._checkpoints[0][1]
+
+    def _load(self, queryset):
+        """Add the JTIs of ``queryset``; returns the highest row id seen."""
+        last_id = None
+        rows = queryset.order_by("id").values_list("id", "token__jti")
+        for last_id, jti in rows.iterator(chunk_size=10000):
+            # Overlapping scans see rows again; count each JTI once.
+            if jti not in self._filter:
+                self._filter.add(jti)
+        return last_id
+
+
+def _overlap():
+    return timedelta(
+        seconds=getattr(settings, "TOKEN_BLACKLIST_OVERLAP", DEFAULT_OVERLAP)
+    )
+
+
+token_blacklist = TokenBlacklist()
@@ -0,0 +1,39 @@
+"""
+Password hashers whose cost comes from ``PASSWORD_HASHER_OPTIONS``.
+
+Django's hashers fix their cost in class attributes; these read it from
+settings instead, keyed by algorithm, e.g.
+
+    PASSWORD_HASHER_OPTIONS = {"argon2": {"time_cost": 3, "memory_cost": 65536}}
+
+so the cost can be tuned per deployment (see the calibrate_password_hasher
+command) without new classes. Stored hashes made with other parameters
+still verify and are rehashed with the current ones on the next login.
+"""
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class TunableCostMixin:
+    cost_parameters = ()
+
+    def __init__(self):
+        options = getattr(settings, "PASSWORD_HASHER_OPTIONS", {}).get(
+            self.algorithm, {}
+        )
+        for name in self.cost_parameters:
+            if name in options:
+                setattr(self, name, options[name])
+
+
+class Argon2PasswordHasher(TunableCostMixin, hashers.Argon2PasswordHasher):
+    cost_parameters = ("time_cost", "memory_cost", "parallelism")
+
+
+class ScryptPasswordHasher(TunableCostMixin, hashers.ScryptPasswordHasher):
+    cost_parameters = ("work_factor", "block_size", "parallelism", "maxmem")
+
+
+class PBKDF2PasswordHasher(TunableCostMixin, hashers.PBKDF2PasswordHasher):
+    cost_parameters = ("iterations",)
@@ -0,0 +1,86 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from user.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+# The parameter raised until a hash takes the target time, and how.
+TUNED = {
+    "argon2": (Argon2PasswordHasher, "time_cost", lambda cost: cost + 1),
+    "scrypt": (ScryptPasswordHasher, "work_factor", lambda cost: cost * 2),
+    "pbkdf2": (PBKDF2PasswordHasher, "iterations", lambda cost: int(cost * 1.25)),
+}
+
+
+def scrypt_maxmem(hasher):
+    """
+    Memory limit for an scrypt hash at the hasher's cost: its ``128·r·(n+p+2)``
+    bytes plus 1 MiB of headroom. With ``maxmem=0`` OpenSSL refuses anything
+    above 32 MiB, i.e. ``work_factor`` past 2**14 at the default block size.
+    """
+    n, r, p = hasher.work_factor, hasher.block_size, hasher.parallelism
+    return 128 * r * (n + p + 2) + 2**20
+
+
+# Parameters that have to follow the tuned one.
+DERIVED = {"scrypt": {"maxmem": scrypt_maxmem}}
+
+
+class Command(BaseCommand):
+    help = (
+        "Find the password hashing cost that takes about --target-ms on this "
+        "machine and print the PASSWORD_HASHER_OPTIONS entry to use."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hasher",
+            default=settings.PASSWORD_HASHER,
+            help="argon2, scrypt or pbkdf2 (default: PASSWORD_HASHER).",
+        )
+        parser.add_argument("--target-ms", type=float, default=250)
+
+    def handle(self, *args, **options):
+        try:
+            hasher_class, parameter, step = TUNED[options["hasher"]]
+        except KeyError:
+            raise CommandError("--hasher takes argon2, scrypt or pbkdf2.")
+
+        hasher = hasher_class()
+        derived = DERIVED.get(options["hasher"], {})
+        cost = getattr(hasher, parameter)
+        while True:
+            setattr(hasher, parameter, cost)
+            for name, value in derived.items():
+                setattr(hasher, name, value(hasher))
+            try:
+                ms = self.time_hash(hasher)
+            except (ValueError, MemoryError) as exc:
+                raise CommandError(f"Hashing failed at {parameter}={cost}: {exc}")
+            self.stdout.write(f"{parameter}={cost}: {ms:.1f} ms")
+            if ms >= options["target_ms"]:
+                break
+            cost = step(cost)
+
+        entry = {
+            name: getattr(hasher, name) for name in hasher_class.cost_parameters
+        }
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'PASSWORD_HASHER_OPTIONS["{hasher.algorithm}"] = {entry}'
+            )
+        )
+
+    def time_hash(self, hasher, rounds=3):
+        salt = hasher.salt()
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            hasher.encode("calibrate-password", salt)
+            timings.append((time.perf_counter() - started) * 1000)
+        return min(timings)
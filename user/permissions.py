@@ -23,3 +23,18 @@ class IsAdminOrReadOnly(BasePermission):
             return True
 
         return request.user.is_authenticated and request.user.role == "Admin"
+
+
+class IsAuthorOrReadOnly(BasePermission):
+    """
+    Anyone may read; writes need a signed-in user, and changing an existing
+    object is limited to its ``user`` or an admin.
+    """
+
+    def has_permission(self, request, view):
+        return request.method in SAFE_METHODS or request.user.is_authenticated
+
+    def has_object_permission(self, request, view, obj):
+        if request.method in SAFE_METHODS:
+            return True
+        return obj.user_id == request.user.id or request.user.Is_Admin_role
@@ -0,0 +1,134 @@
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+
+
+DEFAULT_BUCKET_STORE = "user.ratelimit.CacheBucketStore"
+
+
+def refill(tokens, updated, capacity, rate, now):
+    """Tokens in a bucket last seen at ``updated`` with ``tokens`` left."""
+    return min(capacity, tokens + (now - updated) * rate)
+
+
+class BaseBucketStore:
+    """
+    Token buckets keyed by string. A bucket holds up to ``capacity`` tokens,
+    starts full and gains ``rate`` tokens per second; every request takes
+    one.
+    """
+
+    def take(self, key, capacity, rate):
+        """
+        Take a token. Returns ``(allowed, wait)``, where ``wait`` is how many
+        seconds until a token is available when it is not.
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    @staticmethod
+    def _take(bucket, capacity, rate, now):
+        # -> (allowed, wait, bucket to store)
+        tokens = capacity if bucket is None else refill(*bucket, capacity, rate, now)
+        if tokens >= 1:
+            return True, 0.0, (tokens - 1, now)
+        return False, (1 - tokens) / rate, (tokens, now)
+
+
+class InMemoryBucketStore(BaseBucketStore):
+    """
+    Process-local store for tests and single-process setups. Buckets that
+    have refilled completely are no different from absent ones, so they are
+    swept out every ``sweep_interval`` seconds.
+    """
+
+    sweep_interval = 60
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._next_sweep = 0
+
+    def _maybe_sweep(self, now):
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + self.sweep_interval
+        full = [
+            key
+            for key, (tokens, updated, capacity, rate) in self._buckets.items()
+            if refill(tokens, updated, capacity, rate, now) >= capacity
+        ]
+        for key in full:
+            del self._buckets[key]
+
+    def take(self, key, capacity, rate):
+        with self._lock:
+            now = time.monotonic()
+            self._maybe_sweep(now)
+            entry = self._buckets.get(key)
+            allowed, wait, bucket = self._take(
+                entry[:2] if entry else None, capacity, rate, now
+            )
+            self._buckets[key] = (*bucket, capacity, rate)
+            return allowed, wait
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore(BaseBucketStore):
+    """
+    Store backed by a Django cache alias (``RATE_LIMIT_CACHE``); point it at
+    Redis or Memcached to share the buckets between workers. A bucket
+    expires once it would be full again. Concurrent requests for the same
+    bucket may both read it before either writes, so a burst can get a
+    token or two more than the capacity.
+
+    Buckets are written under the cache version stored at
+    ``GENERATION_KEY``; ``clear`` moves to a new generation instead of
+    clearing the whole alias, which other features share.
+    """
+
+    GENERATION_KEY = "ratelimit:generation"
+
+    def __init__(self, alias=None):
+        self.cache = caches[alias or getattr(settings, "RATE_LIMIT_CACHE", "default")]
+
+    def _generation(self):
+        generation = self.cache.get(self.GENERATION_KEY)
+        if generation is None:
+            self.cache.add(self.GENERATION_KEY, 1, None)
+            generation = self.cache.get(self.GENERATION_KEY, 1)
+        return generation
+
+    def take(self, key, capacity, rate):
+        now = time.time()
+        version = self._generation()
+        allowed, wait, bucket = self._take(
+            self.cache.get(key, version=version), capacity, rate, now
+        )
+        timeout = max(1, int((capacity - bucket[0]) / rate) + 1)
+        self.cache.set(key, bucket, timeout, version=version)
+        return allowed, wait
+
+    def clear(self):
+        try:
+            self.cache.incr(self.GENERATION_KEY)
+        except ValueError:
+            self.cache.add(self.GENERATION_KEY, 2, None)
+
+
+@lru_cache(maxsize=None)
+def _load_store(path):
+    return import_string(path)()
+
+
+def get_bucket_store():
+    return _load_store(getattr(settings, "RATE_LIMIT_STORE", DEFAULT_BUCKET_STORE))
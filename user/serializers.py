@@ -2,8 +2,9 @@ from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.contrib.auth import authenticate,get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from .models import Profile
+from .tokens import ClaimsRefreshToken
 UserAccount = get_user_model()
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -76,7 +77,8 @@ class LoginSerializer(serializers.Serializer):
             raise serializers.ValidationError("Invalid email or password.")
 
         # Generate JWT token pair (access and refresh tokens)
-        refresh = RefreshToken.for_user(user)
+        data["user"] = user
+        refresh = ClaimsRefreshToken.for_user(user)
         data["access_token"] = str(refresh.access_token)
         data["refresh_token"] = str(refresh)
 
@@ -88,3 +90,9 @@ class UserWithProfileSerializer(serializers.ModelSerializer):
         model = UserAccount
         fields = ["id", "name", "email", "role", "profile"]
         read_only_fields = ["id", "role", "email"]
+
+
+# Used by simplejwt's TokenRefreshView (SIMPLE_JWT["TOKEN_REFRESH_SERIALIZER"])
+# so refreshes check the blacklist through the bloom filter.
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = ClaimsRefreshToken
@@ -0,0 +1,13 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user.authentication import forget_account_state
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def refresh_account_state(sender, instance, **kwargs):
+    # Disabling an account or changing its role takes effect right away on
+    # this node, and within AUTH_STATE_TTL elsewhere.
+    forget_account_state(instance.pk)
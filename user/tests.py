@@ -1,6 +1,34 @@
-from django.test import TestCase
+from datetime import datetime, timedelta
+from io import StringIO
+import time
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.contrib.auth.hashers import (
+    get_hashers,
+    get_hashers_by_algorithm,
+    make_password,
+)
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import authenticate, get_user_model
 from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+from movies.models import Movie
+from reservations.models import Auditorium, DailySchedule, Showtime
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+from user.blacklist import BloomFilter, TokenBlacklist
+from user.hashers import ScryptPasswordHasher
+from user.management.commands.calibrate_password_hasher import scrypt_maxmem
+from user.ratelimit import CacheBucketStore, get_bucket_store
 from user.models import Profile
 
 User = get_user_model()
@@ -177,3 +205,341 @@ class ProfileTests(TestCase):
         self.assertEqual(profile.location, "Earth")
         self.assertEqual(str(profile), "Profile of profileuser@example.com")
         print("✅ test_user_profile_creation passed")
+
+
+class ShowsByDateTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(
+            email="dates@example.com", name="Dates", password="datespass"
+        )
+        self.movie = Movie.objects.create(
+            title="Dated",
+            description="",
+            duration=timedelta(minutes=100),
+            user=user,
+            rate=7.0,
+            price=9.00,
+        )
+        self.auditorium = Auditorium.objects.create(
+            name="Hall", total_seats=10, total_shows=3, place="Town"
+        )
+        self.day = timezone.make_aware(datetime(2030, 5, 1))
+        self.late = Showtime.objects.create(
+            movie=self.movie,
+            auditorium=self.auditorium,
+            start_time=self.day + timedelta(hours=23, minutes=59),
+        )
+        self.next_day = Showtime.objects.create(
+            movie=self.movie,
+            auditorium=self.auditorium,
+            start_time=self.day + timedelta(days=1),
+        )
+
+    def test_shows_by_date_uses_day_boundaries(self):
+        response = self.client.get(reverse("user:showsbydate"), {"date": "2030-05-01"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([show["id"] for show in response.data], [self.late.id])
+        print("✅ test_shows_by_date_uses_day_boundaries passed")
+
+    def test_shows_by_date_rejects_bad_dates(self):
+        url = reverse("user:showsbydate")
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {"date": "01/05/2030"}).status_code, 400)
+        print("✅ test_shows_by_date_rejects_bad_dates passed")
+
+    def test_schedule_is_materialized_and_kept_current(self):
+        url = reverse("user:schedule")
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {"date": "2030-05-01"})
+        auditoriums = response.data["movies"][0]["auditoriums"]
+        self.assertEqual(auditoriums[0]["showtimes"][0]["id"], self.late.id)
+
+        # Moving the show refreshes both the day it left and the day it joined.
+        self.late.start_time = self.day + timedelta(days=1, hours=2)
+        self.late.save()
+        self.assertEqual(
+            self.client.get(url, {"date": "2030-05-01"}).data["movies"], []
+        )
+        showtimes = self.client.get(url, {"date": "2030-05-02"}).data["movies"][0][
+            "auditoriums"
+        ][0]["showtimes"]
+        self.assertEqual([s["id"] for s in showtimes], [self.next_day.id, self.late.id])
+
+        self.next_day.delete()
+        payload = DailySchedule.objects.get(date="2030-05-02").payload
+        showtimes = payload["movies"][0]["auditoriums"][0]["showtimes"]
+        self.assertEqual([s["id"] for s in showtimes], [self.late.id])
+        print("✅ test_schedule_is_materialized_and_kept_current passed")
+
+
+class ClaimsAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="claims@example.com", name="Claims", password="claimspass"
+        )
+        self.client = APIClient()
+        response = self.client.post(
+            reverse("user:login"),
+            {"email": "claims@example.com", "password": "claimspass"},
+            format="json",
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {response.data['access_token']}"
+        )
+        self.url = reverse("reservations:view_user_reservations")
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [q["sql"] for q in queries if "user_useraccount" in q["sql"]]
+
+    def test_authenticated_requests_skip_the_user_lookup(self):
+        # The first request caches the account state; later ones read only
+        # the token.
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(self.user_queries(), [])
+        print("✅ test_authenticated_requests_skip_the_user_lookup passed")
+
+    def test_disabled_accounts_and_role_changes_are_rejected(self):
+        self.user_queries()
+        self.user.role = "admin"
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+        self.user.role = "user"
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        print("✅ test_disabled_accounts_and_role_changes_are_rejected passed")
+
+    @override_settings(AUTH_STATE_TTL=30)
+    def test_changes_that_skip_signals_apply_after_the_ttl(self):
+        self.user_queries()
+        # A queryset update sends no post_save, so the cached state stays.
+        User.objects.filter(pk=self.user.pk).update(role="manager")
+        self.assertEqual(self.user_queries(), [])
+
+        later = time.time() + 31
+        with mock.patch("django.core.cache.backends.locmem.time") as clock:
+            clock.time.return_value = later
+            self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_tokens_without_claims_still_work(self):
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        print("✅ test_tokens_without_claims_still_work passed")
+
+
+class TokenBlacklistTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="tokens@example.com", name="Tokens", password="tokenspass"
+        )
+        self.client = APIClient()
+        patcher = mock.patch("user.tokens.token_blacklist", TokenBlacklist())
+        self.blacklist = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def login(self):
+        response = self.client.post(
+            reverse("user:login"),
+            {"email": "tokens@example.com", "password": "tokenspass"},
+            format="json",
+        )
+        return response.data
+
+    def refresh(self, refresh_token):
+        return self.client.post(
+            reverse("user:token_refresh"), {"refresh": refresh_token}, format="json"
+        )
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(1000, 0.01)
+        added = [f"jti-{i}" for i in range(1000)]
+        for jti in added:
+            bloom.add(jti)
+        self.assertTrue(all(jti in bloom for jti in added))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+        print("✅ test_bloom_filter passed")
+
+    @override_settings(TOKEN_BLACKLIST_CACHE="default")
+    def test_logout_blacklists_and_refresh_skips_the_database(self):
+        tokens = self.login()
+        self.blacklist.sync()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.refresh(tokens["refresh_token"]).status_code, 200)
+        self.assertEqual(
+            [q["sql"] for q in queries if "token_blacklist_" in q["sql"]], []
+        )
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {tokens['access_token']}")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("user:logout"),
+                {"refresh_token": tokens["refresh_token"]},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 205)
+        self.assertEqual(self.refresh(tokens["refresh_token"]).status_code, 401)
+        print("✅ test_logout_blacklists_and_refresh_skips_the_database passed")
+
+    def test_rows_committed_late_below_the_last_id_are_picked_up(self):
+        early, late = (
+            OutstandingToken.objects.create(
+                user=self.user,
+                jti=jti,
+                token="token",
+                expires_at=timezone.now() + timedelta(days=1),
+            )
+            for jti in ("jti-early", "jti-late")
+        )
+        BlacklistedToken.objects.create(id=10, token=early)
+        self.blacklist.sync()
+        # Inserted before id 10 but committed after the scan that saw it.
+        BlacklistedToken.objects.create(id=5, token=late)
+        self.assertTrue(self.blacklist.might_contain("jti-late"))
+
+        # Once the overlap has passed, scans start above the old rows.
+        with mock.patch(
+            "user.blacklist.timezone.now",
+            return_value=timezone.now() + timedelta(minutes=5),
+        ):
+            self.blacklist.sync()
+            with CaptureQueriesContext(connection) as queries:
+                self.blacklist.sync()
+        self.assertIn('"id" > 10', queries[0]["sql"])
+
+    def test_other_processes_catch_up(self):
+        other = TokenBlacklist()
+        other.sync()
+        tokens = self.login()
+        jti = RefreshToken(tokens["refresh_token"])["jti"]
+        self.assertFalse(other.might_contain(jti))
+        RefreshToken(tokens["refresh_token"]).blacklist()
+        self.assertTrue(other.might_contain(jti))
+        print("✅ test_other_processes_catch_up passed")
+
+    def test_purge_expired_tokens(self):
+        expired = timezone.now() - timedelta(days=1)
+        live = timezone.now() + timedelta(days=1)
+        for i, expires_at in enumerate([expired, expired, expired, live]):
+            token = OutstandingToken.objects.create(
+                user=self.user, jti=f"jti-{i}", token="token", expires_at=expires_at
+            )
+            BlacklistedToken.objects.create(token=token)
+
+        out = StringIO()
+        call_command("purge_expired_tokens", "--batch-size", "2", stdout=out)
+        self.assertIn("Purged 3 outstanding and 3 blacklisted", out.getvalue())
+        self.assertEqual(
+            list(OutstandingToken.objects.values_list("jti", flat=True)), ["jti-3"]
+        )
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
+        print("✅ test_purge_expired_tokens passed")
+
+
+@override_settings(
+    RATE_LIMIT_STORE="user.ratelimit.InMemoryBucketStore",
+    LOGIN_RATE_LIMITS={
+        "ip": {"capacity": 5, "per_minute": 60},
+        "ip_account": {"capacity": 2, "per_minute": 1},
+        "account": {"capacity": 4, "per_minute": 1},
+    },
+)
+class LoginTests(TestCase):
+    def setUp(self):
+        get_bucket_store().clear()
+        self.user = User.objects.create_user(
+            email="login2@example.com", name="Login", password="loginpass"
+        )
+        self.client = APIClient()
+
+    def login(self, email="login2@example.com", password="loginpass", **extra):
+        return self.client.post(
+            reverse("user:login"),
+            {"email": email, "password": password},
+            format="json",
+            **extra,
+        )
+
+    def test_login_reuses_the_authenticated_user(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["role"], "user")
+        lookups = [q for q in queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(lookups), 1)
+        print("✅ test_login_reuses_the_authenticated_user passed")
+
+    def test_attempts_are_limited_per_account_and_per_ip(self):
+        self.assertEqual(self.login(password="wrong").status_code, 400)
+        self.assertEqual(self.login().status_code, 200)
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
+
+        # Other accounts from the same address until its bucket runs dry.
+        statuses = [
+            self.login(email=f"other{i}@example.com").status_code for i in range(3)
+        ]
+        self.assertEqual(statuses, [400, 400, 429])
+        response = self.login(REMOTE_ADDR="10.0.0.2", email="new@example.com")
+        self.assertEqual(response.status_code, 400)
+        # One address running dry doesn't lock the owner out elsewhere...
+        self.assertEqual(self.login(REMOTE_ADDR="10.0.0.3").status_code, 200)
+        # ...but attempts spread over many addresses share the account's.
+        statuses = [
+            self.login(password="wrong", REMOTE_ADDR=f"10.0.1.{i}").status_code
+            for i in range(2)
+        ]
+        self.assertEqual(statuses, [400, 429])
+        print("✅ test_attempts_are_limited_per_account_and_per_ip passed")
+
+    def test_clearing_the_cache_store_keeps_other_cache_entries(self):
+        store = CacheBucketStore()
+        cache.set("unrelated", "kept")
+        self.assertEqual(store.take("ratelimit:test", 1, 1 / 60), (True, 0.0))
+        self.assertFalse(store.take("ratelimit:test", 1, 1 / 60)[0])
+        store.clear()
+        self.assertTrue(store.take("ratelimit:test", 1, 1 / 60)[0])
+        self.assertEqual(cache.get("unrelated"), "kept")
+
+    def test_old_hashes_are_upgraded_to_the_configured_hasher(self):
+        get_hashers.cache_clear()
+        get_hashers_by_algorithm.cache_clear()
+        self.addCleanup(get_hashers.cache_clear)
+        self.addCleanup(get_hashers_by_algorithm.cache_clear)
+        self.user.password = make_password("loginpass", hasher="pbkdf2_sha256")
+        self.user.save()
+        with self.settings(
+            PASSWORD_HASHER_OPTIONS={"argon2": {"time_cost": 1, "memory_cost": 8192}}
+        ):
+            get_hashers.cache_clear()
+            get_hashers_by_algorithm.cache_clear()
+            self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(
+            self.user.password.startswith("argon2$argon2id$v=19$m=8192,t=1,")
+        )
+        print("✅ test_old_hashes_are_upgraded_to_the_configured_hasher passed")
+
+    def test_calibrated_scrypt_cost_raises_maxmem(self):
+        hasher = ScryptPasswordHasher()
+        hasher.work_factor = 2**15
+        hasher.maxmem = scrypt_maxmem(hasher)
+        self.assertGreater(hasher.maxmem, 32 * 2**20)
+        self.assertTrue(hasher.verify("secret", hasher.encode("secret", hasher.salt())))
+
+        with mock.patch(
+            "user.management.commands.calibrate_password_hasher.Command.time_hash",
+            side_effect=ValueError("memory limit exceeded"),
+        ):
+            with self.assertRaisesMessage(CommandError, "memory limit exceeded"):
+                call_command(
+                    "calibrate_password_hasher", hasher="scrypt", stdout=StringIO()
+                )
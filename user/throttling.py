@@ -0,0 +1,49 @@
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle
+
+from user.ratelimit import get_bucket_store
+
+DEFAULT_LOGIN_RATE_LIMITS = {
+    "ip": {"capacity": 20, "per_minute": 10},
+    "ip_account": {"capacity": 5, "per_minute": 1},
+    "account": {"capacity": 30, "per_minute": 10},
+}
+
+
+class LoginRateThrottle(BaseThrottle):
+    """
+    Token buckets in front of login, so guessing passwords can't keep the
+    workers busy hashing: per client IP, per account (the submitted email)
+    from that IP, and per account overall, which is what slows down
+    attempts spread over many addresses. Checked in that order before the
+    credentials are; a request one bucket refuses doesn't spend the later
+    ones' tokens, so a single address can only take a few of the account's
+    tokens before its own bucket runs dry.
+    """
+
+    def allow_request(self, request, view):
+        limits = getattr(settings, "LOGIN_RATE_LIMITS", DEFAULT_LOGIN_RATE_LIMITS)
+        ip = self.get_ident(request)
+        buckets = [("ip", ip)]
+        email = request.data.get("email")
+        if isinstance(email, str) and email.strip():
+            email = email.strip().lower()
+            buckets.append(("ip_account", f"{ip}:{email}"))
+            buckets.append(("account", email))
+
+        store = get_bucket_store()
+        self.retry_after = None
+        for scope, ident in buckets:
+            limit = limits[scope]
+            allowed, wait = store.take(
+                f"ratelimit:login:{scope}:{ident}",
+                limit["capacity"],
+                limit["per_minute"] / 60,
+            )
+            if not allowed:
+                self.retry_after = wait
+                return False
+        return True
+
+    def wait(self):
+        return self.retry_after
@@ -0,0 +1,29 @@
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from user.blacklist import token_blacklist
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token that also carries the account's ``role`` and ``is_active``;
+    the access token copies them, so ClaimsJWTAuthentication can authorize a
+    request without loading the user. Blacklist checks go through the
+    process's bloom filter first (see user.blacklist).
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["role"] = user.role
+        token["is_active"] = user.is_active
+        return token
+
+    def check_blacklist(self):
+        if token_blacklist.might_contain(self.payload[api_settings.JTI_CLAIM]):
+            super().check_blacklist()
+
+    def blacklist(self):
+        blacklisted = super().blacklist()
+        token_blacklist.add(self.payload[api_settings.JTI_CLAIM])
+        return blacklisted
@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.urls import path
+from rest_framework_simplejwt.views import TokenRefreshView
 from user.views import (
     RegisterUserView,
     RegisterManagerView,
@@ -7,15 +9,26 @@ from user.views import (
     LogoutView,
     UserProfileView,
     ListMoviesonPerticularDate,
+    ShowScheduleView,
 )
 
 app_name = "user"
+
+shows_by_date_view = ListMoviesonPerticularDate.as_view()
+if settings.ASYNC_READ_VIEWS:
+    # GET runs on the event loop (see config.async_api).
+    from user.async_views import AsyncShowsByDate
+
+    shows_by_date_view = AsyncShowsByDate.as_view()
+
 urlpatterns = [
     path("register/", RegisterUserView.as_view(), name="register_user"),
     path("register/manager/", RegisterManagerView.as_view(), name="register_manager"),
     path("register/admin/", RegisterAdminView.as_view(), name="register_admin"),
     path("login/", LoginView.as_view(), name="login"),
+    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("logout/", LogoutView.as_view(), name="logout"),
     path("profile/", UserProfileView.as_view, name="profile"),
-    path("showsbydate/",ListMoviesonPerticularDate.as_view(),name="showsbydate")
+    path("showsbydate/", shows_by_date_view, name="showsbydate"),
+    path("schedule/", ShowScheduleView.as_view(), name="schedule"),
 ]
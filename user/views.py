@@ -5,11 +5,16 @@ from user.serializers import RegisterSerializer, LoginSerializer, ProfileSeriali
 from drf_spectacular.utils import extend_schema,OpenApiParameter
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
-from user.models import UserAccount, Profile
-from rest_framework_simplejwt.tokens import RefreshToken, TokenError
+from user.models import Profile
+from rest_framework_simplejwt.tokens import TokenError
 from user.permissions import IsAdminorReadonly, IsUser
+from user.throttling import LoginRateThrottle
+from user.tokens import ClaimsRefreshToken
+from config.routers import ReplicaReadMixin
 from reservations.models import Showtime
 from reservations.serializers import ShowtimeSerializer
+from reservations.filters import day_bounds
+from reservations.schedule import get_schedule
 import datetime
 
 
@@ -67,12 +72,16 @@ class LoginView(APIView):
     Shows response based on user role (user/admin/manager).
     """
 
+    # Credentials are checked in the body; skip token authentication, and
+    # rate-limit attempts before paying for the password hash.
+    authentication_classes = []
+    throttle_classes = [LoginRateThrottle]
+
     @extend_schema(request=LoginSerializer, responses={200: LoginSerializer})
     def post(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
-            user = UserAccount.objects.get(email=request.data["email"])
-            role = user.role
+            role = serializer.validated_data["user"].role
 
             return Response(
                 {
@@ -101,7 +110,7 @@ class LogoutView(APIView):
     def post(self, request):
         try:
             refresh_token = request.data["refresh_token"]
-            token = RefreshToken(refresh_token)
+            token = ClaimsRefreshToken(refresh_token)
             token.blacklist()
 
             return Response(
@@ -131,7 +140,7 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     def get_object(self):
         return Profile.objects.get(user=self.request.user)
 
-class ListMoviesonPerticularDate(APIView):
+class ListMoviesonPerticularDate(ReplicaReadMixin, APIView):
     serializer_class = ShowtimeSerializer
     @extend_schema(
         parameters=[
@@ -147,14 +156,57 @@ class ListMoviesonPerticularDate(APIView):
     )
 
     def get(self, request, *args, **kwargs):
-        
-        date = request.query_params.get('date')
-
-        if date:
-            date_obj = datetime.datetime.strptime(date, '%Y-%m-%d').date()
-            shows = Showtime.objects.filter(start_time__date=date_obj)
-            serializer = self.serializer_class(shows,many=True)
-            return Response(serializer.data)
-        
-        else:
-            return Response({"Error: Facing issues to fetch data try later"})
+        date_obj, error = parse_date_param(request)
+        if error:
+            return error
+
+        # Half-open range on start_time so the lookup can use its index.
+        start, end = day_bounds(date_obj)
+        shows = Showtime.objects.filter(
+            start_time__gte=start, start_time__lt=end
+        ).order_by("start_time", "id")
+        serializer = self.serializer_class(shows, many=True)
+        return Response(serializer.data)
+
+
+class ShowScheduleView(ReplicaReadMixin, APIView):
+    """
+    Per-day schedule grouped as movie -> auditoriums -> showtimes, served
+    from the materialized DailySchedule row.
+    """
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "date",
+                type=str,
+                description="The date in YYYY-MM-DD format",
+                required=True,
+            ),
+        ],
+        responses={200: None},
+    )
+    def get(self, request, *args, **kwargs):
+        date_obj, error = parse_date_param(request)
+        if error:
+            return error
+        return Response(get_schedule(date_obj))
+
+
+def parse_date_param(request):
+    """
+    Read the ``date`` query parameter; returns ``(date, None)`` or
+    ``(None, error_response)``.
+    """
+    date = request.query_params.get("date")
+    if not date:
+        return None, Response(
+            {"error": "date is required."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        return datetime.datetime.strptime(date, "%Y-%m-%d").date(), None
+    except ValueError:
+        return None, Response(
+            {"error": "date must be in YYYY-MM-DD format."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )